@@ -0,0 +1,29 @@
+"""
+Mikro-Benchmarks für coderr. Aufruf aus dem Projektverzeichnis, z. B.:
+
+    python -m benchmarks.middleware
+"""
+import os
+
+
+def setup_django(test_database=True):
+    """
+    Initialisiert Django mit den Projekteinstellungen und, falls test_database, einer leeren
+    Testdatenbank. Gibt eine Funktion zurück, die die Testumgebung wieder abbaut.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coderr_app.settings')
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+    setup_test_environment()
+    if not test_database:
+        return teardown_test_environment
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    def teardown():
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+    return teardown
@@ -0,0 +1,52 @@
+"""
+Vergleicht die lesenden Endpunkte unter WSGI (gunicorn, Sync-Worker) und ASGI (uvicorn mit
+den async-Views aus coderr.api.async_views) bei hoher Parallelität. Beide Server erhalten
+dieselbe Anzahl Prozesse und dieselbe befüllte SQLite-Datenbank.
+
+    python -m benchmarks.asgi [--workers 2] [--concurrency 128] [--duration 10]
+"""
+import argparse
+import asyncio
+import tempfile
+from benchmarks.loadtest import RESULT_HEADER, format_result, run_load
+from benchmarks.servers import free_port, prepare_database, running
+
+PATHS = ['/api/offers/', '/api/offers/1/', '/api/profiles/business/', '/api/reviews/', '/api/base-info/']
+
+
+def servers(workers, port):
+    return {
+        'wsgi (gunicorn sync)': [
+            'gunicorn', 'coderr_app.wsgi:application', '--bind', f'127.0.0.1:{port}',
+            '--workers', str(workers), '--worker-class', 'sync', '--log-level', 'warning',
+        ],
+        'asgi (uvicorn)': [
+            'uvicorn', 'coderr_app.asgi:application', '--host', '127.0.0.1', '--port', str(port),
+            '--workers', str(workers), '--log-level', 'warning', '--no-access-log',
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=128)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--paths', nargs='*', default=PATHS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env, tokens = prepare_database(directory)
+        headers = [f"Authorization: Token {tokens['customer_tokens'][0]}"]
+        print(f'{args.workers} Prozesse, {args.concurrency} Verbindungen, {args.duration:.0f}s je Endpunkt')
+        port = free_port()
+        for label, command in servers(args.workers, port).items():
+            with running(command, env, port) as base_url:
+                print(f'\n{label}\n{RESULT_HEADER}')
+                for path in args.paths:
+                    result = asyncio.run(run_load(base_url + path, args.concurrency, args.duration, headers))
+                    print(format_result(path, result))
+
+
+if __name__ == '__main__':
+    main()
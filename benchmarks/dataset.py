@@ -0,0 +1,116 @@
+"""
+Reproduzierbarer Testdatenbestand für Benchmarks.
+"""
+import random
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+OFFER_TYPES = ('basic', 'standard', 'premium')
+ORDER_STATUSES = ('in_progress', 'in_progress', 'completed', 'cancelled')
+PASSWORD = 'bench-password'
+
+# Vorgaben für seed(); 'large' ist der Bestand für benchmarks.endpoints und benchmarks/baseline.json.
+DATASETS = {
+    'small': {
+        'businesses': 10, 'offers_per_business': 20, 'customers': 20,
+        'reviews_per_customer': 5, 'orders_per_customer': 5,
+    },
+    'large': {
+        'businesses': 2000, 'offers_per_business': 10, 'customers': 20000,
+        'reviews_per_customer': 2, 'orders_per_customer': 2,
+    },
+}
+
+
+def next_id(model):
+    return (model.objects.aggregate(value=Max('pk'))['value'] or 0) + 1
+
+
+@transaction.atomic
+def seed(businesses=10, offers_per_business=20, customers=20, reviews_per_customer=5,
+         orders_per_customer=0, random_seed=1, batch_size=1000):
+    """
+    Legt Geschäftsnutzer mit Angeboten (je drei Details), Kunden mit Token, Reviews und
+    Bestellungen an. Die Zeilen werden mit fortlaufenden Primärschlüsseln per bulk_create
+    geschrieben, sodass auch zehntausende Datensätze in Sekunden angelegt sind; bei gleichem
+    random_seed entsteht derselbe Bestand. Alle Benutzer haben das Passwort PASSWORD.
+    Gibt die Token-Schlüssel der Kunden und Geschäftsnutzer zurück.
+    """
+    from django.contrib.auth.models import User
+    from rest_framework.authtoken.models import Token
+    from coderr.models import OfferDetail, Offers, Order, Profile, Review
+
+    rng = random.Random(random_seed)
+    password = make_password(PASSWORD)
+    user_id, offer_id, detail_id = next_id(User), next_id(Offers), next_id(OfferDetail)
+    order_id, review_id = next_id(Order), next_id(Review)
+
+    business_ids = list(range(user_id, user_id + businesses))
+    customer_ids = list(range(user_id + businesses, user_id + businesses + customers))
+    users = [
+        User(id=pk, username=f'business{index}', email=f'business{index}@example.com', password=password)
+        for index, pk in enumerate(business_ids)
+    ] + [
+        User(id=pk, username=f'customer{index}', email=f'customer{index}@example.com', password=password)
+        for index, pk in enumerate(customer_ids)
+    ]
+    User.objects.bulk_create(users, batch_size=batch_size)
+    Profile.objects.bulk_create([
+        Profile(user_id=pk, type='business', location=f'City {index % 5}')
+        for index, pk in enumerate(business_ids)
+    ] + [Profile(user_id=pk, type='customer') for pk in customer_ids], batch_size=batch_size)
+    tokens = {pk: '%040x' % rng.getrandbits(160) for pk in business_ids + customer_ids}
+    Token.objects.bulk_create([Token(key=key, user_id=pk) for pk, key in tokens.items()], batch_size=batch_size)
+
+    offers, details = [], []
+    for index, business_id in enumerate(business_ids):
+        for number in range(offers_per_business):
+            offer = Offers(
+                id=offer_id + len(offers), user_id=business_id, title=f'Offer {index}-{number}',
+                description=f'Design and development package {rng.randint(1, 1000)}',
+            )
+            offer_details = [
+                OfferDetail(
+                    id=detail_id + len(details) + position, offer_id=offer.id, title=offer_type.title(),
+                    revisions=position + 1, delivery_time_in_days=rng.randint(1, 30),
+                    price=rng.randint(10, 2000), features=['Feature A', 'Feature B'][:position + 1],
+                    offer_type=offer_type,
+                )
+                for position, offer_type in enumerate(OFFER_TYPES)
+            ]
+            # Entspricht Offers.update_min_values, ohne nachträgliches UPDATE.
+            offer.min_price = min(detail.price for detail in offer_details)
+            offer.min_delivery_time = min(detail.delivery_time_in_days for detail in offer_details)
+            offers.append(offer)
+            details.extend(offer_details)
+    Offers.objects.bulk_create(offers, batch_size=batch_size)
+    OfferDetail.objects.bulk_create(details, batch_size=batch_size)
+
+    reviews, orders = [], []
+    for customer_id in customer_ids:
+        for business_id in rng.sample(business_ids, min(reviews_per_customer, len(business_ids))):
+            reviews.append(Review(
+                id=review_id + len(reviews), business_user_id=business_id, reviewer_id=customer_id,
+                rating=rng.randint(1, 5), description='Benchmark review',
+            ))
+        for _ in range(orders_per_customer if details else 0):
+            detail = rng.choice(details)
+            orders.append(Order(
+                id=order_id + len(orders), customer_user_id=customer_id,
+                business_user_id=offers[detail.offer_id - offer_id].user_id,
+                offer_detail_id=detail.id, status=rng.choice(ORDER_STATUSES),
+            ))
+    Review.objects.bulk_create(reviews, batch_size=batch_size)
+    Order.objects.bulk_create(orders, batch_size=batch_size)
+
+    # Explizite Primärschlüssel setzen die Sequenzen (PostgreSQL) nicht weiter.
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), [User, Offers, OfferDetail, Order, Review]):
+            cursor.execute(sql)
+
+    return {
+        'customer_tokens': [tokens[pk] for pk in customer_ids],
+        'business_tokens': [tokens[pk] for pk in business_ids],
+    }
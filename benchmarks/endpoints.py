@@ -0,0 +1,357 @@
+"""
+Misst jeden Endpunkt aus coderr/api/urls.py über den vollständigen Request-Stack (WSGI-Handler,
+Middleware, Authentifizierung, View, Serializer) gegen einen großen, reproduzierbaren Bestand
+(benchmarks.dataset, DATASETS). Erfasst je Endpunkt p50/p95/p99 der Latenz, die Anzahl der
+SQL-Abfragen und den Speicherbedarf (tracemalloc-Spitze) und vergleicht das Ergebnis mit
+benchmarks/baseline.json. Bei Regressionen endet der Aufruf mit Exit-Code 1.
+
+    python -m benchmarks.endpoints [--dataset large] [--iterations 20] [--only offers]
+    python -m benchmarks.endpoints --update-baseline
+"""
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from benchmarks import setup_django
+
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+
+class Endpoint:
+    """
+    Ein gemessener Request: URL-Name aus coderr/api/urls.py, Methode, Benutzerrolle und
+    Funktionen für die URL-Argumente bzw. den Body der i-ten Wiederholung. max_iterations
+    begrenzt die Wiederholungen für Endpunkte, die den ganzen Bestand ausgeben.
+    """
+
+    def __init__(self, url_name, method='GET', role='customer', kwargs=None, query=None, body=None,
+                 content_type='application/json', prepare=None, label=None, max_iterations=None):
+        self.url_name = url_name
+        self.method = method
+        self.role = role
+        self.kwargs = kwargs or (lambda fixtures: {})
+        self.query = query
+        self.body = body
+        self.content_type = content_type
+        self.prepare = prepare
+        self.max_iterations = max_iterations
+        self.key = f'{method} {url_name}' + (f' {label}' if label else '')
+
+
+def page(count):
+    """
+    Wechselnde Seiten, damit die gecachten Angebotslisten nicht jeden Request beantworten.
+    """
+    return lambda fixtures, i: {'page': i % count + 1}
+
+
+def offer_payload(fixtures, i):
+    return {
+        'title': f'Benchmark offer {i}', 'description': 'Created by benchmarks.endpoints',
+        'details': [
+            {'title': offer_type.title(), 'revisions': position + 1, 'delivery_time_in_days': 5,
+             'price': 100 * (position + 1), 'features': ['Feature A'], 'offer_type': offer_type}
+            for position, offer_type in enumerate(('basic', 'standard', 'premium'))
+        ],
+    }
+
+
+def fresh_token(fixtures, i):
+    """
+    Logout widerruft das Token; vor jeder Wiederholung (außerhalb der Messung) ein neues anlegen.
+    """
+    from rest_framework.authtoken.models import Token
+    Token.objects.filter(user_id=fixtures['logout_user']).delete()
+    return Token.objects.create(user_id=fixtures['logout_user']).key
+
+
+ENDPOINTS = [
+    # Ungepaginiert: alle Profile, mit dem großen Bestand mehrere Sekunden pro Request.
+    Endpoint('profile-list', max_iterations=3),
+    Endpoint('profile-detail', kwargs=lambda fixtures: {'pk': fixtures['business_id']}),
+    Endpoint('profile-business'),
+    Endpoint('profile-customer', max_iterations=3),
+    Endpoint('offers-list', query=page(30)),
+    # Selektive, wechselnde Suchbegriffe (an der Angebotsliste vorbei am Cache); ein Begriff, der auf
+    # fast alle Angebote passt, dauert mit dem großen Bestand unter SQLite mehrere zehn Sekunden.
+    Endpoint('offers-list', query=lambda fixtures, i: {'search': str(i % 900 + 100)}, label='search'),
+    Endpoint('offers-list', query=lambda fixtures, i: {'min_price': 100, 'ordering': 'min_price', 'page': i % 25 + 1},
+             label='filtered'),
+    Endpoint('offers-list', 'POST', role='business', body=offer_payload),
+    Endpoint('offers-facets'),
+    Endpoint('offers-import', 'POST', role='business', content_type='application/x-ndjson',
+             body=lambda fixtures, i: json.dumps(offer_payload(fixtures, i)) + '\n'),
+    Endpoint('detail-offer', kwargs=lambda fixtures: {'pk': fixtures['offer_id']}),
+    Endpoint('offerdetails'),
+    Endpoint('offerdetails-detail', kwargs=lambda fixtures: {'pk': fixtures['detail_id']}),
+    Endpoint('order-list'),
+    Endpoint('order-list', 'POST', body=lambda fixtures, i: {'offer_detail_id': fixtures['detail_id']}),
+    Endpoint('order-detail', kwargs=lambda fixtures: {'pk': fixtures['order_id']}),
+    Endpoint('order-count', kwargs=lambda fixtures: {'pk': fixtures['business_id']}),
+    Endpoint('completed-order-count', kwargs=lambda fixtures: {'pk': fixtures['business_id']}),
+    Endpoint('review-list', query=page(10)),
+    Endpoint('review-list', query=lambda fixtures, i: {'business_user_id': fixtures['business_id']},
+             label='business'),
+    Endpoint('review-list', 'POST', body=lambda fixtures, i: {
+        'business_user': fixtures['business_id'], 'rating': i % 5 + 1, 'description': 'Benchmark',
+    }),
+    Endpoint('review-detail', kwargs=lambda fixtures: {'pk': fixtures['review_id']}),
+    Endpoint('base-info', role=None),
+    Endpoint('registration', 'POST', role=None, body=lambda fixtures, i: {
+        'username': f'bench-registration-{i}', 'email': f'bench-registration-{i}@example.com',
+        'password': 'bench-password', 'repeated_password': 'bench-password', 'type': 'customer',
+    }),
+    Endpoint('login', 'POST', role=None, body=lambda fixtures, i: {
+        'username': 'customer0', 'password': 'bench-password',
+    }),
+    Endpoint('logout', 'POST', role='logout', prepare=fresh_token),
+    Endpoint('users-provision', 'POST', role='staff', content_type='application/x-ndjson',
+             body=lambda fixtures, i: json.dumps({
+                 'username': f'bench-provision-{i}', 'email': f'bench-provision-{i}@example.com',
+                 'password': 'bench-password', 'type': 'business',
+             }) + '\n'),
+    Endpoint('users-provision-job', role='staff', kwargs=lambda fixtures: {'pk': fixtures['provision_job_id']}),
+]
+
+
+def check_coverage(endpoints):
+    """
+    Stellt sicher, dass jeder Eintrag in coderr/api/urls.py gemessen wird.
+    """
+    from coderr.api.urls import urlpatterns
+    missing = {pattern.name for pattern in urlpatterns} - {endpoint.url_name for endpoint in endpoints}
+    if missing:
+        raise SystemExit(f"Keine Messung für: {', '.join(sorted(missing))} (ENDPOINTS in benchmarks/endpoints.py ergänzen)")
+
+
+def build_fixtures():
+    """
+    Ids und Token aus dem Bestand, die die Endpunkte als URL-Argumente und Absender brauchen.
+    """
+    from django.contrib.auth.models import User
+    from rest_framework.authtoken.models import Token
+    from coderr.models import Job, OfferDetail, Offers, Order, Review
+
+    business = User.objects.get(username='business0')
+    customer = User.objects.get(username='customer0')
+    staff = User.objects.create_user(username='bench-staff', password='bench-password', is_staff=True)
+    logout_user = User.objects.create_user(username='bench-logout', password='bench-password')
+    offer = Offers.objects.filter(user=business).order_by('pk').first()
+    return {
+        'business_id': business.pk,
+        'offer_id': offer.pk,
+        'detail_id': OfferDetail.objects.filter(offer=offer).order_by('pk').first().pk,
+        'order_id': Order.objects.filter(customer_user=customer).order_by('pk').first().pk,
+        'review_id': Review.objects.filter(reviewer=customer).order_by('pk').first().pk,
+        'logout_user': logout_user.pk,
+        'provision_job_id': Job.objects.create(
+            kind='provision_users', status='done', result={'created': 1, 'error_count': 0, 'errors': []},
+        ).pk,
+        'tokens': {
+            'business': Token.objects.get(user=business).key,
+            'customer': Token.objects.get(user=customer).key,
+            'staff': Token.objects.create(user=staff).key,
+        },
+    }
+
+
+class Runner:
+    """
+    Schickt die Requests eines Endpunkts durch django.test.Client und sammelt die Messwerte.
+    """
+
+    def __init__(self, fixtures):
+        from django.test import Client
+        self.client = Client()
+        self.fixtures = fixtures
+        self.counter = 0
+
+    def request(self, endpoint):
+        from django.urls import reverse
+        self.counter += 1
+        i = self.counter
+        path = reverse(endpoint.url_name, kwargs=endpoint.kwargs(self.fixtures))
+        headers = {}
+        if endpoint.prepare is not None:
+            headers['HTTP_AUTHORIZATION'] = f'Token {endpoint.prepare(self.fixtures, i)}'
+        elif endpoint.role is not None:
+            headers['HTTP_AUTHORIZATION'] = f"Token {self.fixtures['tokens'][endpoint.role]}"
+
+        if endpoint.method == 'GET':
+            data = endpoint.query(self.fixtures, i) if endpoint.query else None
+            call = lambda: self.client.get(path, data, **headers)  # noqa: E731
+        else:
+            body = endpoint.body(self.fixtures, i) if endpoint.body else {}
+            if endpoint.content_type == 'application/json':
+                body = json.dumps(body)
+            call = lambda: self.client.generic(  # noqa: E731
+                endpoint.method, path, body, content_type=endpoint.content_type, **headers,
+            )
+        return call
+
+    def run(self, endpoint, iterations, warmup, memory_samples):
+        from django.core.cache import caches
+        from django.db import connection
+        from coderr.api.authentication import token_cache
+
+        # Wiederholungen pro Endpunkt zählen und alle Caches leeren, damit die Messung nicht von
+        # der Reihenfolge der Endpunkte abhängt und --only dieselben Werte liefert.
+        self.counter = 0
+        token_cache.clear()
+        for cache in caches.all():
+            cache.clear()
+        # Abfragen des ersten (kalten) Requests; danach Aufwärmen und Zeitmessung. Gezählt wird per
+        # execute_wrapper, da connection.queries bei 9000 Einträgen abschneidet.
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        call = self.request(endpoint)
+        with connection.execute_wrapper(count), contextlib.redirect_stdout(io.StringIO()):
+            response = call()
+        query_count = len(queries)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{endpoint.key}: HTTP {response.status_code} {response.content[:500]!r}')
+        if endpoint.max_iterations is not None:
+            iterations = min(iterations, endpoint.max_iterations)
+            warmup, memory_samples = 0, min(memory_samples, 1)
+        timings = []
+        peak = 0
+        # Views mit print() sollen die Ergebnistabelle nicht unterbrechen.
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(warmup):
+                self.request(endpoint)()
+
+            for _ in range(iterations):
+                call = self.request(endpoint)
+                started = time.perf_counter()
+                call()
+                timings.append((time.perf_counter() - started) * 1000)
+
+            tracemalloc.start()
+            try:
+                for _ in range(memory_samples):
+                    call = self.request(endpoint)
+                    tracemalloc.reset_peak()
+                    before = tracemalloc.get_traced_memory()[0]
+                    call()
+                    peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+            finally:
+                tracemalloc.stop()
+
+        timings.sort()
+        return {
+            'status': response.status_code,
+            'p50_ms': round(percentile(timings, 0.50), 3),
+            'p95_ms': round(percentile(timings, 0.95), 3),
+            'p99_ms': round(percentile(timings, 0.99), 3),
+            'queries': query_count,
+            'peak_kib': round(peak / 1024, 1),
+        }
+
+
+def percentile(values, fraction):
+    """
+    Perzentil einer sortierten Liste mit linearer Interpolation.
+    """
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def compare(results, baseline, tolerance):
+    """
+    Gibt je Endpunkt die Regressionen gegenüber der Baseline zurück. Latenz und Speicher dürfen
+    um tolerance (relativ) und einen kleinen absoluten Betrag schwanken, die Anzahl der Abfragen nicht.
+    """
+    regressions = {}
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        problems = []
+        if result['queries'] > previous['queries']:
+            problems.append(f"queries {previous['queries']} -> {result['queries']}")
+        for field, slack in (('p95_ms', 1.0), ('peak_kib', 64.0)):
+            limit = previous[field] * (1 + tolerance) + slack
+            if result[field] > limit:
+                problems.append(f'{field} {previous[field]} -> {result[field]}')
+        if problems:
+            regressions[key] = problems
+    return regressions
+
+
+def main():
+    from benchmarks.dataset import DATASETS
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dataset', choices=sorted(DATASETS), default='large')
+    parser.add_argument('--iterations', type=int, default=20, help='Gemessene Requests je Endpunkt.')
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--memory-samples', type=int, default=3, help='Requests unter tracemalloc je Endpunkt.')
+    parser.add_argument('--only', default=None, help='Nur Endpunkte, deren Schlüssel diesen Text enthält.')
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Erlaubte relative Abweichung (Standard 0.25).')
+    parser.add_argument('--update-baseline', action='store_true', help='Ergebnis als neue Baseline speichern.')
+    parser.add_argument('--output', type=Path, default=None, help='Ergebnis zusätzlich als JSON speichern.')
+    args = parser.parse_args()
+
+    endpoints = [endpoint for endpoint in ENDPOINTS if not args.only or args.only in endpoint.key]
+    teardown = setup_django()
+    try:
+        check_coverage(ENDPOINTS)
+        from django.conf import settings
+        from benchmarks.dataset import seed
+        # Wie im Betrieb: ohne DEBUG protokolliert Django keine Abfragen in connection.queries.
+        settings.DEBUG = False
+
+        started = time.perf_counter()
+        seed(**DATASETS[args.dataset])
+        print(f'Bestand {args.dataset!r} in {time.perf_counter() - started:.1f}s angelegt')
+        runner = Runner(build_fixtures())
+
+        results = {}
+        print(f'{"endpoint":38} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"queries":>8} {"peak KiB":>9}')
+        for endpoint in endpoints:
+            result = results[endpoint.key] = runner.run(endpoint, args.iterations, args.warmup, args.memory_samples)
+            print(f"{endpoint.key:38} {result['p50_ms']:8.1f} {result['p95_ms']:8.1f} {result['p99_ms']:8.1f} "
+                  f"{result['queries']:8} {result['peak_kib']:9.1f}")
+    finally:
+        teardown()
+
+    document = {'dataset': args.dataset, 'iterations': args.iterations, 'endpoints': results}
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2) + '\n')
+    if args.update_baseline:
+        if args.only and args.baseline.exists():
+            # Teilmessung: übrige Endpunkte der bisherigen Baseline behalten.
+            previous = json.loads(args.baseline.read_text())
+            document['endpoints'] = dict(previous['endpoints'], **results)
+        args.baseline.write_text(json.dumps(document, indent=2) + '\n')
+        print(f'Baseline {args.baseline} aktualisiert.')
+        return
+
+    if not args.baseline.exists():
+        print(f'Keine Baseline unter {args.baseline}; mit --update-baseline anlegen.')
+        return
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get('dataset') != args.dataset:
+        print(f"Baseline wurde mit Bestand {baseline.get('dataset')!r} gemessen, nicht verglichen.")
+        return
+    regressions = compare(results, baseline['endpoints'], args.tolerance)
+    for key, problems in regressions.items():
+        print(f"REGRESSION {key}: {', '.join(problems)}")
+    if regressions:
+        sys.exit(1)
+    print(f'Keine Regressionen gegenüber {args.baseline.name} (Toleranz {args.tolerance:.0%}).')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Lasttest für gunicorn.conf.py: vergleicht den Sync-Modus mit dem gthread-Modus bei gleicher
+Anzahl Worker-Prozesse auf einer befüllten SQLite-Datenbank.
+
+    python -m benchmarks.gunicorn [--workers 2] [--threads 4] [--concurrency 64] [--duration 10]
+"""
+import argparse
+import asyncio
+import tempfile
+from benchmarks.loadtest import RESULT_HEADER, format_result, run_load
+from benchmarks.servers import free_port, prepare_database, running
+
+PATHS = ['/api/offers/', '/api/reviews/', '/api/base-info/']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--paths', nargs='*', default=PATHS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env, tokens = prepare_database(directory)
+        headers = [f"Authorization: Token {tokens['customer_tokens'][0]}"]
+        port = free_port()
+        print(f'{args.workers} Worker, {args.concurrency} Verbindungen, {args.duration:.0f}s je Endpunkt')
+        for mode in ('sync', 'gthread'):
+            server_env = dict(
+                env,
+                GUNICORN_BIND=f'127.0.0.1:{port}',
+                GUNICORN_WORKER_CLASS=mode,
+                GUNICORN_THREADS=str(args.threads),
+                WEB_CONCURRENCY=str(args.workers),
+                GUNICORN_ACCESSLOG='',
+                GUNICORN_LOGLEVEL='warning',
+            )
+            command = ['gunicorn', '-c', 'gunicorn.conf.py', 'coderr_app.wsgi:application']
+            with running(command, server_env, port) as base_url:
+                label = mode if mode == 'sync' else f'{mode} ({args.threads} threads)'
+                print(f'\n{label}\n{RESULT_HEADER}')
+                for path in args.paths:
+                    result = asyncio.run(run_load(base_url + path, args.concurrency, args.duration, headers))
+                    print(format_result(path, result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Einfacher HTTP/1.1-Lastgenerator ohne Abhängigkeiten: concurrency Verbindungen schicken
+duration Sekunden lang GET-Requests (Keep-Alive, falls der Server es unterstützt) und
+messen Durchsatz und Latenzen.
+
+    python -m benchmarks.loadtest http://127.0.0.1:8000/api/offers/ -c 64 -d 10 -H "Authorization: Token <key>"
+"""
+import argparse
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('connection closed')
+    status = int(status_line.split()[1])
+    length, keep_alive = None, True
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin1').partition(':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'connection' and value == 'close':
+            keep_alive = False
+    if length is None:
+        await reader.read()
+        keep_alive = False
+    else:
+        await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def _client(host, port, request, deadline, latencies, counts):
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await _read_response(reader)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            counts['errors'] += 1
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            await asyncio.sleep(0.01)
+            continue
+        latencies.append(time.perf_counter() - started)
+        counts['ok' if status < 400 else 'errors'] += 1
+        if not keep_alive:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(url, concurrency=32, duration=10.0, headers=None):
+    """
+    Erzeugt Last auf url und gibt Requests pro Sekunde, Latenz-Perzentile und Fehler zurück.
+    """
+    parts = urlsplit(url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    lines = [f'GET {path or "/"} HTTP/1.1', f'Host: {parts.netloc}', 'Accept: application/json']
+    lines += list(headers or [])
+    request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin1')
+
+    latencies, counts = [], {'ok': 0, 'errors': 0}
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        _client(parts.hostname, parts.port or 80, request, deadline, latencies, counts)
+        for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    def percentile(q):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000 if latencies else float('nan')
+
+    return {
+        'requests_per_second': counts['ok'] / elapsed,
+        'ok': counts['ok'],
+        'errors': counts['errors'],
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+    }
+
+
+def format_result(label, result):
+    return (f"{label:28} {result['requests_per_second']:9.1f} {result['p50_ms']:8.1f} "
+            f"{result['p95_ms']:8.1f} {result['p99_ms']:8.1f} {result['errors']:7}")
+
+
+RESULT_HEADER = f'{"":28} {"req/s":>9} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"errors":>7}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('url')
+    parser.add_argument('-c', '--concurrency', type=int, default=32)
+    parser.add_argument('-d', '--duration', type=float, default=10.0)
+    parser.add_argument('-H', '--header', action='append', default=[])
+    args = parser.parse_args()
+    result = asyncio.run(run_load(args.url, args.concurrency, args.duration, args.header))
+    print(RESULT_HEADER)
+    print(format_result(urlsplit(args.url).path, result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Misst den Overhead der Middleware pro Request: die frühere Kette aus MIDDLEWARE
+(Sessions, CSRF, Auth, Messages, Clickjacking, CommonMiddleware doppelt) gegen
+RouteMiddlewareProfile für Token-Requests an die API und für Session-Requests.
+Die View selbst ist leer, damit nur Middleware und Authentifizierung gemessen werden.
+
+    python -m benchmarks.middleware [--requests 5000]
+"""
+import argparse
+import statistics
+import time
+from benchmarks import setup_django
+
+LEGACY_MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+urlpatterns = []
+
+
+def build_urlpatterns():
+    from django.urls import path
+    from rest_framework.response import Response
+    from rest_framework.views import APIView
+
+    class PingView(APIView):
+        def get(self, request):
+            return Response({'user': request.user.pk})
+
+    urlpatterns.append(path('api/ping/', PingView.as_view()))
+
+
+def measure(handler, environ, requests):
+    """
+    Schickt requests GET-Requests durch den WSGI-Handler und gibt die Zeiten in Mikrosekunden zurück.
+    """
+    def start_response(status, headers):
+        assert status.startswith('200'), status
+
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = handler(dict(environ), start_response)
+        response.close()
+        timings.append((time.perf_counter() - started) * 1e6)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    teardown = setup_django()
+    try:
+        from django.conf import settings
+        from django.contrib.auth.models import User
+        from django.core.handlers.wsgi import WSGIHandler
+        from django.test import RequestFactory, override_settings
+        from django.contrib.sessions.backends.db import SessionStore
+        from rest_framework.authtoken.models import Token
+
+        build_urlpatterns()
+        user = User.objects.create_user(username='bench', password='bench-password')
+        token = Token.objects.create(user=user)
+        session = SessionStore()
+        session.update({'_auth_user_id': str(user.pk),
+                        '_auth_user_backend': 'django.contrib.auth.backends.ModelBackend',
+                        '_auth_user_hash': user.get_session_auth_hash()})
+        session.create()
+
+        factory = RequestFactory()
+        token_environ = factory.get('/api/ping/', HTTP_AUTHORIZATION=f'Token {token.key}').environ
+        session_environ = factory.get(
+            '/api/ping/', HTTP_COOKIE=f'{settings.SESSION_COOKIE_NAME}={session.session_key}'
+        ).environ
+
+        cases = [
+            ('token, legacy MIDDLEWARE', LEGACY_MIDDLEWARE, token_environ),
+            ('token, API profile', settings.MIDDLEWARE, token_environ),
+            ('session, legacy MIDDLEWARE', LEGACY_MIDDLEWARE, session_environ),
+            ('session, session profile', settings.MIDDLEWARE, session_environ),
+        ]
+        print(f'{"case":32} {"median µs":>10} {"p95 µs":>10}')
+        for label, middleware, environ in cases:
+            with override_settings(MIDDLEWARE=middleware, ROOT_URLCONF=__name__, ALLOWED_HOSTS=['*']):
+                handler = WSGIHandler()
+                measure(handler, environ, min(200, args.requests))
+                timings = sorted(measure(handler, environ, args.requests))
+            print(f'{label:32} {statistics.median(timings):10.1f} {timings[int(len(timings) * 0.95)]:10.1f}')
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Hilfsfunktionen, um für Lasttests eine befüllte SQLite-Datenbank anzulegen und
+Server (gunicorn, uvicorn) als Unterprozesse zu starten.
+"""
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def prepare_database(directory, **seed_kwargs):
+    """
+    Migriert eine neue SQLite-Datenbank in directory, befüllt sie mit benchmarks.dataset
+    und gibt (Umgebungsvariablen für Server, Token-Schlüssel) zurück.
+    """
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{Path(directory) / 'bench.sqlite3'}",
+        IMAGE_VARIANTS_ASYNC='false',
+        PYTHONPATH=str(BASE_DIR),
+    )
+    subprocess.run([sys.executable, 'manage.py', 'migrate', '-v', '0'], cwd=BASE_DIR, env=env, check=True)
+    script = (
+        'import json, sys\n'
+        'from benchmarks import setup_django\n'
+        'setup_django(test_database=False)\n'
+        'from benchmarks.dataset import seed\n'
+        f'print(json.dumps(seed(**{seed_kwargs!r})))\n'
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', script], cwd=BASE_DIR, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return env, json.loads(output.strip().splitlines()[-1])
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def running(command, env, port, timeout=30):
+    """
+    Startet command als Unterprozess, wartet bis port Verbindungen annimmt und beendet ihn danach.
+    """
+    process = subprocess.Popen(command, cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f'{command[0]} exited: {process.stderr.read().decode()[-2000:]}')
+            with contextlib.suppress(OSError), socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                break
+            if time.monotonic() > deadline:
+                raise RuntimeError(f'{command[0]} did not start within {timeout}s')
+            time.sleep(0.1)
+        time.sleep(0.5)
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
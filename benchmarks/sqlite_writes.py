@@ -0,0 +1,142 @@
+"""
+Gleichzeitige Schreibzugriffe auf /api/orders/ und /api/reviews/ gegen eine SQLite-Datei,
+einmal mit den Standardeinstellungen und einmal mit DB_SQLITE_TUNED (WAL, synchronous=NORMAL,
+busy_timeout, mmap, BEGIN IMMEDIATE). Jeder Worker ist ein eigener Prozess wie ein
+Gunicorn-Worker; zwischen den Schreibzugriffen liest er /api/orders/.
+
+    python -m benchmarks.sqlite_writes [--workers 4] [--requests 200]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def seed(workers, tokens_path):
+    """
+    Legt einen Geschäftsnutzer mit einem Angebot und je Worker einen Kunden mit Token an.
+    """
+    from django.contrib.auth.models import User
+    from rest_framework.authtoken.models import Token
+    from coderr.models import OfferDetail, Offers, Profile
+
+    business = User.objects.create_user(username='bench-business', password='bench-password')
+    Profile.objects.create(user=business, type='business')
+    offer = Offers.objects.create(user=business, title='Benchmark', description='Benchmark offer')
+    detail = OfferDetail.objects.create(
+        offer=offer, title='Basic', revisions=1, delivery_time_in_days=3,
+        price=100, features=['A'], offer_type='basic',
+    )
+    tokens = []
+    for index in range(workers):
+        customer = User.objects.create_user(username=f'bench-customer-{index}', password='bench-password')
+        Profile.objects.create(user=customer, type='customer')
+        tokens.append(Token.objects.create(user=customer).key)
+    Path(tokens_path).write_text(json.dumps({
+        'tokens': tokens, 'offer_detail_id': detail.pk, 'business_user': business.pk,
+    }))
+
+
+def work(index, requests, tokens_path):
+    """
+    Schickt abwechselnd Bestellungen, Bewertungen und Lesezugriffe und gibt die Zählung als JSON aus.
+    """
+    from django.test import Client
+
+    data = json.loads(Path(tokens_path).read_text())
+    client = Client(HTTP_AUTHORIZATION=f"Token {data['tokens'][index]}")
+    counts = {'ok': 0, 'errors': 0, 'locked': 0}
+    latencies = []
+    started = time.perf_counter()
+    for number in range(requests):
+        request_started = time.perf_counter()
+        try:
+            if number % 3 == 0:
+                response = client.post('/api/orders/', {'offer_detail_id': data['offer_detail_id']},
+                                       content_type='application/json')
+            elif number % 3 == 1:
+                response = client.post('/api/reviews/', {
+                    'business_user': data['business_user'], 'rating': 4, 'description': f'Review {number}',
+                }, content_type='application/json')
+            else:
+                response = client.get('/api/orders/')
+            counts['ok' if response.status_code < 400 else 'errors'] += 1
+        except Exception as exc:
+            counts['locked' if 'locked' in str(exc) else 'errors'] += 1
+        latencies.append(time.perf_counter() - request_started)
+    counts['elapsed'] = time.perf_counter() - started
+    counts['latencies'] = latencies
+    print(json.dumps(counts))
+
+
+def run(tuned, workers, requests):
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{Path(directory) / 'bench.sqlite3'}",
+            DB_SQLITE_TUNED='true' if tuned else 'false',
+            IMAGE_VARIANTS_ASYNC='false',
+        )
+        tokens_path = str(Path(directory) / 'tokens.json')
+        subprocess.run([sys.executable, 'manage.py', 'migrate', '-v', '0'], cwd=BASE_DIR, env=env, check=True)
+        subprocess.run(
+            [sys.executable, '-m', 'benchmarks.sqlite_writes', '--seed', '--workers', str(workers),
+             '--tokens', tokens_path], cwd=BASE_DIR, env=env, check=True,
+        )
+        processes = [
+            subprocess.Popen(
+                [sys.executable, '-m', 'benchmarks.sqlite_writes', '--worker', str(index),
+                 '--requests', str(requests), '--tokens', tokens_path],
+                cwd=BASE_DIR, env=env, stdout=subprocess.PIPE, text=True,
+            )
+            for index in range(workers)
+        ]
+        results = [json.loads(process.communicate()[0].strip().splitlines()[-1]) for process in processes]
+
+    latencies = sorted(latency for result in results for latency in result['latencies'])
+    total = sum(result['ok'] + result['errors'] + result['locked'] for result in results)
+    elapsed = max(result['elapsed'] for result in results)
+    return {
+        'ok': sum(result['ok'] for result in results),
+        'errors': sum(result['errors'] for result in results),
+        'locked': sum(result['locked'] for result in results),
+        'requests_per_second': total / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=200, help='Requests pro Worker.')
+    parser.add_argument('--seed', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--worker', type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--tokens', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed or args.worker is not None:
+        from benchmarks import setup_django
+        setup_django(test_database=False)
+        if args.seed:
+            seed(args.workers, args.tokens)
+        else:
+            work(args.worker, args.requests, args.tokens)
+        return
+
+    print(f'{args.workers} Worker x {args.requests} Requests')
+    print(f'{"mode":8} {"ok":>6} {"errors":>7} {"locked":>7} {"req/s":>8} {"p50 ms":>8} {"p99 ms":>8}')
+    for label, tuned in (('default', False), ('tuned', True)):
+        result = run(tuned, args.workers, args.requests)
+        print(f"{label:8} {result['ok']:6} {result['errors']:7} {result['locked']:7} "
+              f"{result['requests_per_second']:8.1f} {result['p50_ms']:8.1f} {result['p99_ms']:8.1f}")
+
+
+if __name__ == '__main__':
+    main()
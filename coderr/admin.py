@@ -1,8 +1,15 @@
 from django.contrib import admin
-from .models import Profile, Offers, OfferDetail, Order, Review
+from .models import Profile, Offers, OfferDetail, Order, Review, Job
 
 admin.site.register(Profile)
 admin.site.register(Offers)
 admin.site.register(OfferDetail)
 admin.site.register(Order)
-admin.site.register(Review)
\ No newline at end of file
+admin.site.register(Review)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'status', 'attempts', 'run_after', 'locked_by', 'updated_at']
+    list_filter = ['status', 'kind']
+    readonly_fields = ['created_at', 'updated_at']
@@ -0,0 +1,44 @@
+import functools
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.permissions import SAFE_METHODS
+
+
+def read_view(view_class, asynchronous=None, **initkwargs):
+    """
+    Gibt die View-Funktion für eine lesende DRF-View zurück. Mit ASYNC_READ_VIEWS (gesetzt von
+    coderr_app/asgi.py) ist das eine async-View: Django 3.2 und DRF kennen weder asynchrone
+    ORM-Abfragen noch async-Views, daher läuft die DRF-View samt Rendern der Antwort in einem
+    Thread-Pool (thread_sensitive=False) und blockiert weder die Event-Loop noch den einen
+    Thread, auf dem Django unter ASGI sonst alle synchronen Views nacheinander ausführt.
+    Schreibende Methoden bleiben auf diesem Thread (thread_sensitive=True).
+    """
+    view = view_class.as_view(**initkwargs)
+    if asynchronous is None:
+        asynchronous = settings.ASYNC_READ_VIEWS
+    if not asynchronous:
+        return view
+
+    def run(request, *args, **kwargs):
+        # Pool-Threads laufen außerhalb von request_started/finished und haben eigene
+        # Verbindungen; CONN_MAX_AGE und fehlerhafte Verbindungen werden hier behandelt.
+        close_old_connections()
+        try:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            return response
+        finally:
+            close_old_connections()
+
+    read = sync_to_async(run, thread_sensitive=False)
+    write = sync_to_async(run, thread_sensitive=True)
+
+    async def async_view(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return await read(request, *args, **kwargs)
+        return await write(request, *args, **kwargs)
+
+    functools.update_wrapper(async_view, view)
+    return async_view
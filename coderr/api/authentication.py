@@ -0,0 +1,223 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from coderr.models import Profile
+
+
+class TokenCache:
+    """
+    Begrenzter LRU-Cache im Prozess, der Token-Schlüssel auf die Datenbankzeilen von
+    Token, User und Profile abbildet. Einträge laufen nach ttl Sekunden ab. Ob ein Eintrag
+    noch gilt, prüft CachedTokenAuthentication bei jedem Treffer über die Widerrufsgeneration
+    des Benutzers im gemeinsamen Cache (siehe revoke_user).
+    """
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry['cached_at'] + self.ttl <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        entry['cached_at'] = time.monotonic()
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._keys_by_user.setdefault(entry['user_id'], set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def discard(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def discard_user(self, user_id):
+        """
+        Entfernt alle Einträge eines Benutzers (z. B. nach Änderung von Benutzer oder Profil).
+        """
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._keys_by_user.get(entry['user_id'])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[entry['user_id']]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = TokenCache(
+    getattr(settings, 'AUTH_TOKEN_CACHE_MAX_ENTRIES', 10000),
+    getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 60),
+)
+
+
+def token_expires_at(token):
+    """
+    Gibt den Ablaufzeitpunkt eines Tokens zurück, bzw. None, wenn AUTH_TOKEN_TTL nicht gesetzt ist.
+    """
+    ttl = getattr(settings, 'AUTH_TOKEN_TTL', None)
+    return token.created + timedelta(seconds=ttl) if ttl else None
+
+
+def token_needs_rotation(token):
+    """
+    Prüft, ob ein Token beim Login ersetzt werden soll (älter als AUTH_TOKEN_ROTATE_AFTER oder abgelaufen).
+    """
+    rotate_after = getattr(settings, 'AUTH_TOKEN_ROTATE_AFTER', None)
+    expires_at = token_expires_at(token)
+    now = timezone.now()
+    if expires_at is not None and expires_at <= now:
+        return True
+    return bool(rotate_after) and token.created + timedelta(seconds=rotate_after) <= now
+
+
+def get_login_token(user):
+    """
+    Gibt das aktuelle Token des Benutzers zurück und ersetzt es, wenn es rotiert werden muss.
+    """
+    token = Token.objects.filter(user=user).first()
+    if token is not None and not token_needs_rotation(token):
+        return token
+    with transaction.atomic():
+        Token.objects.filter(user=user).delete()
+        return Token.objects.create(user=user)
+
+
+def _row(instance):
+    return [field.attname for field in instance._meta.concrete_fields], [
+        getattr(instance, field.attname) for field in instance._meta.concrete_fields
+    ]
+
+
+def revocation_key(user_id):
+    return f'auth:revocation:{user_id}'
+
+
+def get_revocation(user_id):
+    """
+    Liest die Widerrufsgeneration eines Benutzers aus dem gemeinsamen Cache. Fehlt sie (Neustart,
+    Verdrängung), wird ein zeitbasierter Startwert gesetzt; ältere Einträge gelten dann nicht mehr.
+    """
+    key = revocation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def revoke_user(user_id):
+    """
+    Verwirft die gecachten Tokens eines Benutzers in allen Prozessen: lokal sofort, in den
+    anderen Prozessen über eine neue Widerrufsgeneration im gemeinsamen Cache.
+    """
+    token_cache.discard_user(user_id)
+    cache.set(revocation_key(user_id), time.time_ns(), timeout=None)
+
+
+def revoke_user_on_commit(user_id):
+    """
+    Wie revoke_user, die neue Generation wird aber erst nach dem Commit gesetzt, damit kein
+    anderer Prozess den alten Stand der Datenbank unter der neuen Generation cacht.
+    """
+    token_cache.discard_user(user_id)
+    transaction.on_commit(lambda: revoke_user(user_id))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication mit Ablaufzeit und prozesslokalem Cache.
+    Ein Treffer kommt ohne Datenbankabfrage aus: Benutzer und Profil werden aus den gespeicherten
+    Zeilen aufgebaut, sofern die Widerrufsgeneration des Benutzers im gemeinsamen Cache unverändert
+    ist. Logout, Rotation, Löschen und jede über save()/delete() gespeicherte Änderung an Benutzer
+    oder Profil setzen eine neue Generation (coderr.signals); Änderungen über QuerySet.update()
+    werden spätestens nach AUTH_TOKEN_CACHE_TTL sichtbar.
+    """
+
+    def authenticate_credentials(self, key):
+        entry, revocation = token_cache.get(key), None
+        if entry is not None:
+            revocation = cache.get(revocation_key(entry['user_id']))
+            if revocation != entry['revocation']:
+                token_cache.discard(key)
+                entry = None
+        if entry is None:
+            try:
+                token = Token.objects.select_related('user__profile').get(key=key)
+            except Token.DoesNotExist:
+                raise AuthenticationFailed('Invalid token.')
+            entry = self.make_entry(token, revocation)
+            token_cache.set(key, entry)
+
+        if entry['expires_at'] is not None and entry['expires_at'] <= timezone.now():
+            token_cache.discard(key)
+            raise AuthenticationFailed('Token has expired.')
+
+        user, token = self.build(entry)
+        if not user.is_active:
+            raise AuthenticationFailed('User inactive or deleted.')
+        return user, token
+
+    def make_entry(self, token, revocation=None):
+        # Ist die Generation schon vor dem Laden bekannt, wird sie übernommen: Ein Widerruf
+        # während des Ladens macht den Eintrag dann beim nächsten Treffer ungültig.
+        user = token.user
+        try:
+            profile = user.profile
+        except Profile.DoesNotExist:
+            profile = None
+        return {
+            'user_id': user.pk,
+            'db': token._state.db,
+            'token': _row(token),
+            'user': _row(user),
+            'profile': _row(profile) if profile is not None else None,
+            'expires_at': token_expires_at(token),
+            'revocation': revocation if revocation is not None else get_revocation(user.pk),
+        }
+    def build(self, entry):
+        db = entry['db']
+        user = User.from_db(db, *entry['user'])
+        if entry['profile'] is not None:
+            profile = Profile.from_db(db, *entry['profile'])
+            profile.user = user
+            user.profile = profile
+        else:
+            User.profile.related.set_cached_value(user, None)
+        token = Token.from_db(db, *entry['token'])
+        token.user = user
+        return user, token
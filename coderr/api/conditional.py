@@ -0,0 +1,51 @@
+import datetime
+import hashlib
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+
+
+class ConditionalGetMixin:
+    """
+    Mixin für Detail-Views, das bedingte GET-Anfragen (If-None-Match / If-Modified-Since)
+    über eine günstige Versionsabfrage beantwortet, ohne den Serializer auszuführen.
+    get_version(pk) liefert eine Liste von Werten, die sich bei jeder Änderung der Antwort
+    ändern; standardmäßig ist das updated_at des Objekts aus queryset. Views ohne queryset
+    oder mit verschachtelten Daten überschreiben get_version, was beim Anlegen der Klasse geprüft wird.
+    """
+    validators = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.get_version is ConditionalGetMixin.get_version and getattr(cls, 'queryset', None) is None:
+            raise ImproperlyConfigured(f'{cls.__name__} must define queryset or override get_version().')
+
+    def get_version(self, pk):
+        return self.queryset.filter(pk=pk).values_list('updated_at').first()
+
+    def not_modified_response(self, request, pk):
+        """
+        Gibt eine 304-Antwort zurück, wenn die Version des Clients aktuell ist, sonst None.
+        """
+        version = self.get_version(pk)
+        if version is None:
+            return None
+        version = list(version)
+        digest = hashlib.sha1(repr(version).encode('utf-8')).hexdigest()
+        timestamps = [value for value in version if isinstance(value, datetime.datetime)]
+        self.validators = {
+            'etag': f'W/"{digest}"',
+            'last_modified': int(max(timestamps).timestamp()) if timestamps else None,
+        }
+        return get_conditional_response(request._request, **self.validators)
+
+    def add_validators(self, response):
+        """
+        Ergänzt eine erfolgreiche Antwort um ETag und Last-Modified.
+        """
+        if self.validators and response.status_code == status.HTTP_200_OK:
+            response['ETag'] = self.validators['etag']
+            if self.validators['last_modified'] is not None:
+                response['Last-Modified'] = http_date(self.validators['last_modified'])
+        return response
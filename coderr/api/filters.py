@@ -1,6 +1,9 @@
 import django_filters
 from django.db.models import Min, Max
+from django.conf import settings
+from rest_framework.filters import OrderingFilter, SearchFilter
 from coderr.models import Offers, Review, OfferDetail, Profile
+from coderr.search import full_text_search_supported, search_offers
 
 class ReviewFilter(django_filters.FilterSet):
     """
@@ -47,4 +50,47 @@ class OffersFilter(django_filters.FilterSet):
         """
         Filter für Angebote mit einer maximalen Lieferzeit.
         """
-        return queryset.filter(max_delivery_time__lte=value)
+        return queryset.filter(min_delivery_time__lte=value)
+
+class OffersOrderingFilter(OrderingFilter):
+    """
+    Sortierung für Angebote, die den alten Parameter max_delivery_time auf die
+    gespeicherte Spalte min_delivery_time abbildet.
+    """
+    ordering_aliases = {'max_delivery_time': 'min_delivery_time'}
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Ersetzt Aliase in der angeforderten Sortierung durch die echten Spaltennamen.
+        """
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        mapped = []
+        for field in ordering:
+            prefix = '-' if field.startswith('-') else ''
+            name = field.lstrip('-')
+            mapped.append(prefix + self.ordering_aliases.get(name, name))
+        return mapped
+
+class OffersSearchFilter(SearchFilter):
+    """
+    Volltextsuche für Angebote über den FTS5- bzw. tsvector-Index.
+    Ohne expliziten ordering-Parameter werden die Treffer nach Relevanz sortiert.
+    Mit OFFERS_SEARCH_BACKEND = 'basic' wird die icontains-Suche von DRF verwendet.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        """
+        Filtert das Queryset über den Volltextindex, sofern die Datenbank ihn unterstützt.
+        """
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+        if getattr(settings, 'OFFERS_SEARCH_BACKEND', 'fulltext') != 'fulltext' or not full_text_search_supported(queryset):
+            return super().filter_queryset(request, queryset, view)
+
+        queryset = search_offers(queryset, search_terms)
+        if not request.query_params.get(OrderingFilter.ordering_param):
+            queryset = queryset.order_by('-search_rank', 'id')
+        return queryset
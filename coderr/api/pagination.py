@@ -0,0 +1,238 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+from collections import OrderedDict
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor-Paginierung über die Werte der Sortierfelder (Keyset/Seek-Methode).
+    Die Sortierung des Querysets wird um die ID ergänzt, damit jede Position eindeutig ist.
+    Tiefe Seiten kosten dadurch gleich viel wie die erste, und es wird kein COUNT(*) ausgeführt.
+    """
+    cursor_query_param = 'cursor'
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    default_ordering = ('updated_at',)
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Gibt die Objekte der durch den Cursor bestimmten Seite zurück.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        values, reverse = self.decode_cursor(request, queryset)
+
+        ordering = [(field, not descending if reverse else descending) for field, descending in self.ordering]
+        if values is not None:
+            queryset = queryset.filter(self.seek_filter(queryset, ordering, values))
+        queryset = queryset.order_by(*[self.order_expression(queryset, field, descending) for field, descending in ordering])
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next = values is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = values is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        """
+        Liest die Seitengröße aus der Anfrage und begrenzt sie auf max_page_size.
+        """
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """
+        Ermittelt die Sortierung des Querysets als Liste von (Feld, absteigend)
+        und ergänzt die ID als eindeutiges letztes Kriterium.
+        """
+        order_by = [field for field in queryset.query.order_by if isinstance(field, str)]
+        if not order_by:
+            order_by = list(self.default_ordering)
+        ordering = [(field.lstrip('-'), field.startswith('-')) for field in order_by]
+        ordering = [('id' if field == 'pk' else field, descending) for field, descending in ordering]
+        if 'id' not in [field for field, _ in ordering]:
+            ordering.append(('id', ordering[0][1]))
+        return ordering
+
+    def is_nullable(self, queryset, field):
+        try:
+            return queryset.model._meta.get_field(field).null
+        except FieldDoesNotExist:
+            return False
+
+    def order_expression(self, queryset, field, descending):
+        """
+        Sortiert NULL-Werte immer als kleinste Werte, damit die Cursor-Bedingungen eindeutig sind.
+        """
+        if not self.is_nullable(queryset, field):
+            return f'-{field}' if descending else field
+        if descending:
+            return F(field).desc(nulls_last=True)
+        return F(field).asc(nulls_first=True)
+
+    def seek_filter(self, queryset, ordering, values):
+        """
+        Baut die Bedingung "Zeile liegt hinter dem Cursor" für eine zusammengesetzte Sortierung.
+        """
+        conditions = []
+        equal = Q()
+        for (field, descending), value in zip(ordering, values):
+            if value is None:
+                if not descending:
+                    conditions.append(equal & Q(**{f'{field}__isnull': False}))
+                equal &= Q(**{f'{field}__isnull': True})
+                continue
+            after = Q(**{f'{field}__lt' if descending else f'{field}__gt': value})
+            if descending and self.is_nullable(queryset, field):
+                after |= Q(**{f'{field}__isnull': True})
+            conditions.append(equal & after)
+            equal &= Q(**{field: value})
+        condition = conditions[0]
+        for other in conditions[1:]:
+            condition |= other
+        return condition
+
+    def get_model_field(self, queryset, field):
+        """
+        Gibt das Modellfeld bzw. den Ausgabetyp einer Annotation für ein Sortierfeld zurück.
+        """
+        annotation = queryset.query.annotations.get(field)
+        if annotation is not None:
+            return annotation.output_field
+        model = queryset.model
+        *relations, name = field.split('__')
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.get_field(name)
+
+    def decode_cursor(self, request, queryset):
+        """
+        Liest Werte und Richtung aus dem Cursor. Ein leerer Cursor steht für die erste Seite.
+        Jeder Wert wird mit to_python des Sortierfelds umgewandelt, sodass manipulierte Cursor
+        mit 404 statt mit einem Datenbankfehler beantwortet werden.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            values = payload['v']
+            reverse = bool(payload.get('r', False))
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            values = [
+                None if value is None else self.get_model_field(queryset, field).to_python(value)
+                for (field, _), value in zip(self.ordering, values)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, obj, reverse):
+        values = [self.cursor_value(obj, field) for field, _ in self.ordering]
+        payload = {'v': values}
+        if reverse:
+            payload['r'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8')).decode('ascii')
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def cursor_value(self, obj, field):
+        value = obj
+        for part in field.split('__'):
+            value = getattr(value, part)
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.isoformat()
+        if isinstance(value, decimal.Decimal):
+            return str(value)
+        return value
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, '')
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+class CustomPagination(PageNumberPagination):
+    """
+    Benutzerdefinierte Paginierungsklasse zur Steuerung der Anzahl und Größe von Seiten.
+    Enthält die Anfrage den Parameter cursor (auch leer), wird stattdessen die
+    Keyset-Paginierung verwendet; ?page= funktioniert weiterhin wie bisher.
+    """
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_pagination_class = KeysetPagination
+
+    def __init__(self):
+        self.cursor_mode = False
+        self.cursor_paginator = None
+
+    def is_cursor_request(self, request):
+        return self.cursor_pagination_class.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.is_cursor_request(request)
+        if self.cursor_mode:
+            self.cursor_paginator = self.cursor_pagination_class()
+            self.cursor_paginator.page_size = self.page_size
+            self.cursor_paginator.page_size_query_param = self.page_size_query_param
+            self.cursor_paginator.max_page_size = self.max_page_size
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_mode:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -1,7 +1,30 @@
 from rest_framework.permissions import BasePermission
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import BasePermission, SAFE_METHODS
+from django.contrib.auth.models import User
+from coderr.models import Profile
  
+def get_profile_type(request):
+    """
+    Gibt den Profiltyp ('business', 'customer' oder None) des angemeldeten Benutzers zurück.
+    Der Wert wird einmal pro Request ermittelt und am Request gespeichert. Ist das Profil schon
+    mit dem Benutzer geladen (z. B. durch CachedTokenAuthentication), entsteht keine Abfrage.
+    """
+    try:
+        return request.profile_type
+    except AttributeError:
+        pass
+    user = request.user
+    if not user or not user.is_authenticated:
+        profile_type = None
+    elif User.profile.related.is_cached(user):
+        profile = User.profile.related.get_cached_value(user)
+        profile_type = profile.type if profile is not None else None
+    else:
+        profile_type = Profile.objects.filter(user_id=user.pk).values_list('type', flat=True).first()
+    request.profile_type = profile_type
+    return profile_type
+
 class IsOwnerOrAdminPermission(BasePermission):
     """
     Gewährt Zugriff nur, wenn der Benutzer der Besitzer eines Objekts oder ein Admin ist.
@@ -18,8 +41,7 @@ class IsBusinessUser(BasePermission):
     def has_permission(self, request, view):
         if request.method in SAFE_METHODS:
             return True
-        profile = getattr(request.user, 'profile', None)
-        return profile and profile.type == 'business'
+        return get_profile_type(request) == 'business'
 
 class IsCustomerUser(BasePermission):
     """
@@ -28,8 +50,7 @@ class IsCustomerUser(BasePermission):
     def has_permission(self, request, view):
         if request.method in SAFE_METHODS:
             return True
-        profile = getattr(request.user, 'profile', None)
-        return profile and profile.type == 'customer'
+        return get_profile_type(request) == 'customer'
     
 class OrderPermissions(BasePermission):
     """
@@ -40,13 +61,11 @@ class OrderPermissions(BasePermission):
     - Any authenticated user to read (GET) orders
     """
     def has_permission(self, request, view):
-        profile = getattr(request.user, 'profile', None)
-
         if request.method == 'POST':
-            return profile and profile.type == 'customer'
+            return get_profile_type(request) == 'customer'
 
         if request.method == 'PATCH':
-            return profile and profile.type == 'business'
+            return get_profile_type(request) == 'business'
         
         if request.method == 'DELETE':
             return request.user.is_staff 
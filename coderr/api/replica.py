@@ -0,0 +1,27 @@
+from rest_framework.permissions import SAFE_METHODS
+from coderr.routers import is_pinned, replica_alias, reset_replica, use_replica
+
+
+class ReplicaReadMixin:
+    """
+    Mixin für lesende Views, deren Abfragen an die Lese-Replik gehen dürfen.
+    Authentifizierung und Berechtigungsprüfung laufen noch auf dem Primary; danach werden
+    GET/HEAD/OPTIONS auf die Replik umgeschaltet, außer der Benutzer hat kürzlich geschrieben.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        self._replica_token = None
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self._replica_token is not None:
+                reset_replica(self._replica_token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in SAFE_METHODS or replica_alias() is None:
+            return
+        user = request.user
+        if user.is_authenticated and is_pinned(request, user.pk):
+            return
+        self._replica_token = use_replica()
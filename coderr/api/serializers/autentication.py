@@ -1,8 +1,11 @@
 from rest_framework import serializers
 from coderr.models import Profile, OfferDetail, Offers, Order, Review
 from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.contrib.auth import authenticate
 from rest_framework.authtoken.models import Token
+from django.db import IntegrityError, transaction
+from coderr.api.authentication import get_login_token
 
 class RegistrationSerializer(serializers.ModelSerializer):
     repeated_password = serializers.CharField(write_only=True, required=True)
@@ -16,6 +19,8 @@ class RegistrationSerializer(serializers.ModelSerializer):
                   'repeated_password', 
                   'type']
         extra_kwargs = {
+            # Eindeutigkeit prüft die Datenbank beim Einfügen, nicht ein vorheriger SELECT.
+            'username': {'validators': [UnicodeUsernameValidator()]},
             'email': {'required': True},
             'password': {'write_only': True},
             'repeated_password': {'write_only': True}
@@ -23,41 +28,37 @@ class RegistrationSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         """
-        Validiert, ob die Passwörter übereinstimmen und ob der Benutzername oder die E-Mail bereits existieren.
+        Validiert, ob die Passwörter übereinstimmen. Die Eindeutigkeit von Benutzername und
+        E-Mail wird beim Anlegen von der Datenbank geprüft.
         """
 
         if data['password'] != data['repeated_password']:
             raise serializers.ValidationError({"password": "Passwords do not match."})
 
-        if User.objects.filter(username=data['username']).exists():
-            raise serializers.ValidationError({"username": "A user with this username already exists."})
-
-        if User.objects.filter(email=data['email']).exists():
-            raise serializers.ValidationError({"email": "A user with this email already exists."})
-
         return data
 
     def create(self, validated_data):
         """
-        Benutzer und Profil erstellen.
+        Benutzer, Profil und Token in einer Transaktion erstellen.
+        Das Passwort wird vorher gehasht, damit die Transaktion kurz bleibt. Verletzt der Benutzer
+        einen eindeutigen Index (Benutzername oder E-Mail), wird das als Feldfehler gemeldet.
         """
-        password = validated_data.pop('password')
-        validated_data.pop('repeated_password')
-
-        profile_type = validated_data.pop('type')
-
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data['email'],
-            password=password,
+        user = User(
+            username=User.normalize_username(validated_data['username']),
+            email=User.objects.normalize_email(validated_data['email']),
         )
-        
-        profile = Profile.objects.create(
-            user=user,
-            type=profile_type  
-            )
-        
-        token, created = Token.objects.get_or_create(user=user)
+        user.set_password(validated_data['password'])
+
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+                Profile.objects.create(user=user, type=validated_data['type'])
+                token = Token.objects.create(user=user)
+        except IntegrityError:
+            errors = self.unique_violation(user)
+            if not errors:
+                raise
+            raise serializers.ValidationError(errors)
 
         response_data = {
             'user_id': user.id,
@@ -68,13 +69,26 @@ class RegistrationSerializer(serializers.ModelSerializer):
 
         return response_data
 
+    def unique_violation(self, user):
+        """
+        Ermittelt nach einer IntegrityError, welche Felder bereits vergeben sind.
+        Die Abfragen laufen nur im Konfliktfall, nicht bei jeder Registrierung.
+        """
+        errors = {}
+        if User.objects.filter(username=user.username).exists():
+            errors['username'] = "A user with this username already exists."
+        if User.objects.filter(email__iexact=user.email).exists():
+            errors['email'] = "A user with this email already exists."
+        return errors
+
 class CustomAuthTokenSerializer(serializers.Serializer):
     username = serializers.CharField()
     password = serializers.CharField(write_only=True)
 
     def validate(self, attrs):
         """
-        Validiert die Anmeldedaten, authentifiziert den Benutzer und erstellt/überprüft das Authentifizierungs-Token.
+        Validiert die Anmeldedaten, authentifiziert den Benutzer und erstellt das Authentifizierungs-Token
+        bzw. ersetzt es, wenn es abgelaufen oder älter als AUTH_TOKEN_ROTATE_AFTER ist.
         """
 
         username = attrs.get('username')
@@ -83,11 +97,8 @@ class CustomAuthTokenSerializer(serializers.Serializer):
         user = authenticate(username=username, password=password)
         if not user:
             raise serializers.ValidationError("Invalid username or password.")
-        
-        if not User.objects.filter(username=username).exists():
-            raise serializers.ValidationError({"username": "A user with this username don't exists."})
 
-        token, created = Token.objects.get_or_create(user=user)
+        token = get_login_token(user)
        
         response_data = {
             'token': token.key,
@@ -0,0 +1,20 @@
+from rest_framework import serializers
+from coderr.images import variant_urls
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Gibt Status und URLs der verkleinerten Bildvarianten zurück (absolut, wenn ein Request im Kontext ist).
+    image_field ist der Name des zugehörigen ImageFields, dessen Original als Ersatz dient.
+    """
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        return getattr(instance, self.image_field), super().get_attribute(instance)
+
+    def to_representation(self, value):
+        field_file, variants = value
+        return variant_urls(field_file, variants, self.context.get('request'))
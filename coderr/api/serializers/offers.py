@@ -4,7 +4,9 @@ from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from rest_framework.authtoken.models import Token
 from django.db import transaction
+from django.utils import timezone
 import json
+from coderr.api.serializers.fields import ImageVariantsField
 
 
 class OfferDetailsSerializer(serializers.ModelSerializer):
@@ -40,8 +42,9 @@ class OffersSerializer(serializers.ModelSerializer):
     Serializer für Angebote (Offers) mit ihren Details, Preisen und Benutzerinformationen.
     """
     details = serializers.SerializerMethodField()
-    min_price = serializers.SerializerMethodField()  
-    min_delivery_time = serializers.SerializerMethodField()  
+    image_variants = ImageVariantsField('image')
+    min_price = serializers.ReadOnlyField()
+    min_delivery_time = serializers.ReadOnlyField()
     user_details = serializers.SerializerMethodField()  
 
     class Meta:
@@ -51,6 +54,7 @@ class OffersSerializer(serializers.ModelSerializer):
             'user',
             'title',
             'image',
+            'image_variants',
             'description',
             'created_at',
             'updated_at',
@@ -72,24 +76,6 @@ class OffersSerializer(serializers.ModelSerializer):
             details_url.append(detail_url)
         return details_url
           
-    def get_min_price(self, obj):
-        """
-        Gibt den niedrigsten Preis in den OfferDetails zurück.
-        """
-        details = obj.details.all()
-        if details:
-            return min(detail.price for detail in details)  
-        return None
-    
-    def get_min_delivery_time(self, obj):
-        """
-        Gibt die kürzeste Lieferzeit in den OfferDetails zurück.
-        """
-        details = obj.details.all()
-        if details:
-            return min(detail.delivery_time_in_days for detail in details)  
-        return None
-   
     def get_user_details(self, obj):
         """
         Gibt die Benutzerdetails des Angebots zurück.
@@ -117,6 +103,7 @@ class OffersSerializer(serializers.ModelSerializer):
             OfferDetail.objects.bulk_create([
                 OfferDetail(offer=offer, **detail) for detail in details_data
             ])
+            offer.refresh_min_values()
         return offer
 
 class DetailOfferSerializer(serializers.ModelSerializer):
@@ -125,8 +112,9 @@ class DetailOfferSerializer(serializers.ModelSerializer):
     """
 
     details = OfferDetailsSerializer(many=True)
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()  
+    image_variants = ImageVariantsField('image')
+    min_price = serializers.ReadOnlyField()
+    min_delivery_time = serializers.ReadOnlyField()
     user_details = serializers.SerializerMethodField() 
     class Meta:
         model = Offers
@@ -135,6 +123,7 @@ class DetailOfferSerializer(serializers.ModelSerializer):
             'user',
             'title',
             'image',
+            'image_variants',
             'description',
             'created_at',
             'updated_at',
@@ -144,24 +133,6 @@ class DetailOfferSerializer(serializers.ModelSerializer):
             'user_details'
         ]   
          
-    def get_min_price(self, obj):
-        """
-        Gibt den niedrigsten Preis in den OfferDetails zurück.
-        """
-        details = obj.details.all()
-        if details:
-            return min(detail.price for detail in details)  
-        return None
-    
-    def get_min_delivery_time(self, obj):
-        """
-        Gibt die kürzeste Lieferzeit in den OfferDetails zurück.
-        """
-        details = obj.details.all()
-        if details:
-            return min(detail.delivery_time_in_days for detail in details)  
-        return None
-   
     def get_user_details(self, obj):
         """
         Gibt die Benutzerdetails des Angebots zurück.
@@ -176,35 +147,92 @@ class DetailOfferSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         """
         Aktualisiert ein Angebot und seine zugehörigen OfferDetails.
-        """
-        details_data = self.context['request'].data.get('details', [])
-        existing_details = list(instance.details.all())  
-
-        for detail, detail_data in zip(existing_details, details_data):
-            detail.title = detail_data.get('title', detail.title)
-            detail.revisions = detail_data.get('revisions', detail.revisions)
-            detail.delivery_time_in_days = detail_data.get('delivery_time_in_days', detail.delivery_time_in_days)
-            detail.price = detail_data.get('price', detail.price)
-            detail.features = detail_data.get('features', detail.features)
-            detail.offer_type = detail_data.get('offer_type', detail.offer_type)
-            detail.save()
-          
-        instance.title = validated_data.get('title', instance.title)
-        instance.image = validated_data.get('image', instance.image)
-        instance.description = validated_data.get('description', instance.description)
-        instance.save()
+        Details werden über id oder offer_type zugeordnet (ohne beides wie bisher über die Position)
+        und alle geänderten Details mit einem bulk_update in derselben Transaktion geschrieben.
+        Die Antwort verwendet die bereits geladenen und angepassten Objekte.
+        """
+        details_data = validated_data.pop('details', [])
+        existing_details = sorted(instance.details.all(), key=lambda detail: detail.pk)
+        changed_details, changed_fields = [], set()
+
+        for detail, detail_data in self.match_details(existing_details, details_data):
+            fields = [
+                name for name, value in detail_data.items()
+                if getattr(detail, name) != value
+            ]
+            if not fields:
+                continue
+            for name in fields:
+                setattr(detail, name, detail_data[name])
+            detail.updated_at = timezone.now()
+            changed_details.append(detail)
+            changed_fields.update(fields)
+
+        offer_fields = [
+            name for name in ('title', 'description')
+            if name in validated_data and getattr(instance, name) != validated_data[name]
+        ]
+        if 'image' in validated_data:
+            offer_fields.append('image')
+        for name in offer_fields:
+            setattr(instance, name, validated_data[name])
 
-        return instance   
+        if existing_details:
+            instance.min_price = min(detail.price for detail in existing_details)
+            instance.min_delivery_time = min(detail.delivery_time_in_days for detail in existing_details)
+
+        with transaction.atomic():
+            if changed_details:
+                OfferDetail.objects.bulk_update(changed_details, [*sorted(changed_fields), 'updated_at'])
+            instance.save(update_fields=[*offer_fields, 'min_price', 'min_delivery_time', 'updated_at'])
+
+        return instance
+
+    def match_details(self, existing_details, details_data):
+        """
+        Ordnet die übermittelten Details den vorhandenen OfferDetails zu.
+        """
+        raw_details = self.initial_data.get('details', [])
+        by_id = {detail.pk: detail for detail in existing_details}
+        by_type = {detail.offer_type: detail for detail in existing_details}
+        pairs, errors = [], []
+
+        for index, detail_data in enumerate(details_data):
+            raw = raw_details[index] if index < len(raw_details) else {}
+            detail_id = raw.get('id') if isinstance(raw, dict) else None
+            if detail_id is not None:
+                # Die id kommt ungeprüft aus initial_data, z. B. als "5" bei Multipart-Requests.
+                try:
+                    detail_id = serializers.IntegerField().to_internal_value(detail_id)
+                except serializers.ValidationError as exc:
+                    errors.append({'id': exc.detail})
+                    continue
+                detail = by_id.get(detail_id)
+            elif 'offer_type' in detail_data:
+                detail = by_type.get(detail_data['offer_type'])
+            else:
+                detail = existing_details[index] if index < len(existing_details) else None
+
+            if detail is None:
+                errors.append({'non_field_errors': ['No matching offer detail found.']})
+            else:
+                errors.append({})
+                pairs.append((detail, detail_data))
+
+        if any(errors):
+            raise serializers.ValidationError({'details': errors})
+        return pairs
 
 class SimplifiedOffersSerializer(serializers.ModelSerializer):
     """
     Serializer für vereinfachte Angebote mit grundlegenden Details.
     """
     details = OfferDetailsSerializer(many=True)
+    image_variants = ImageVariantsField('image')
 
     class Meta:
         model = Offers
-        fields = ['id', 'title', 'image', 'description', 'details']
+        fields = ['id', 'title', 'image', 'image_variants', 'description', 'details']
 
 
 
@@ -3,6 +3,7 @@ from coderr.models import Profile, OfferDetail, Offers, Order, Review
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from rest_framework.authtoken.models import Token
+from coderr.api.serializers.fields import ImageVariantsField
 
 class UserTypeSerializer(serializers.ModelSerializer):
     """
@@ -100,12 +101,14 @@ class BuisnessSerializer(serializers.ModelSerializer):
     Serializer für Geschäftsnutzerprofile mit Benutzerdetails und spezifischen Feldern.
     """
     user = UserTypeSerializer()
+    file_variants = ImageVariantsField('file')
     
     class Meta:
         model = Profile
         fields = [
             'user',                     
             'file',           
+            'file_variants',
             'location',       
             'tel',            
             'description',    
@@ -119,12 +122,14 @@ class CustomerSerializer(serializers.ModelSerializer):
     """
     user = UserTypeSerializer()
     uploaded_at = serializers.DateTimeField(source='created_at')  
+    file_variants = ImageVariantsField('file')
 
     class Meta:
         model = Profile
         fields = [
             'user',       
             'file',       
+            'file_variants',
             'uploaded_at',
             'type'        
         ]
@@ -1,15 +1,18 @@
 from django.urls import path
-from coderr.api.views.offers import OffersListView, DetailOfferView, OfferDetailListView, DetailOfferDetailView
+from coderr.api.views.offers import OffersListView, DetailOfferView, OfferDetailListView, DetailOfferDetailView, OfferImportView, OfferFacetsView
 from coderr.api.views.orders import OrderListView ,OrderCountView, OrderCountCompletedView, OrderDetailView
 from coderr.api.views.profiles import ProfileDetailView, ListProfileView, CustomerProfileListView, BusinessProfileListView
-from coderr.api.views.authentication import RegistrationView, CustomLoginView
+from coderr.api.views.authentication import RegistrationView, CustomLoginView, LogoutView, UserProvisionView, UserProvisionJobView
 from coderr.api.views.reviews import ReviewListView, ReviewDetailView
 from coderr.api.views.base_info import BaseInfoView
+from coderr.api.async_views import read_view
 
 urlpatterns = [
     path('profile/', ListProfileView.as_view(), name='profile-list'),
-    path('offers/', OffersListView.as_view(), name='offers-list'),
-    path('offers/<int:pk>/', DetailOfferView.as_view(), name='detail-offer'),
+    path('offers/', read_view(OffersListView), name='offers-list'),
+    path('offers/facets/', OfferFacetsView.as_view(), name='offers-facets'),
+    path('offers/import/', OfferImportView.as_view(), name='offers-import'),
+    path('offers/<int:pk>/', read_view(DetailOfferView), name='detail-offer'),
     path('orders/', OrderListView.as_view(), name='order-list'),
     path('orders/<int:pk>/', OrderDetailView.as_view(), name='order-detail'),
     path('order-count/<int:pk>/', OrderCountView.as_view(), name='order-count'),
@@ -17,11 +20,14 @@ urlpatterns = [
     path('offerdetails/', OfferDetailListView.as_view(), name='offerdetails'),
     path('offerdetails/<int:pk>/', DetailOfferDetailView.as_view(), name='offerdetails-detail'),
     path('profile/<int:pk>/', ProfileDetailView.as_view(), name='profile-detail'),
-    path('profiles/business/', BusinessProfileListView.as_view(), name='profile-business'),
+    path('profiles/business/', read_view(BusinessProfileListView), name='profile-business'),
     path('profiles/customer/', CustomerProfileListView.as_view(), name='profile-customer'),
     path('registration/', RegistrationView.as_view(), name='registration'),
     path('login/', CustomLoginView.as_view(), name='login'),
-    path('reviews/', ReviewListView.as_view(), name='review-list'),
+    path('logout/', LogoutView.as_view(), name='logout'),
+    path('users/provision/', UserProvisionView.as_view(), name='users-provision'),
+    path('users/provision/<int:pk>/', UserProvisionJobView.as_view(), name='users-provision-job'),
+    path('reviews/', read_view(ReviewListView), name='review-list'),
     path('reviews/<int:pk>/', ReviewDetailView.as_view(), name='review-detail'),
-    path('base-info/', BaseInfoView.as_view(), name='base-info'),
+    path('base-info/', read_view(BaseInfoView), name='base-info'),
 ]
@@ -6,19 +6,14 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.authtoken.models import Token
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from coderr import jobs
+from coderr.models import Job
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view
 from django.db.models import Avg, Count
 from rest_framework.pagination import PageNumberPagination
 
-class CustomPagination(PageNumberPagination):
-    """
-    Benutzerdefinierte Paginierungsklasse, die die Anzahl der Objekte pro Seite steuert.
-    """
-    page_size = 6  
-    page_size_query_param = 'page_size' 
-
 class RegistrationView(APIView):
     """
     API-View für die Benutzerregistrierung. Verwendet den RegistrationSerializer, um neue Benutzer zu erstellen.
@@ -53,5 +48,55 @@ class CustomLoginView(APIView):
         if serializer.is_valid():
             return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST) 
-    
\ No newline at end of file
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+class LogoutView(APIView):
+    """
+    API-View für die Abmeldung. Löscht das verwendete Token und entfernt es damit auch aus dem Token-Cache.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Widerruft das Token des angemeldeten Benutzers.
+        """
+        Token.objects.filter(user=request.user).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class UserProvisionView(APIView):
+    """
+    API-View für das Anlegen vieler Benutzer (z. B. beim Onboarding von Geschäftskunden). Nur für Staff.
+    Erwartet CSV (Content-Type text/csv) oder JSON Lines im Request-Body. Das Hashen der Passwörter
+    dauert zu lange für einen Request, daher übernimmt ein Hintergrund-Worker (run_worker) den Upload.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Plant den Upload als Job ein und antwortet mit 202 und der Job-ID.
+        """
+        fmt = 'csv' if request.content_type.startswith('text/csv') else 'jsonl'
+        try:
+            data = request.body.decode('utf-8')
+        except UnicodeDecodeError:
+            return Response({'detail': 'Request body must be UTF-8.'}, status=status.HTTP_400_BAD_REQUEST)
+        # Ein Versuch: Ein abgebrochener Lauf hat einen Teil der Batches bereits geschrieben.
+        job = jobs.enqueue('provision_users', max_attempts=1, data=data, fmt=fmt)
+        return Response(
+            {'job_id': job.pk, 'status': job.status},
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': request.build_absolute_uri(f'{request.path}{job.pk}/')},
+        )
+
+class UserProvisionJobView(APIView):
+    """
+    API-View für den Stand eines Benutzer-Uploads. Nur für Staff.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk, *args, **kwargs):
+        """
+        Gibt Status und, sobald der Job fertig ist, die Zusammenfassung (angelegt, Fehler je Zeile) zurück.
+        """
+        job = get_object_or_404(Job, pk=pk, kind='provision_users')
+        return Response({'job_id': job.pk, 'status': job.status, 'result': job.result})
@@ -11,16 +11,9 @@ from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view
 from django.db.models import Avg, Count
 from rest_framework.pagination import PageNumberPagination
+from coderr.api.replica import ReplicaReadMixin
 
-class CustomPagination(PageNumberPagination):
-    """
-    Benutzerdefinierte Paginierungsklasse zur Steuerung der Anzahl von Objekten, 
-    die pro Seite in der API-Antwort zurückgegeben werden.
-    """
-    page_size = 6  
-    page_size_query_param = 'page_size' 
-
-class BaseInfoView(APIView):
+class BaseInfoView(ReplicaReadMixin, APIView):
     """
     API-Endpunkt, der allgemeine Informationen zur Plattform wie Bewertungen, 
     durchschnittliche Bewertung, Anzahl der Geschäftsnutzer und Angebote bereitstellt.
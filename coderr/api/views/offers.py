@@ -10,66 +10,74 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view
 from django.db.models import Avg, Count
-from rest_framework.pagination import PageNumberPagination
+from coderr.api.pagination import CustomPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter, SearchFilter
-from coderr.api.filters import OffersFilter
-from django.db.models import Min,Max
-from coderr.api.permissions import IsBusinessUser
+from coderr.api.filters import OffersFilter, OffersOrderingFilter, OffersSearchFilter
+from django.db.models import Min, Max, Q
+from django.conf import settings
+from coderr.api.permissions import IsBusinessUser, get_profile_type
+from coderr.cache import offer_list_cache, PUBLIC_SCOPE, user_scope
+from coderr.api.conditional import ConditionalGetMixin
+from coderr.api.replica import ReplicaReadMixin
+from coderr.bulk import OfferImporter
 
 
-class CustomPagination(PageNumberPagination):
-    """
-    Benutzerdefinierte Paginierungsklasse zur Steuerung der Anzahl und Größe von Seiten.
-    """
-    page_size = 6  
-    page_size_query_param = 'page_size'  
-    max_page_size = 100  
-
-class OffersListView(ListAPIView):
+class OffersListView(ReplicaReadMixin, ListAPIView):
     """
     API-View für die Liste der Angebote.
     Ermöglicht Filterung, Suche und Sortierung von Angeboten.
     """
     permission_classes = [IsBusinessUser]
     serializer_class = OffersSerializer
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OffersOrderingFilter, OffersSearchFilter]
     pagination_class = CustomPagination  
     search_fields = ['title', 'description']
-    ordering_fields = ['updated_at', 'min_price', 'max_delivery_time']
+    ordering_fields = ['updated_at', 'min_price', 'min_delivery_time', 'max_delivery_time']
     ordering = ['updated_at']
     filterset_class = OffersFilter 
 
     def get_queryset(self):
         """
-        Gibt das angepasste Queryset mit Annotationen und Filterung basierend auf der Benutzerrolle zurück.
+        Gibt das Queryset der Angebote gefiltert nach der Benutzerrolle zurück.
+        min_price und min_delivery_time sind gespeicherte Spalten und benötigen keine Aggregation.
+        Benutzer und Details werden für die ganze Seite vorab geladen.
         """
-        base_queryset = self.get_annotated_queryset()
-        return self.filter_queryset_by_user(base_queryset)
+        queryset = Offers.objects.select_related('user').prefetch_related('details')
+        return self.filter_queryset_by_user(queryset)
 
-    def get_annotated_queryset(self):
+    def get_cache_scope(self):
         """
-        Fügt Annotationen für den minimalen Preis und die maximale Lieferzeit hinzu.
+        Bestimmt den Cache-Bereich: Geschäftsnutzer sehen nur eigene Angebote und erhalten
+        einen eigenen Bereich, alle anderen teilen sich den öffentlichen Katalog.
         """
-        return Offers.objects.annotate(
-            min_price=Min('details__price'),  # Minimaler Preis aus OfferDetails
-            max_delivery_time=Min('details__delivery_time_in_days')  # Maximale Lieferzeit
-        )
+        if get_profile_type(self.request) == 'business':
+            return user_scope(self.request.user.pk)
+        return PUBLIC_SCOPE
+
+    def list(self, request, *args, **kwargs):
+        """
+        Liefert die Angebotsliste aus dem Cache oder berechnet und speichert sie.
+        """
+        cache_key = offer_list_cache.make_key(request, self.get_cache_scope())
+        data = offer_list_cache.get(cache_key)
+        if data is not None:
+            response = Response(data, status=status.HTTP_200_OK)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            offer_list_cache.set(cache_key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
 
     def filter_queryset_by_user(self, queryset):
         """
         Filtert das Queryset basierend auf der Rolle des authentifizierten Benutzers.
         """
-        user = self.request.user
-        if user.is_authenticated:
-            try:
-                profile = user.profile
-                if profile.type == 'business':
-                    return queryset.filter(user=user)
-                elif profile.type == 'customer':
-                    return queryset
-            except Profile.DoesNotExist:
-                pass
+        if get_profile_type(self.request) == 'business':
+            return queryset.filter(user=self.request.user)
         return queryset
 
     def post(self, request, *args, **kwargs):
@@ -83,31 +91,117 @@ class OffersListView(ListAPIView):
             return Response(response_serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-class DetailOfferView(RetrieveAPIView):
+class OfferFacetsView(OffersListView):
+    """
+    API-View für Preis- und Lieferzeit-Facetten der Angebotsliste.
+    Akzeptiert dieselben Such- und Filterparameter wie OffersListView und zählt
+    die Treffer pro Bereich mit einer einzigen Aggregatabfrage. Nur lesend: post der
+    Angebotsliste wird nicht übernommen.
+    """
+    http_method_names = ['get', 'head', 'options']
+    pagination_class = None
+    facets = {
+        'price': ('min_price', 'OFFER_FACET_PRICE_BUCKETS'),
+        'delivery_time': ('min_delivery_time', 'OFFER_FACET_DELIVERY_TIME_BUCKETS'),
+    }
+
+    def get_queryset(self):
+        """
+        Gibt die Angebote ohne Prefetch zurück, da nur aggregiert wird.
+        """
+        return self.filter_queryset_by_user(Offers.objects.all())
+
+    def list(self, request, *args, **kwargs):
+        """
+        Liefert die Facetten aus dem Cache der Angebotsliste oder berechnet sie.
+        """
+        cache_key = offer_list_cache.make_key(request, self.get_cache_scope(), namespace='facets')
+        data = offer_list_cache.get(cache_key)
+        if data is not None:
+            response = Response(data, status=status.HTTP_200_OK)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        data = self.get_facets(self.filter_queryset(self.get_queryset()))
+        offer_list_cache.set(cache_key, data)
+        response = Response(data, status=status.HTTP_200_OK)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def get_facets(self, queryset):
+        """
+        Berechnet Anzahl, Spannweite und Bereichszählungen aller Facetten in einer Abfrage.
+        Bereiche sind links geschlossen, der letzte Bereich ist nach oben offen.
+        """
+        aggregates = {'count': Count('pk')}
+        ranges = {}
+        for name, (field, setting) in self.facets.items():
+            edges = getattr(settings, setting)
+            ranges[name] = list(zip(edges, [*edges[1:], None]))
+            aggregates[f'{name}_min'] = Min(field)
+            aggregates[f'{name}_max'] = Max(field)
+            for index, (lower, upper) in enumerate(ranges[name]):
+                condition = Q(**{f'{field}__gte': lower})
+                if upper is not None:
+                    condition &= Q(**{f'{field}__lt': upper})
+                aggregates[f'{name}_{index}'] = Count('pk', filter=condition)
+
+        values = queryset.order_by().aggregate(**aggregates)
+        data = {'count': values['count']}
+        for name in self.facets:
+            data[name] = {
+                'min': values[f'{name}_min'],
+                'max': values[f'{name}_max'],
+                'buckets': [
+                    {'min': lower, 'max': upper, 'count': values[f'{name}_{index}']}
+                    for index, (lower, upper) in enumerate(ranges[name])
+                ],
+            }
+        return data
+
+class DetailOfferView(ConditionalGetMixin, RetrieveAPIView):
     """
     API-View für die Detailansicht eines spezifischen Angebots.
     Bietet die Möglichkeit, ein Angebot anzuzeigen, zu aktualisieren oder zu löschen.
     """
     permission_classes = [IsBusinessUser]
-    queryset = Offers.objects.all()
+    queryset = Offers.objects.select_related('user').prefetch_related('details')
     filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
     serializer_class = DetailOfferSerializer
 
     def get(self, request, *args, **kwargs):
         """
         Ruft die Details eines Angebots basierend auf der ID ab.
+        Antwortet mit 304, wenn der Client die aktuelle Version bereits besitzt.
         """
         pk = self.kwargs.get('pk')
+        not_modified = self.not_modified_response(request, pk)
+        if not_modified is not None:
+            return not_modified
         offer = get_object_or_404(self.queryset, pk=pk)
         serializer = self.get_serializer(offer)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.add_validators(Response(serializer.data, status=status.HTTP_200_OK))
+
+    def get_version(self, pk):
+        """
+        Version eines Angebots aus eigenem Zeitstempel, Details und Anbieterdaten.
+        """
+        return Offers.objects.filter(pk=pk).values(
+            'updated_at', 'user__username', 'user__first_name', 'user__last_name'
+        ).annotate(
+            details_updated_at=Max('details__updated_at'),
+            details_count=Count('details'),
+        ).values_list(
+            'updated_at', 'details_updated_at', 'details_count',
+            'user__username', 'user__first_name', 'user__last_name'
+        ).first()
    
     def patch(self, request, *args, **kwargs):
         """
         Aktualisiert ein bestehendes Angebot teilweise, falls der Benutzer berechtigt ist.
         """
         pk = self.kwargs.get('pk')
-        offer = get_object_or_404(Offers, pk=pk)
+        offer = get_object_or_404(self.queryset, pk=pk)
         
         serializer = DetailOfferSerializer(offer, data=request.data, partial=True, context={'request': request})
         if offer.user != request.user:
@@ -138,6 +232,24 @@ class DetailOfferView(RetrieveAPIView):
         offer.delete()
         return Response({"detail": "Offer deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
 
+class OfferImportView(APIView):
+    """
+    API-View für den Massenimport von Angeboten.
+    Erwartet JSON Lines im Request-Body (ein Angebot mit seinen Details pro Zeile)
+    und liest den Body zeilenweise, ohne ihn vollständig in den Speicher zu laden.
+    """
+    permission_classes = [IsAuthenticated, IsBusinessUser]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Importiert die Angebote für den angemeldeten Geschäftsnutzer und meldet fehlerhafte Zeilen.
+        """
+        importer = OfferImporter(request.user)
+        summary = importer.import_lines(request._request)
+        if summary['created'] == 0 and summary['error_count']:
+            return Response(summary, status=status.HTTP_400_BAD_REQUEST)
+        return Response(summary, status=status.HTTP_201_CREATED)
+
 class OfferDetailListView(ListAPIView):
     """
     API-View für die Liste der OfferDetails. Zeigt alle OfferDetail-Objekte an.
@@ -146,7 +258,7 @@ class OfferDetailListView(ListAPIView):
     queryset = OfferDetail.objects.all()
     serializer_class = OfferDetailsSerializer     
 
-class DetailOfferDetailView(RetrieveAPIView):
+class DetailOfferDetailView(ConditionalGetMixin, RetrieveAPIView):
     """
     API-View für die Detailansicht eines spezifischen OfferDetails.
     """
@@ -157,10 +269,14 @@ class DetailOfferDetailView(RetrieveAPIView):
     def get(self, request, *args, **kwargs):
         """
         Ruft die Details eines OfferDetails basierend auf der ID ab.
+        Antwortet mit 304, wenn der Client die aktuelle Version bereits besitzt.
         """
         pk = self.kwargs.get('pk')
+        not_modified = self.not_modified_response(request, pk)
+        if not_modified is not None:
+            return not_modified
         offerDetail = get_object_or_404(self.queryset, pk=pk)
         serializer = self.get_serializer(offerDetail)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.add_validators(Response(serializer.data, status=status.HTTP_200_OK))
 
 
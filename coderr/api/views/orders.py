@@ -10,16 +10,10 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view, permission_classes
 from django.db.models import Avg, Count
-from rest_framework.pagination import PageNumberPagination
+from coderr.api.pagination import CustomPagination
 from django.db.models import Q
 from coderr.api.permissions import OrderPermissions
-
-class CustomPagination(PageNumberPagination):
-    """
-    Benutzerdefinierte Paginierungsklasse, um die Anzahl der Bestellungen pro Seite zu steuern.
-    """
-    page_size = 6  
-    page_size_query_param = 'page_size' 
+from coderr.api.conditional import ConditionalGetMixin
 
 class OrderListView(APIView):
     """
@@ -27,12 +21,22 @@ class OrderListView(APIView):
     Zeigt Bestellungen an, bei denen der Benutzer entweder Kunde oder Geschäftspartner ist.
     """
     permission_classes = [OrderPermissions]
+    pagination_class = CustomPagination
+
     def get(self, request, *args, **kwargs):
         """
         Gibt eine Liste der Bestellungen für den authentifizierten Benutzer zurück.
+        Im Cursor-Modus (?cursor=) wird nach (updated_at, id) seitenweise geblättert.
         """
         user = request.user
         orders = Order.objects.filter(Q(customer_user=user) | Q(business_user=user))
+
+        paginator = self.pagination_class()
+        if paginator.is_cursor_request(request):
+            page = paginator.paginate_queryset(orders.order_by('updated_at'), request, view=self)
+            serializer = OrderSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
         serializer = OrderSerializer(orders, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
@@ -54,7 +58,7 @@ class OrderListView(APIView):
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class OrderDetailView(APIView):
+class OrderDetailView(ConditionalGetMixin, APIView):
     """
     API-View für die Detailansicht einer spezifischen Bestellung.
     Bietet Funktionen zum Anzeigen, Aktualisieren oder Löschen einer Bestellung.
@@ -63,11 +67,18 @@ class OrderDetailView(APIView):
     def get(self, request, *args, **kwargs):
         """
         Ruft die Details einer spezifischen Bestellung basierend auf der ID ab.
+        Antwortet mit 304, wenn der Client die aktuelle Version bereits besitzt.
         """
         pk = self.kwargs.get('pk')
+        not_modified = self.not_modified_response(request, pk)
+        if not_modified is not None:
+            return not_modified
         order = get_object_or_404(Order, pk=pk)
         serializer = OrderSerializer(order)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.add_validators(Response(serializer.data, status=status.HTTP_200_OK))
+
+    def get_version(self, pk):
+        return Order.objects.filter(pk=pk).values_list('updated_at', 'offer_detail__updated_at').first()
 
     def patch(self, request, *args, **kwargs):
         """
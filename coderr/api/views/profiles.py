@@ -11,14 +11,8 @@ from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view
 from django.db.models import Avg, Count
 from rest_framework.pagination import PageNumberPagination
-
-class CustomPagination(PageNumberPagination):
-    """
-    Benutzerdefinierte Paginierungsklasse, um die Anzahl der Profile pro Seite zu steuern.
-    """
-
-    page_size = 6  
-    page_size_query_param = 'page_size' 
+from coderr.api.conditional import ConditionalGetMixin
+from coderr.api.replica import ReplicaReadMixin
 
 class ListProfileView(APIView):
     """
@@ -37,7 +31,7 @@ class ListProfileView(APIView):
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
-class ProfileDetailView(APIView):
+class ProfileDetailView(ConditionalGetMixin, APIView):
     """
     API-View, um ein einzelnes Profil anzuzeigen oder teilweise zu aktualisieren.
     """
@@ -46,11 +40,23 @@ class ProfileDetailView(APIView):
     def get(self, request, pk, *args, **kwargs):
         """
         Gibt die Details eines spezifischen Profils zurück.
+        Antwortet mit 304, wenn der Client die aktuelle Version bereits besitzt.
         """
+        not_modified = self.not_modified_response(request, pk)
+        if not_modified is not None:
+            return not_modified
         profile = get_object_or_404(Profile, pk=pk)
         
         serializer = ProfileSerializer(profile)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.add_validators(Response(serializer.data, status=status.HTTP_200_OK))
+
+    def get_version(self, pk):
+        """
+        Version eines Profils aus Zeitstempel und den mitgelieferten Benutzerdaten.
+        """
+        return Profile.objects.filter(pk=pk).values_list(
+            'updated_at', 'user__username', 'user__first_name', 'user__last_name', 'user__email'
+        ).first()
 
     def patch(self, request, pk, *args, **kwargs):
         """
@@ -70,7 +76,7 @@ class ProfileDetailView(APIView):
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class BusinessProfileListView(ListAPIView):
+class BusinessProfileListView(ReplicaReadMixin, ListAPIView):
     """
     API-View für die Liste aller Geschäftsnutzerprofile.
     """
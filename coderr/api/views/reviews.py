@@ -10,20 +10,15 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view
 from django.db.models import Avg, Count
-from rest_framework.pagination import PageNumberPagination
+from coderr.api.pagination import CustomPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter, SearchFilter
 from coderr.api.filters import ReviewFilter
 from coderr.api.permissions import IsCustomerUser
+from coderr.api.conditional import ConditionalGetMixin
+from coderr.api.replica import ReplicaReadMixin
 
-class CustomPagination(PageNumberPagination):
-    """
-    Benutzerdefinierte Paginierungsklasse, die die Anzahl der Reviews pro Seite steuert.
-    """
-    page_size = 6  
-    page_size_query_param = 'page_size' 
-
-class ReviewListView(ListAPIView):
+class ReviewListView(ReplicaReadMixin, ListAPIView):
     """
     API-View für die Liste von Reviews. Unterstützt Filterung, Sortierung und Paginierung.
     """
@@ -45,11 +40,14 @@ class ReviewListView(ListAPIView):
     def get(self, request, *args, **kwargs):
         """
         Holt eine gefilterte und paginierte Liste von Reviews.
+        Im Cursor-Modus (?cursor=) enthält die Antwort zusätzlich next- und previous-Links.
         """
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
 
         serializer = self.get_serializer(page, many=True)
+        if self.paginator.cursor_mode:
+            return self.get_paginated_response(serializer.data)
         return Response(serializer.data, status=status.HTTP_200_OK)
    
     def post(self, request, *args, **kwargs):
@@ -64,7 +62,7 @@ class ReviewListView(ListAPIView):
     
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
   
-class ReviewDetailView(APIView):
+class ReviewDetailView(ConditionalGetMixin, APIView):
     """
     API-View für die Detailansicht eines spezifischen Reviews.
     Ermöglicht das Anzeigen, Aktualisieren oder Löschen eines Reviews.
@@ -73,11 +71,18 @@ class ReviewDetailView(APIView):
     def get(self, request, *args, **kwargs):
         """
         Gibt die Details eines spezifischen Reviews zurück.
+        Antwortet mit 304, wenn der Client die aktuelle Version bereits besitzt.
         """
         pk = self.kwargs.get('pk')
+        not_modified = self.not_modified_response(request, pk)
+        if not_modified is not None:
+            return not_modified
         review = get_object_or_404(Review, pk=pk)
         serializer = ReviewSerializer(review)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.add_validators(Response(serializer.data, status=status.HTTP_200_OK))
+
+    def get_version(self, pk):
+        return Review.objects.filter(pk=pk).values_list('updated_at').first()
    
     def patch(self, request, *args, **kwargs):
         """
@@ -1,9 +1,30 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+
+
+def ensure_search_index(sender, using, **kwargs):
+    from coderr.search import ensure_sqlite_triggers
+    ensure_sqlite_triggers(using)
 
 
 class CoderrAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'coderr'
 
-    # def ready(self):
-    #     import coderr_app.signals  
\ No newline at end of file
+    def ready(self):
+        # bulk und images (über signals) registrieren ihre Job-Handler.
+        from coderr import bulk, middleware, signals  # noqa: F401
+        post_migrate.connect(ensure_search_index, sender=self)
+        if settings.DB_HEALTH_CHECKS:
+            from coderr_app.database import check_connection_health
+            request_started.connect(check_connection_health, dispatch_uid='coderr-db-health-check')
+        if settings.METRICS_ENABLED:
+            from coderr.metrics import install_query_recorder, instrument_serializers
+            connection_created.connect(install_query_recorder, dispatch_uid='coderr-metrics-queries')
+            instrument_serializers()
+        if settings.SLOW_QUERY_LOG_ENABLED:
+            from coderr.slow_queries import install_slow_query_logger
+            connection_created.connect(install_slow_query_logger, dispatch_uid='coderr-slow-query-log')
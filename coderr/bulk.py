@@ -0,0 +1,404 @@
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models.functions import Lower
+from rest_framework.authtoken.models import Token
+from . import jobs
+from .cache import offer_list_cache
+from .models import Offers, OfferDetail, Profile
+
+OFFER_FIELDS = ('title', 'description')
+DETAIL_FIELDS = ('title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type')
+
+
+def iter_jsonl(lines):
+    """
+    Liest JSON Lines zeilenweise und gibt (Zeilennummer, Objekt, Fehler) zurück.
+    Leere Zeilen werden übersprungen, es liegt immer nur eine Zeile im Speicher.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            try:
+                line = line.decode('utf-8')
+            except UnicodeDecodeError:
+                yield line_number, None, {'non_field_errors': ['Invalid UTF-8.']}
+                continue
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except ValueError as exc:
+            yield line_number, None, {'non_field_errors': [f'Invalid JSON: {exc}']}
+
+
+def iter_csv(lines):
+    """
+    Liest CSV mit Kopfzeile zeilenweise und gibt (Zeilennummer, Objekt, Fehler) zurück.
+    """
+    def decoded():
+        for line in lines:
+            yield line.decode('utf-8', errors='replace') if isinstance(line, bytes) else line
+
+    reader = csv.DictReader(decoded())
+    for row in reader:
+        if None in row:
+            yield reader.line_num, None, {'non_field_errors': ['Too many columns.']}
+            continue
+        yield reader.line_num, {key.strip(): (value or '').strip() for key, value in row.items()}, None
+
+
+def batched(iterable, size):
+    """
+    Teilt ein Iterable in Listen mit höchstens size Elementen auf.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def clean_fields(model, data, names):
+    """
+    Prüft die Werte gegen die Regeln der Modellfelder (Typ, max_length, choices, null/blank)
+    und gibt bereinigte Werte und Fehler zurück. Leere Werte sind wie im Serializer erlaubt,
+    wenn das Feld einen Standardwert hat.
+    """
+    values, errors = {}, {}
+    for name in names:
+        field = model._meta.get_field(name)
+        raw = data.get(name, field.get_default())
+        if field.has_default() and raw in field.empty_values:
+            values[name] = raw
+            continue
+        try:
+            values[name] = field.clean(raw, None)
+        except ValidationError as exc:
+            errors[name] = exc.messages
+    return values, errors
+
+
+class BulkImporter:
+    """
+    Gemeinsame Grundlage für Massenimporte: zählt angelegte Zeilen und sammelt
+    Fehler mit Zeilennummer (höchstens max_errors Einträge).
+    """
+
+    def __init__(self, batch_size, max_errors):
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.created = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line_number, errors):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'line': line_number, 'errors': errors})
+
+    def summary(self):
+        return {
+            'created': self.created,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+
+class OfferImporter(BulkImporter):
+    """
+    Importiert Angebote mit ihren OfferDetails aus einem Strom von JSON-Objekten.
+    Jede Zeile wird einzeln validiert, gültige Zeilen werden in Batches von batch_size
+    Angeboten mit bulk_create in je einer Transaktion geschrieben. Ungültige Zeilen werden
+    übersprungen und mit Zeilennummer gemeldet.
+    """
+
+    def __init__(self, user, batch_size=None, max_errors=None):
+        super().__init__(
+            batch_size or settings.OFFER_IMPORT_BATCH_SIZE,
+            settings.OFFER_IMPORT_MAX_ERRORS if max_errors is None else max_errors,
+        )
+        self.user = user
+
+    def validate(self, row):
+        """
+        Gibt (Angebot, Details, Fehler) für eine Zeile zurück.
+        """
+        if not isinstance(row, dict):
+            return None, None, {'non_field_errors': ['Expected a JSON object.']}
+        offer_values, errors = clean_fields(Offers, row, OFFER_FIELDS)
+        description = offer_values.get('description')
+        if description and len(description) > Offers._meta.get_field('description').max_length:
+            errors['description'] = ['Ensure this field has no more than 500 characters.']
+
+        details_data = row.get('details')
+        if not isinstance(details_data, list) or not details_data:
+            errors['details'] = ['Expected a non-empty list of offer details.']
+            return None, None, errors
+
+        details, detail_errors, offer_types = [], {}, set()
+        for index, detail_data in enumerate(details_data):
+            if not isinstance(detail_data, dict):
+                detail_errors[index] = {'non_field_errors': ['Expected a JSON object.']}
+                continue
+            values, field_errors = clean_fields(OfferDetail, detail_data, DETAIL_FIELDS)
+            if values.get('offer_type') in offer_types:
+                field_errors['offer_type'] = ['Duplicate offer_type.']
+            offer_types.add(values.get('offer_type'))
+            if field_errors:
+                detail_errors[index] = field_errors
+            details.append(values)
+        if detail_errors:
+            errors['details'] = detail_errors
+        if errors:
+            return None, None, errors
+        return offer_values, details, None
+
+    def import_lines(self, lines):
+        """
+        Importiert alle Zeilen und gibt die Zusammenfassung zurück.
+        """
+        for batch in batched(self.iter_valid(iter_jsonl(lines)), self.batch_size):
+            self.write_batch(batch)
+        return self.summary()
+
+    def iter_valid(self, rows):
+        for line_number, row, errors in rows:
+            if errors is None:
+                offer_values, details, errors = self.validate(row)
+            if errors:
+                self.add_error(line_number, errors)
+                continue
+            yield offer_values, details
+
+    def write_batch(self, batch):
+        """
+        Schreibt einen Batch in einer Transaktion: erst die Angebote, dann alle Details.
+        min_price und min_delivery_time werden direkt mitgeschrieben, da bulk_create keine Signale auslöst.
+        """
+        offers = [
+            Offers(
+                user=self.user,
+                min_price=min(detail['price'] for detail in details),
+                min_delivery_time=min(detail['delivery_time_in_days'] for detail in details),
+                **offer_values
+            )
+            for offer_values, details in batch
+        ]
+        using = router.db_for_write(Offers)
+        with transaction.atomic(using=using):
+            self.create_offers(offers, using)
+            OfferDetail.objects.using(using).bulk_create([
+                OfferDetail(offer_id=offer.pk, **detail)
+                for offer, (offer_values, details) in zip(offers, batch)
+                for detail in details
+            ])
+            offer_list_cache.invalidate_on_commit([self.user.pk])
+        self.created += len(offers)
+
+    def create_offers(self, offers, using):
+        """
+        Legt die Angebote an und setzt ihre Primärschlüssel.
+        Backends ohne RETURNING bei bulk_create (SQLite unter Django 3.2) liefern keine IDs.
+        Innerhalb der Transaktion hält SQLite die Schreibsperre, die zuletzt vergebenen
+        IDs gehören daher zu diesem Batch.
+        """
+        Offers.objects.using(using).bulk_create(offers)
+        if connections[using].features.can_return_rows_from_bulk_insert:
+            return
+        pks = Offers.objects.using(using).order_by('-pk').values_list('pk', flat=True)[:len(offers)]
+        for offer, pk in zip(offers, reversed(list(pks))):
+            offer.pk = pk
+
+
+def hash_password(password):
+    return make_password(password)
+
+
+class UserProvisioner(BulkImporter):
+    """
+    Legt Benutzer mit Profil und Token aus einem Strom von Zeilen (CSV oder JSON Lines) an.
+    Pro Batch werden Dubletten verworfen, die Passwörter parallel in einem Prozesspool gehasht
+    (workers=0: im aktuellen Prozess), vergebene Benutzernamen und E-Mails
+    mit je einer Abfrage erkannt und Benutzer, Profile und Tokens mit je einem bulk_create in
+    einer Transaktion geschrieben. Dubletten über Batches hinweg erkennt exclude_existing bzw.
+    der eindeutige Index der Datenbank.
+    """
+    username_validator = UnicodeUsernameValidator()
+
+    def __init__(self, batch_size=None, workers=None, max_errors=None):
+        super().__init__(
+            batch_size or settings.USER_PROVISION_BATCH_SIZE,
+            settings.USER_PROVISION_MAX_ERRORS if max_errors is None else max_errors,
+        )
+        self.workers = settings.USER_PROVISION_HASH_WORKERS if workers is None else workers
+
+    def provision_lines(self, lines, fmt='jsonl'):
+        """
+        Legt die Benutzer aus allen Zeilen (fmt 'csv' oder 'jsonl') an und gibt die Zusammenfassung zurück.
+        """
+        rows = iter_csv(lines) if fmt == 'csv' else iter_jsonl(lines)
+        executor = ProcessPoolExecutor(self.workers) if self.workers else None
+        try:
+            for batch in batched(self.iter_valid(rows), self.batch_size):
+                self.write_batch(batch, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return self.summary()
+
+    def validate(self, row):
+        """
+        Gibt die bereinigten Werte einer Zeile oder die Fehler zurück.
+        """
+        if not isinstance(row, dict):
+            return None, {'non_field_errors': ['Expected an object.']}
+        values = {name: str(row.get(name) or '').strip() for name in (
+            'username', 'email', 'password', 'type', 'first_name', 'last_name'
+        )}
+        values['email'] = User.objects.normalize_email(values['email'])
+        errors = {}
+        for name in ('username', 'email', 'password', 'type'):
+            if not values[name]:
+                errors[name] = ['This field is required.']
+        if values['username']:
+            try:
+                self.username_validator(values['username'])
+            except ValidationError as exc:
+                errors['username'] = exc.messages
+            if len(values['username']) > 150:
+                errors['username'] = ['Ensure this field has no more than 150 characters.']
+        if values['email']:
+            try:
+                validate_email(values['email'])
+            except ValidationError as exc:
+                errors['email'] = exc.messages
+        if values['type'] and values['type'] not in dict(Profile.TYPE_CHOICES):
+            errors['type'] = [f'"{values["type"]}" is not a valid choice.']
+        return (None, errors) if errors else (values, None)
+
+    def iter_valid(self, rows):
+        for line_number, row, errors in rows:
+            values = None
+            if errors is None:
+                values, errors = self.validate(row)
+            if errors:
+                self.add_error(line_number, errors)
+                continue
+            yield line_number, values
+
+    def exclude_duplicates(self, batch):
+        """
+        Entfernt Zeilen, deren Benutzername oder E-Mail schon weiter oben im Batch vorkommt.
+        """
+        seen_usernames, seen_emails = set(), set()
+        remaining = []
+        for line_number, values in batch:
+            if values['username'] in seen_usernames:
+                self.add_error(line_number, {'username': ['Duplicate username in upload.']})
+            elif values['email'].lower() in seen_emails:
+                self.add_error(line_number, {'email': ['Duplicate email in upload.']})
+            else:
+                seen_usernames.add(values['username'])
+                seen_emails.add(values['email'].lower())
+                remaining.append((line_number, values))
+        return remaining
+
+    def write_batch(self, batch, executor):
+        batch = self.exclude_existing(self.exclude_duplicates(batch))
+        if not batch:
+            return
+        passwords = [values['password'] for _, values in batch]
+        if executor is not None:
+            hashes = list(executor.map(hash_password, passwords, chunksize=max(1, len(passwords) // (self.workers * 4))))
+        else:
+            hashes = [hash_password(password) for password in passwords]
+
+        users = [
+            User(
+                username=values['username'], email=values['email'], password=password_hash,
+                first_name=values['first_name'], last_name=values['last_name'],
+            )
+            for (_, values), password_hash in zip(batch, hashes)
+        ]
+        try:
+            with transaction.atomic():
+                self.create_rows(batch, users)
+        except IntegrityError:
+            # Gleichzeitig angelegte Konten: den Batch zeilenweise wiederholen, um sie zuzuordnen.
+            for row, user in zip(batch, users):
+                try:
+                    with transaction.atomic():
+                        self.create_rows([row], [user])
+                except IntegrityError:
+                    self.add_error(row[0], self.conflict_errors(row[1]))
+                else:
+                    self.created += 1
+            return
+        self.created += len(users)
+
+    def create_rows(self, batch, users):
+        """
+        Schreibt Benutzer, Profile und Tokens. IDs der Benutzer werden bei Backends ohne
+        RETURNING (SQLite unter Django 3.2) über die eindeutigen Benutzernamen nachgeladen.
+        """
+        for user in users:
+            user.pk = None
+        User.objects.bulk_create(users)
+        if users[0].pk is None:
+            ids = dict(User.objects.filter(
+                username__in=[user.username for user in users]
+            ).values_list('username', 'pk'))
+            for user in users:
+                user.pk = ids[user.username]
+        Profile.objects.bulk_create([
+            Profile(user_id=user.pk, type=values['type']) for user, (_, values) in zip(users, batch)
+        ])
+        Token.objects.bulk_create([Token(key=Token.generate_key(), user_id=user.pk) for user in users])
+
+    def conflict_errors(self, values):
+        """
+        Fehler für eine Zeile, die beim Schreiben mit einem bestehenden Konto kollidiert ist.
+        """
+        if User.objects.filter(username=values['username']).exists():
+            return {'username': ['A user with this username already exists.']}
+        return {'email': ['A user with this email already exists.']}
+
+    def exclude_existing(self, batch):
+        """
+        Entfernt Zeilen, deren Benutzername oder E-Mail schon vergeben ist, mit je einer Abfrage.
+        """
+        usernames = set(User.objects.filter(
+            username__in=[values['username'] for _, values in batch]
+        ).values_list('username', flat=True))
+        # LOWER(email) entspricht dem eindeutigen Index aus Migration 0008.
+        emails = set(User.objects.annotate(email_lower=Lower('email')).filter(
+            email_lower__in=[values['email'].lower() for _, values in batch]
+        ).values_list('email_lower', flat=True))
+        remaining = []
+        for line_number, values in batch:
+            if values['username'] in usernames:
+                self.add_error(line_number, {'username': ['A user with this username already exists.']})
+            elif values['email'].lower() in emails:
+                self.add_error(line_number, {'email': ['A user with this email already exists.']})
+            else:
+                remaining.append((line_number, values))
+        return remaining
+
+
+@jobs.register('provision_users', sensitive=True)
+def provision_users(data, fmt='jsonl'):
+    """
+    Job-Handler für POST /api/users/provision/: legt die Benutzer aus dem hochgeladenen Text an
+    (Passwörter im Prozesspool, siehe USER_PROVISION_HASH_WORKERS) und gibt die Zusammenfassung zurück.
+    """
+    return UserProvisioner().provision_lines(data.splitlines(keepends=True), fmt)
@@ -0,0 +1,105 @@
+import hashlib
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+PUBLIC_SCOPE = 'public'
+
+
+class ResponseCache:
+    """
+    Cache für serialisierte Antworten, der über die normalisierten Query-Parameter adressiert wird.
+    Größe (MAX_ENTRIES) und Lebensdauer (TIMEOUT) kommen aus dem Eintrag in CACHES.
+    Invalidiert wird über Generationen pro Scope: Ein Schreibzugriff setzt eine neue Generation
+    und macht damit alle älteren Einträge des Scopes unerreichbar. Generationen und Einträge
+    liegen im selben Cache; ist er von allen Prozessen geteilt (Dateisystem, Memcached), erreicht
+    eine Invalidierung alle Gunicorn-Worker und run_worker, ohne dass ein Treffer die Datenbank fragt.
+    Invalidiert wird aus den post_save/post_delete-Signalen (coderr.signals). QuerySet.update(),
+    bulk_create() und bulk_update() lösen keine Signale aus; wer Angebote oder Details so
+    schreibt, muss invalidate_on_commit selbst aufrufen (wie coderr.bulk und coderr.images).
+    """
+
+    def __init__(self, alias, prefix):
+        self.alias = alias
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def generation_key(self, scope):
+        return f'{self.prefix}:generation:{scope}'
+
+    def get_generation(self, scope):
+        """
+        Liest die aktuelle Generation eines Scopes. Fehlt sie (z. B. nach einem Neustart oder
+        Verdrängung), wird ein zeitbasierter Startwert gesetzt, damit alte Einträge nicht wieder gültig werden.
+        """
+        key = self.generation_key(scope)
+        generation = self.cache.get(key)
+        if generation is None:
+            self.cache.add(key, time.time_ns(), timeout=None)
+            generation = self.cache.get(key)
+        return generation
+
+    def make_key(self, request, scope, namespace='list'):
+        """
+        Erzeugt den Cache-Schlüssel aus Schema, Host, Pfad und sortierten Query-Parametern;
+        Schema und Host gehören dazu, weil die Antworten absolute URLs enthalten.
+        """
+        params = sorted(
+            (name, sorted(values)) for name, values in request.query_params.lists()
+        )
+        raw = repr((request.scheme, request.get_host(), request.path, params))
+        digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        return f'{self.prefix}:{namespace}:{scope}:{self.get_generation(scope)}:{digest}'
+
+    def get(self, key):
+        data = self.cache.get(key)
+        with self._lock:
+            self._stats['hits' if data is not None else 'misses'] += 1
+        return data
+
+    def set(self, key, data):
+        self.cache.set(key, data)
+
+    def invalidate(self, user_ids=()):
+        """
+        Verwirft den öffentlichen Scope und die Scopes der betroffenen Benutzer. Die neue
+        Generation ist ein Zeitstempel statt incr(), das nicht jedes Backend atomar umsetzt.
+        """
+        generation = time.time_ns()
+        self.cache.set_many({
+            self.generation_key(scope): generation
+            for scope in (PUBLIC_SCOPE, *(user_scope(user_id) for user_id in set(user_ids) if user_id))
+        }, timeout=None)
+        with self._lock:
+            self._stats['invalidations'] += 1
+
+    def invalidate_on_commit(self, user_ids=()):
+        """
+        Invalidiert erst nach dem Commit der laufenden Transaktion (außerhalb einer Transaktion
+        sofort); bei einem Rollback entfällt die Invalidierung.
+        """
+        user_ids = list(user_ids)
+        transaction.on_commit(lambda: self.invalidate(user_ids))
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+
+def user_scope(user_id):
+    return f'user:{user_id}'
+
+
+offer_list_cache = ResponseCache(getattr(settings, 'OFFER_LIST_CACHE_ALIAS', 'offers'), 'offers')
@@ -0,0 +1,186 @@
+import hashlib
+import logging
+import posixpath
+from io import BytesIO
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+from . import jobs
+from .cache import offer_list_cache
+from .models import Offers, Profile
+
+logger = logging.getLogger(__name__)
+
+# Ausnahmen, bei denen die Datei fehlt, kein lesbares Bild ist oder mehr als doppelt so viele
+# Pixel wie Image.MAX_IMAGE_PIXELS hat (Dekompressionsbombe).
+IMAGE_ERRORS = (OSError, UnidentifiedImageError, Image.DecompressionBombError)
+
+FORMATS = {
+    'webp': {'format': 'WEBP', 'mode': 'RGBA', 'options': {'quality': 80, 'method': 4}},
+    'jpeg': {'format': 'JPEG', 'mode': 'RGB', 'options': {'quality': 82, 'optimize': True, 'progressive': True}},
+}
+
+
+def render_variant(image, size, fmt):
+    """
+    Verkleinert ein Bild auf höchstens size (Seitenverhältnis bleibt erhalten) und kodiert es
+    ohne EXIF-, ICC- oder sonstige Metadaten im angegebenen Format.
+    """
+    spec = FORMATS[fmt]
+    variant = image.copy()
+    variant.thumbnail(size, Image.LANCZOS)
+    if spec['mode'] == 'RGB' and variant.mode != 'RGB':
+        background = Image.new('RGB', variant.size, (255, 255, 255))
+        background.paste(variant.convert('RGBA'), mask=variant.convert('RGBA').getchannel('A'))
+        variant = background
+    elif variant.mode not in ('RGB', 'RGBA'):
+        variant = variant.convert(spec['mode'])
+    variant.info = {}
+    buffer = BytesIO()
+    variant.save(buffer, spec['format'], **spec['options'])
+    return buffer.getvalue(), variant.size
+
+
+def generate_variants(field_file):
+    """
+    Erzeugt für eine hochgeladene Bilddatei alle Varianten aus IMAGE_VARIANT_SIZES in allen
+    Formaten aus IMAGE_VARIANT_FORMATS und legt sie mit inhaltsbasiertem Dateinamen ab.
+    Gibt die Speicherpfade je Variante mit status 'ready' zurück. Fehlt die Datei oder ist sie
+    kein lesbares Bild, wird eine der IMAGE_ERRORS ausgelöst.
+    """
+    if not field_file:
+        return {}
+    storage = field_file.storage
+    directory = posixpath.join(posixpath.dirname(field_file.name), 'variants')
+    with storage.open(field_file.name, 'rb') as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    variants = {'source': field_file.name, 'status': 'ready'}
+    for name, size in settings.IMAGE_VARIANT_SIZES.items():
+        entry = {}
+        for fmt in settings.IMAGE_VARIANT_FORMATS:
+            content, (width, height) = render_variant(image, tuple(size), fmt)
+            digest = hashlib.sha256(content).hexdigest()[:20]
+            path = posixpath.join(directory, f'{digest}.{fmt}')
+            if not storage.exists(path):
+                path = storage.save(path, ContentFile(content))
+            entry[fmt] = path
+            entry.update(width=width, height=height)
+        variants[name] = entry
+    return variants
+
+
+def generate_or_fail(field_file):
+    """
+    Wie generate_variants, liefert bei fehlender oder unlesbarer Datei aber status 'failed',
+    sodass weiter das Original ausgeliefert wird.
+    """
+    try:
+        return generate_variants(field_file)
+    except IMAGE_ERRORS as exc:
+        logger.warning('Bildvarianten für %s nicht erzeugt: %s', field_file.name, exc)
+        return {'source': field_file.name, 'status': 'failed'}
+
+
+def store_variants(model, pk, variants_field, variants, **filters):
+    """
+    Speichert die Varianten und setzt updated_at, damit ETag und Last-Modified der
+    Detail-Endpunkte die Änderung anzeigen. Gibt die Anzahl geänderter Zeilen zurück.
+    """
+    return model.objects.filter(pk=pk, **filters).update(
+        **{variants_field: variants}, updated_at=timezone.now()
+    )
+
+
+def variants_outdated(field_file, variants):
+    """
+    Prüft, ob die gespeicherten Varianten nicht mehr zur aktuellen Datei passen.
+    """
+    current = field_file.name if field_file else None
+    return (variants or {}).get('source') != current
+
+
+def schedule_variants(instance, target):
+    """
+    Plant die Erzeugung der Varianten für ein gespeichertes Objekt ein.
+    Mit IMAGE_VARIANTS_ASYNC übernimmt ein Worker (manage.py run_worker) die Arbeit und
+    bis dahin wird das Original ausgeliefert, sonst wird direkt im Request gerechnet.
+    """
+    model, image_field, variants_field = TARGETS[target]
+    field_file = getattr(instance, image_field)
+    if not field_file:
+        variants = {}
+    elif settings.IMAGE_VARIANTS_ASYNC:
+        variants = {'source': field_file.name, 'status': 'pending'}
+        jobs.enqueue('image_variants', target=target, pk=instance.pk, source=field_file.name)
+    else:
+        variants = generate_or_fail(field_file)
+    setattr(instance, variants_field, variants)
+    model.objects.filter(pk=instance.pk).update(**{variants_field: variants})
+
+
+def mark_variants_failed(target, pk, source):
+    """
+    Fehlerbehandlung des Jobs: nach dem letzten Versuch wird status 'failed' gespeichert,
+    sofern das Bild seit dem Einplanen nicht ersetzt wurde.
+    """
+    model, image_field, variants_field = TARGETS[target]
+    failed = {'source': source, 'status': 'failed'}
+    if store_variants(model, pk, variants_field, failed, **{image_field: source}) and model is Offers:
+        offer_list_cache.invalidate_on_commit(model.objects.filter(pk=pk).values_list('user_id', flat=True))
+
+
+@jobs.register('image_variants', on_failure=mark_variants_failed)
+def build_variants(target, pk, source):
+    """
+    Job-Handler: erzeugt die Varianten, sofern das Bild seit dem Einplanen nicht ersetzt wurde.
+    Fehlt die Datei oder ist sie nicht lesbar, schlägt der Job fehl und wird erneut versucht.
+    """
+    model, image_field, variants_field = TARGETS[target]
+    instance = model.objects.filter(pk=pk, **{image_field: source}).first()
+    if instance is None:
+        return
+    variants = generate_variants(getattr(instance, image_field))
+    updated = store_variants(model, pk, variants_field, variants, **{image_field: source})
+    if updated and model is Offers:
+        offer_list_cache.invalidate_on_commit([instance.user_id])
+
+
+def variant_urls(field_file, variants, request=None):
+    """
+    Wandelt die gespeicherten Pfade der Varianten in URLs um. Solange die Varianten nicht
+    bereit sind, zeigen alle Größen und Formate auf das Originalbild.
+    """
+    if not field_file or not variants:
+        return {}
+    status = variants.get('status', 'ready')
+    urls = {'status': status}
+    if status != 'ready':
+        original = _absolute(field_file.url, request)
+        for name in settings.IMAGE_VARIANT_SIZES:
+            urls[name] = {fmt: original for fmt in settings.IMAGE_VARIANT_FORMATS}
+            urls[name].update(width=None, height=None)
+        return urls
+
+    storage = field_file.storage
+    for name, entry in variants.items():
+        if name in ('source', 'status'):
+            continue
+        urls[name] = {
+            key: value if key in ('width', 'height') else _absolute(storage.url(value), request)
+            for key, value in entry.items()
+        }
+    return urls
+
+
+def _absolute(url, request):
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+TARGETS = {
+    'offers': (Offers, 'image', 'image_variants'),
+    'profiles': (Profile, 'file', 'file_variants'),
+}
@@ -0,0 +1,169 @@
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+FAILURE_HANDLERS = {}
+# Arten, deren Payload nach Abschluss geleert wird (z. B. Klartext-Passwörter).
+SENSITIVE_KINDS = set()
+
+
+def register(kind, on_failure=None, sensitive=False):
+    """
+    Registriert eine Funktion als Handler für Jobs der angegebenen Art.
+    Der Handler erhält den Payload des Jobs als Keyword-Argumente, sein Rückgabewert wird als
+    result gespeichert; on_failure wird mit demselben Payload aufgerufen, wenn der Job endgültig
+    fehlgeschlagen ist. Bei sensitive=True wird der Payload geleert, sobald der Job done oder failed ist.
+    """
+    def decorator(func):
+        HANDLERS[kind] = func
+        if on_failure is not None:
+            FAILURE_HANDLERS[kind] = on_failure
+        if sensitive:
+            SENSITIVE_KINDS.add(kind)
+        return func
+    return decorator
+
+
+def enqueue(kind, max_attempts=None, **payload):
+    """
+    Legt einen Job an. Innerhalb einer Transaktion wird er erst mit deren Commit für Worker sichtbar.
+    """
+    return Job.objects.create(
+        kind=kind,
+        payload=payload,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim(worker=None, candidates=10):
+    """
+    Reserviert den nächsten fälligen Job für diesen Worker und gibt ihn zurück.
+    Die Reservierung ist ein bedingtes UPDATE auf status='pending'; greifen mehrere
+    Worker nach demselben Job, gewinnt genau einer.
+    """
+    worker = worker or worker_name()
+    now = timezone.now()
+    job_ids = Job.objects.filter(status='pending', run_after__lte=now).order_by(
+        'run_after', 'id'
+    ).values_list('id', flat=True)[:candidates]
+    for job_id in job_ids:
+        claimed = Job.objects.filter(pk=job_id, status='pending').update(
+            status='running', locked_by=worker, locked_at=now,
+            attempts=F('attempts') + 1, updated_at=now,
+        )
+        if claimed:
+            return Job.objects.get(pk=job_id)
+    return None
+
+
+def retry_at(job):
+    """
+    Zeitpunkt des nächsten Versuchs: JOB_RETRY_BACKOFF Sekunden, verdoppelt mit jedem Versuch.
+    """
+    return timezone.now() + timedelta(seconds=settings.JOB_RETRY_BACKOFF * 2 ** (job.attempts - 1))
+
+
+def handle_failure(job):
+    """
+    Ruft die Fehlerbehandlung eines endgültig fehlgeschlagenen Jobs auf.
+    """
+    on_failure = FAILURE_HANDLERS.get(job.kind)
+    if on_failure is not None:
+        try:
+            on_failure(**job.payload)
+        except Exception:
+            logger.exception('Fehlerbehandlung für Job %s fehlgeschlagen.', job)
+
+
+def run_job(job):
+    """
+    Führt einen reservierten Job aus. Schlägt er fehl, wird er mit exponentiell wachsender
+    Wartezeit erneut eingeplant, bis max_attempts erreicht ist.
+    """
+    handler = HANDLERS.get(job.kind)
+    try:
+        if handler is None:
+            raise LookupError(f'No handler registered for job kind {job.kind!r}.')
+        result = handler(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts or handler is None:
+            job.status = 'failed'
+            logger.error('Job %s endgültig fehlgeschlagen.', job, exc_info=True)
+            handle_failure(job)
+        else:
+            job.status = 'pending'
+            job.run_after = retry_at(job)
+            logger.warning('Job %s fehlgeschlagen, neuer Versuch ab %s.', job, job.run_after)
+    else:
+        job.status = 'done'
+        job.last_error = ''
+        job.result = result
+    if job.status in ('done', 'failed') and job.kind in SENSITIVE_KINDS:
+        job.payload = {}
+    job.locked_by = ''
+    job.locked_at = None
+    job.save(update_fields=[
+        'status', 'run_after', 'last_error', 'result', 'payload', 'locked_by', 'locked_at', 'updated_at',
+    ])
+    return job
+
+
+def requeue_stale(timeout=None):
+    """
+    Gibt Jobs frei, deren Worker abgestürzt ist (running länger als timeout Sekunden), und
+    plant sie wie einen fehlgeschlagenen Versuch mit Wartezeit neu ein. Hat ein Job max_attempts
+    erreicht (z. B. weil er den Worker jedes Mal zum Absturz bringt), wird er als failed markiert.
+    Gibt die Anzahl der wieder eingeplanten Jobs zurück.
+    """
+    timeout = settings.JOB_STALE_TIMEOUT if timeout is None else timeout
+    stale = Job.objects.filter(status='running', locked_at__lt=timezone.now() - timedelta(seconds=timeout))
+    requeued = 0
+    for job in stale:
+        job.last_error = f'Worker {job.locked_by} hat sich seit {job.locked_at.isoformat()} nicht zurückgemeldet.'
+        failed = job.attempts >= job.max_attempts
+        values = {'status': 'failed'} if failed else {'status': 'pending', 'run_after': retry_at(job)}
+        if failed and job.kind in SENSITIVE_KINDS:
+            values['payload'] = {}
+        # Bedingt, falls der Worker doch noch fertig geworden ist.
+        updated = Job.objects.filter(pk=job.pk, status='running', locked_at=job.locked_at).update(
+            locked_by='', locked_at=None, last_error=job.last_error, updated_at=timezone.now(), **values
+        )
+        if not updated:
+            continue
+        if failed:
+            logger.error('Job %s endgültig fehlgeschlagen: %s', job, job.last_error)
+            handle_failure(job)
+        else:
+            requeued += 1
+    if requeued:
+        logger.warning('%s hängende Jobs wieder freigegeben.', requeued)
+    return requeued
+
+
+def run_pending(worker=None, limit=None):
+    """
+    Arbeitet fällige Jobs ab, bis keiner mehr übrig ist oder limit erreicht ist.
+    Gibt die Anzahl der bearbeiteten Jobs zurück.
+    """
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim(worker)
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
@@ -0,0 +1,85 @@
+import glob
+import gzip
+import json
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Wertet das Slow-Query-Log aus: Abfragen je Fingerprint, sortiert nach Gesamtdauer.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'files', nargs='*',
+            help='Log-Dateien (Standard: SLOW_QUERY_LOG_FILE samt rotierten Dateien, auch .gz).'
+        )
+        parser.add_argument('--route', default=None, help='Nur Einträge dieser Route, z. B. api/offers/.')
+        parser.add_argument('--event', choices=['slow_query', 'repeated_query'], default=None)
+        parser.add_argument('--top', type=int, default=20, help='Anzahl der ausgegebenen Fingerprints.')
+        parser.add_argument('--json', action='store_true', help='Ergebnis als JSON ausgeben.')
+
+    def handle(self, *args, **options):
+        files = options['files'] or sorted(glob.glob(f'{glob.escape(settings.SLOW_QUERY_LOG_FILE)}*'))
+        if not files:
+            raise CommandError(f'Keine Log-Dateien unter {settings.SLOW_QUERY_LOG_FILE} gefunden.')
+
+        groups = {}
+        for entry in self.read_entries(files):
+            if options['route'] and entry.get('route') != options['route']:
+                continue
+            if options['event'] and entry.get('event') != options['event']:
+                continue
+            group = groups.setdefault((entry['event'], entry['fingerprint']), {
+                'event': entry['event'],
+                'fingerprint': entry['fingerprint'],
+                'sql': entry['sql'],
+                'entries': 0,
+                'executions': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'routes': {},
+                'call_sites': {},
+            })
+            group['entries'] += 1
+            group['executions'] += entry.get('count', 1)
+            group['total_ms'] += entry['duration_ms']
+            group['max_ms'] = max(group['max_ms'], entry['duration_ms'])
+            for key, value in (('routes', f"{entry.get('route')} ({entry.get('view')})"),
+                               ('call_sites', entry.get('call_site'))):
+                group[key][value] = group[key].get(value, 0) + 1
+
+        summary = sorted(groups.values(), key=lambda group: group['total_ms'], reverse=True)[:options['top']]
+        if options['json']:
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+        if not summary:
+            self.stdout.write('Keine passenden Einträge.')
+            return
+        for group in summary:
+            label = 'N+1' if group['event'] == 'repeated_query' else 'SLOW'
+            self.stdout.write(self.style.WARNING(
+                f"[{label}] {group['fingerprint']}  {group['entries']} Einträge, "
+                f"{group['executions']} Ausführungen, gesamt {group['total_ms']:.1f} ms, "
+                f"max {group['max_ms']:.1f} ms"
+            ))
+            self.stdout.write(f"  {group['sql'][:300]}")
+            for key, title in (('routes', 'Route'), ('call_sites', 'Aufruf')):
+                for value, count in sorted(group[key].items(), key=lambda item: -item[1])[:3]:
+                    self.stdout.write(f'  {title}: {value} ({count}x)')
+
+    def read_entries(self, files):
+        for path in files:
+            try:
+                # logrotate komprimiert ältere Dateien (compress).
+                opener = gzip.open if path.endswith('.gz') else open
+                with opener(path, 'rt', encoding='utf-8') as stream:
+                    for number, line in enumerate(stream, start=1):
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            self.stderr.write(f'{path}:{number}: keine gültige JSON-Zeile, übersprungen.')
+                            continue
+                        if 'fingerprint' in entry:
+                            yield entry
+            except (OSError, EOFError) as exc:
+                raise CommandError(exc)
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from coderr.cache import offer_list_cache
+from coderr.images import TARGETS, generate_or_fail, store_variants, variants_outdated
+from coderr.models import Offers
+
+
+class Command(BaseCommand):
+    help = 'Erzeugt fehlende Bildvarianten für vorhandene Angebots- und Profilbilder.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=sorted(TARGETS), action='append', help='Nur diese Modelle bearbeiten.')
+        parser.add_argument('--force', action='store_true', help='Varianten auch für aktuelle Einträge neu erzeugen.')
+
+    def handle(self, *args, **options):
+        for name in options['model'] or sorted(TARGETS):
+            model, image_field, variants_field = TARGETS[name]
+            generated, user_ids = 0, set()
+            queryset = model.objects.exclude(**{image_field: ''}).exclude(**{f'{image_field}__isnull': True})
+            for instance in queryset.only('pk', 'user_id', image_field, variants_field).iterator():
+                image, variants = getattr(instance, image_field), getattr(instance, variants_field)
+                ready = (variants or {}).get('status', 'ready') == 'ready'
+                if not options['force'] and ready and not variants_outdated(image, variants):
+                    continue
+                store_variants(model, instance.pk, variants_field, generate_or_fail(image))
+                generated += 1
+                user_ids.add(instance.user_id)
+            if model is Offers and generated:
+                offer_list_cache.invalidate(user_ids)
+            self.stdout.write(self.style.SUCCESS(f'{name}: {generated} Bilder verarbeitet.'))
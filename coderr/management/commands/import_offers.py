@@ -0,0 +1,47 @@
+import sys
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from coderr.bulk import OfferImporter
+
+
+class Command(BaseCommand):
+    help = 'Importiert Angebote mit ihren Details aus einer JSON-Lines-Datei (ein Angebot pro Zeile).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', nargs='?', default='-', help="Pfad zur .jsonl-Datei oder '-' für stdin.")
+        parser.add_argument('--user', required=True, help='Benutzername oder ID des Geschäftsnutzers.')
+        parser.add_argument('--batch-size', type=int, default=None, help='Angebote pro Transaktion.')
+
+    def handle(self, *args, **options):
+        user = self.get_user(options['user'])
+        importer = OfferImporter(user, batch_size=options['batch_size'])
+        if options['file'] == '-':
+            summary = importer.import_lines(sys.stdin.buffer)
+        else:
+            try:
+                with open(options['file'], 'rb') as stream:
+                    summary = importer.import_lines(stream)
+            except OSError as exc:
+                raise CommandError(exc)
+
+        for error in summary['errors']:
+            self.stderr.write(f"Zeile {error['line']}: {error['errors']}")
+        if summary['error_count'] > len(summary['errors']):
+            self.stderr.write(f"... {summary['error_count'] - len(summary['errors'])} weitere Fehler")
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['created']} Angebote importiert, {summary['error_count']} Zeilen übersprungen."
+        ))
+
+    def get_user(self, value):
+        """
+        Gibt den Geschäftsnutzer zu Benutzername oder ID zurück.
+        """
+        lookup = {'pk': int(value)} if value.isdigit() else {'username': value}
+        try:
+            user = User.objects.select_related('profile').get(**lookup)
+        except User.DoesNotExist:
+            raise CommandError(f"Benutzer '{value}' existiert nicht.")
+        profile = getattr(user, 'profile', None)
+        if profile is None or profile.type != 'business':
+            raise CommandError(f"Benutzer '{value}' ist kein Geschäftsnutzer.")
+        return user
@@ -0,0 +1,39 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from coderr.bulk import UserProvisioner
+
+
+class Command(BaseCommand):
+    help = 'Legt Benutzer mit Profil und Token aus einer CSV- oder JSON-Lines-Datei an.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', nargs='?', default='-', help="Pfad zur .csv/.jsonl-Datei oder '-' für stdin.")
+        parser.add_argument(
+            '--format', choices=['csv', 'jsonl'], default=None,
+            help='Dateiformat (Standard: aus der Dateiendung, bei stdin jsonl).'
+        )
+        parser.add_argument('--batch-size', type=int, default=None, help='Benutzer pro Transaktion.')
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Prozesse zum Hashen der Passwörter (Standard: USER_PROVISION_HASH_WORKERS, 0 = kein Pool).'
+        )
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or ('csv' if options['file'].lower().endswith('.csv') else 'jsonl')
+        provisioner = UserProvisioner(batch_size=options['batch_size'], workers=options['workers'])
+        if options['file'] == '-':
+            summary = provisioner.provision_lines(sys.stdin.buffer, fmt)
+        else:
+            try:
+                with open(options['file'], 'rb') as stream:
+                    summary = provisioner.provision_lines(stream, fmt)
+            except OSError as exc:
+                raise CommandError(exc)
+
+        for error in summary['errors']:
+            self.stderr.write(f"Zeile {error['line']}: {error['errors']}")
+        if summary['error_count'] > len(summary['errors']):
+            self.stderr.write(f"... {summary['error_count'] - len(summary['errors'])} weitere Fehler")
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['created']} Benutzer angelegt, {summary['error_count']} Zeilen übersprungen."
+        ))
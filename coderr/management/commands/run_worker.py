@@ -0,0 +1,76 @@
+import multiprocessing
+import signal
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from coderr import jobs
+
+
+def work(poll_interval, once):
+    """
+    Arbeitsschleife eines Worker-Prozesses: holt fällige Jobs, bis keiner mehr übrig ist
+    (once) bzw. wartet poll_interval Sekunden auf neue Jobs. Alle JOB_REQUEUE_INTERVAL Sekunden
+    werden Jobs abgestürzter Worker wieder freigegeben.
+    """
+    worker = jobs.worker_name()
+    processed = 0
+    next_requeue = 0.0
+    while True:
+        close_old_connections()
+        if time.monotonic() >= next_requeue:
+            jobs.requeue_stale()
+            next_requeue = time.monotonic() + settings.JOB_REQUEUE_INTERVAL
+        count = jobs.run_pending(worker)
+        processed += count
+        if once:
+            return processed
+        if not count:
+            time.sleep(poll_interval)
+
+
+def _child(poll_interval, once):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    work(poll_interval, once)
+
+
+class Command(BaseCommand):
+    help = 'Startet Hintergrund-Worker für die Job-Queue (z. B. Bildvarianten).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=None,
+            help='Anzahl der Worker-Prozesse (Standard: JOB_WORKER_PROCESSES). 0 arbeitet im aktuellen Prozess.'
+        )
+        parser.add_argument('--once', action='store_true', help='Alle fälligen Jobs abarbeiten und beenden.')
+        parser.add_argument('--poll-interval', type=float, default=None, help='Wartezeit in Sekunden ohne Jobs.')
+
+    def handle(self, *args, **options):
+        processes = settings.JOB_WORKER_PROCESSES if options['processes'] is None else options['processes']
+        poll_interval = options['poll_interval'] or settings.JOB_POLL_INTERVAL
+        once = options['once']
+
+        if processes == 0:
+            processed = work(poll_interval, once)
+            self.stdout.write(self.style.SUCCESS(f'{processed} Jobs bearbeitet.'))
+            return
+
+        # Offene Verbindungen dürfen nicht in die Kindprozesse vererbt werden.
+        connections.close_all()
+        # Nicht daemonisch, damit Jobs selbst einen Prozesspool starten dürfen (provision_users).
+        workers = [
+            multiprocessing.Process(target=_child, args=(poll_interval, once))
+            for _ in range(processes)
+        ]
+        for process in workers:
+            process.start()
+        self.stdout.write(f'{processes} Worker gestartet.')
+        try:
+            for process in workers:
+                process.join()
+        except KeyboardInterrupt:
+            for process in workers:
+                process.terminate()
+            for process in workers:
+                process.join()
+        self.stdout.write(self.style.SUCCESS('Worker beendet.'))
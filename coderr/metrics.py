@@ -0,0 +1,249 @@
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+METRICS = {
+    'coderr_http_requests_total': ('counter', 'Anzahl der Requests je Route, Methode und Status.'),
+    'coderr_http_request_duration_seconds': ('histogram', 'Dauer der Requests je Route.'),
+    'coderr_http_response_size_bytes': ('histogram', 'Größe der Antworten je Route.'),
+    'coderr_db_queries_per_request': ('histogram', 'SQL-Abfragen pro Request je Route.'),
+    'coderr_db_queries_total': ('counter', 'SQL-Abfragen je Route.'),
+    'coderr_db_duration_seconds_total': ('counter', 'Summierte Dauer der SQL-Abfragen je Route.'),
+    'coderr_serializer_duration_seconds_total': ('counter', 'Summierte Serializer-Zeit (Serializer.data) je Route.'),
+}
+
+_request_stats = ContextVar('coderr_request_stats', default=None)
+
+
+class RequestStats:
+    """
+    Messwerte eines Requests. Liegt in einer ContextVar, damit auch Abfragen aus den
+    Thread-Pools der async-Views (sync_to_async kopiert den Kontext) erfasst werden.
+    """
+    __slots__ = ('queries', 'db_time', 'serializer_time', 'serializer_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+
+def start_request():
+    stats = RequestStats()
+    return stats, _request_stats.set(stats)
+
+
+def end_request(token):
+    _request_stats.reset(token)
+
+
+def current_stats():
+    return _request_stats.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    execute_wrapper, der auf jeder Datenbankverbindung installiert wird (siehe install_query_recorder).
+    """
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    Empfänger für connection_created: hängt record_query dauerhaft an die Verbindung.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def instrument_serializers():
+    """
+    Misst die Zeit in BaseSerializer.data (to_representation samt der dabei ausgelösten
+    Abfragen). Verschachtelte Aufrufe (Serializer.data -> BaseSerializer.data) zählen einmal.
+    """
+    from rest_framework.serializers import BaseSerializer
+    original = BaseSerializer.data
+    if getattr(original.fget, 'instrumented', False):
+        return
+
+    def data(self):
+        stats = _request_stats.get()
+        if stats is None or stats.serializer_depth:
+            return original.fget(self)
+        stats.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            stats.serializer_depth -= 1
+            stats.serializer_time += time.perf_counter() - started
+
+    data.instrumented = True
+    BaseSerializer.data = property(data)
+
+
+class MetricsRegistry:
+    """
+    Zähler und Histogramme im Prozess, die regelmäßig (METRICS_FLUSH_INTERVAL) in eine
+    gemeinsame SQLite-Datei (METRICS_STORE) addiert werden. So summiert /metrics die Werte
+    aller Gunicorn-Worker auf demselben Host.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def inc(self, name, labels, value=1.0):
+        key = (name, _label_key(labels), '')
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def observe(self, name, labels, value, buckets):
+        labels = _label_key(labels)
+        with self._lock:
+            for bound in buckets:
+                if value <= bound:
+                    key = (name + '_bucket', labels, _format_bound(bound))
+                    self._values[key] = self._values.get(key, 0.0) + 1
+            for suffix, amount in (('_bucket', 1), ('_sum', value), ('_count', 1)):
+                key = (name + suffix, labels, '+Inf' if suffix == '_bucket' else '')
+                self._values[key] = self._values.get(key, 0.0) + amount
+
+    def record_request(self, route, method, status, duration, size, stats):
+        labels = {'route': route, 'method': method}
+        self.inc('coderr_http_requests_total', dict(labels, status=str(status)))
+        self.observe('coderr_http_request_duration_seconds', labels, duration, LATENCY_BUCKETS)
+        self.observe('coderr_http_response_size_bytes', labels, size, SIZE_BUCKETS)
+        self.observe('coderr_db_queries_per_request', labels, stats.queries, QUERY_COUNT_BUCKETS)
+        self.inc('coderr_db_queries_total', labels, stats.queries)
+        self.inc('coderr_db_duration_seconds_total', labels, stats.db_time)
+        self.inc('coderr_serializer_duration_seconds_total', labels, stats.serializer_time)
+        if time.monotonic() - self._last_flush >= settings.METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def _connect(self):
+        conn = sqlite3.connect(settings.METRICS_STORE, timeout=5)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS metrics (name TEXT NOT NULL, labels TEXT NOT NULL, '
+            'le TEXT NOT NULL, value REAL NOT NULL, PRIMARY KEY (name, labels, le))'
+        )
+        return conn
+
+    def flush(self):
+        """
+        Addiert die seit dem letzten Aufruf gesammelten Werte in den gemeinsamen Speicher.
+        """
+        with self._lock:
+            values, self._values = self._values, {}
+            self._last_flush = time.monotonic()
+        if not values:
+            return
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        'INSERT INTO metrics (name, labels, le, value) VALUES (?, ?, ?, ?) '
+                        'ON CONFLICT (name, labels, le) DO UPDATE SET value = value + excluded.value',
+                        [(name, labels, le, value) for (name, labels, le), value in values.items()],
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            # Werte nicht verlieren, beim nächsten Flush erneut versuchen.
+            with self._lock:
+                for key, value in values.items():
+                    self._values[key] = self._values.get(key, 0.0) + value
+
+    def collect(self):
+        """
+        Gibt alle Werte aus dem gemeinsamen Speicher zurück (nach einem Flush dieses Prozesses).
+        """
+        self.flush()
+        conn = self._connect()
+        try:
+            return conn.execute('SELECT name, labels, le, value FROM metrics ORDER BY name, labels').fetchall()
+        finally:
+            conn.close()
+
+    def reset(self):
+        with self._lock:
+            self._values = {}
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('DELETE FROM metrics')
+        finally:
+            conn.close()
+
+    def render(self):
+        """
+        Gibt alle Werte im Prometheus-Textformat (Version 0.0.4) zurück.
+        """
+        rows = self.collect()
+        by_metric = {}
+        for name, labels, le, value in rows:
+            base = name
+            for suffix in ('_bucket', '_sum', '_count'):
+                if name.endswith(suffix) and name[:-len(suffix)] in METRICS:
+                    base = name[:-len(suffix)]
+            by_metric.setdefault(base, []).append((name, labels, le, value))
+
+        lines = []
+        for base, (kind, help_text) in METRICS.items():
+            samples = by_metric.get(base)
+            if not samples:
+                continue
+            lines.append(f'# HELP {base} {help_text}')
+            lines.append(f'# TYPE {base} {kind}')
+            samples.sort(key=lambda sample: (sample[1], sample[0], _bucket_order(sample[2])))
+            for name, labels, le, value in samples:
+                pairs = json.loads(labels)
+                if le:
+                    pairs.append(['le', le])
+                label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in pairs)
+                lines.append(f'{name}{{{label_text}}} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _label_key(labels):
+    return json.dumps(sorted(labels.items()))
+
+
+def _format_bound(bound):
+    return repr(float(bound)) if isinstance(bound, float) else str(bound)
+
+
+def _bucket_order(le):
+    return float('inf') if le in ('', '+Inf') else float(le)
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
+atexit.register(registry.flush)
@@ -0,0 +1,246 @@
+import asyncio
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+from coderr import metrics, slow_queries
+from coderr.routers import pin_primary, replica_alias
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class MiddlewareProfile:
+    """
+    Eine Middleware-Kette, die wie in Django (BaseHandler.load_middleware) aus einer Liste von
+    Pfaden aufgebaut wird, synchron unter WSGI bzw. asynchron unter ASGI.
+    Die process_view-, process_exception- und process_template_response-Hooks der
+    Middlewares werden gesammelt und von RouteMiddlewareProfile synchron aufgerufen.
+    """
+
+    def __init__(self, paths, get_response, is_async=False):
+        self.view_middleware = []
+        self.exception_middleware = []
+        self.template_response_middleware = []
+        adapt = BaseHandler().adapt_method_mode
+        handler = get_response
+        handler_is_async = is_async
+        for path in reversed(paths):
+            middleware_class = import_string(path)
+            can_sync = getattr(middleware_class, 'sync_capable', True)
+            can_async = getattr(middleware_class, 'async_capable', False)
+            if not can_sync and not can_async:
+                raise ImproperlyConfigured(
+                    f'Middleware {path} must have at least one of sync_capable/async_capable set to True.'
+                )
+            middleware_is_async = can_async if handler_is_async or not can_sync else False
+            middleware = middleware_class(adapt(middleware_is_async, handler, handler_is_async, name=path))
+            if hasattr(middleware, 'process_view'):
+                self.view_middleware.insert(0, middleware.process_view)
+            if hasattr(middleware, 'process_template_response'):
+                self.template_response_middleware.append(middleware.process_template_response)
+            if hasattr(middleware, 'process_exception'):
+                self.exception_middleware.append(middleware.process_exception)
+            handler = convert_exception_to_response(middleware)
+            handler_is_async = middleware_is_async
+        self.handler = adapt(is_async, handler, handler_is_async)
+
+
+class RouteMiddlewareProfile:
+    """
+    Wählt pro Request zwischen zwei Middleware-Ketten: Token-authentifizierte Requests unter
+    API_URL_PREFIX laufen durch API_MIDDLEWARE, alle anderen (Admin, Browsable API mit Session)
+    durch SESSION_MIDDLEWARE. So entfallen für die API Session-Laden, CSRF-Prüfung und Messages.
+    Muss als letzter Eintrag in MIDDLEWARE stehen.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Markiert die Instanz für Django als Coroutine-Funktion (wie MiddlewareMixin).
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        self.session = MiddlewareProfile(settings.SESSION_MIDDLEWARE, get_response, self.is_async)
+        self.api = MiddlewareProfile(settings.API_MIDDLEWARE, get_response, self.is_async)
+        self.prefix = settings.API_URL_PREFIX
+
+    def select(self, request):
+        """
+        Gibt die Kette für den Request zurück.
+        """
+        if request.path_info.startswith(self.prefix) and \
+                request.META.get('HTTP_AUTHORIZATION', '').startswith('Token '):
+            return self.api
+        return self.session
+
+    def __call__(self, request):
+        # Unter ASGI ist profile.handler eine Coroutine-Funktion; der Aufruf liefert dann das Awaitable.
+        request.middleware_profile = profile = self.select(request)
+        return profile.handler(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        for method in request.middleware_profile.view_middleware:
+            response = method(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_exception(self, request, exception):
+        for method in request.middleware_profile.exception_middleware:
+            response = method(request, exception)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        for method in request.middleware_profile.template_response_middleware:
+            response = method(request, response)
+        return response
+
+
+class PrimaryPinMiddleware:
+    """
+    Bindet Benutzer nach einem erfolgreichen schreibenden Request für kurze Zeit an den
+    Primary (Read-your-writes bei Lesezugriffen über die Replik). Ohne Replik inaktiv.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.needs_pin(request, response):
+            self.pin(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.needs_pin(request, response):
+            # request.user kann eine Session-Abfrage auslösen.
+            await sync_to_async(self.pin)(request, response)
+        return response
+
+    def needs_pin(self, request, response):
+        return request.method not in SAFE_METHODS and response.status_code < 400 and replica_alias()
+
+    def pin(self, request, response):
+        # request.user setzt AuthenticationMiddleware oder, bei Token-Requests, DRF.
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            pin_primary(response, user.pk)
+
+
+class MetricsMiddleware:
+    """
+    Erfasst pro Request Dauer, Status, Antwortgröße, Anzahl und Dauer der SQL-Abfragen und die
+    Serializer-Zeit je Route (URL-Muster) für /metrics. Mit METRICS_SERVER_TIMING werden die
+    Werte zusätzlich im Server-Timing-Header ausgegeben. Steht als erster Eintrag in MIDDLEWARE.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        stats, token = metrics.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self.finish(request, response, stats, started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        stats, token = metrics.start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self.finish(request, response, stats, started)
+
+    def finish(self, request, response, stats, started):
+        duration = time.perf_counter() - started
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match is not None and match.route else 'unmatched'
+        size = len(response.content) if not response.streaming else 0
+        metrics.registry.record_request(route, request.method, response.status_code, duration, size, stats)
+        if settings.METRICS_SERVER_TIMING:
+            response['Server-Timing'] = (
+                f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries", '
+                f'serializer;dur={stats.serializer_time * 1000:.1f}, '
+                f'total;dur={duration * 1000:.1f}'
+            )
+        return response
+
+
+class SlowQueryMiddleware:
+    """
+    Stellt den Request für das Slow-Query-Log bereit (Route und View-Klasse je Eintrag) und
+    protokolliert am Ende wiederholt ausgeführte Abfragen (N+1), siehe coderr.slow_queries.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        context, token = slow_queries.start_request(request)
+        try:
+            return self.get_response(request)
+        finally:
+            slow_queries.end_request(token)
+            slow_queries.log_repeated_queries(context)
+
+    async def __acall__(self, request):
+        context, token = slow_queries.start_request(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            slow_queries.end_request(token)
+            slow_queries.log_repeated_queries(context)
+
+
+ADMIN_MIDDLEWARE = [
+    ('admin.E410', 'django.contrib.sessions.middleware.SessionMiddleware'),
+    ('admin.E408', 'django.contrib.auth.middleware.AuthenticationMiddleware'),
+    ('admin.E409', 'django.contrib.messages.middleware.MessageMiddleware'),
+]
+
+
+@checks.register(checks.Tags.admin)
+def check_session_middleware(app_configs, **kwargs):
+    """
+    Ersetzt die Admin-Checks admin.E408-E410 (in SILENCED_SYSTEM_CHECKS), die nur MIDDLEWARE
+    durchsuchen: Bei RouteMiddlewareProfile müssen die Middlewares in SESSION_MIDDLEWARE stehen.
+    """
+    paths = settings.MIDDLEWARE
+    if 'coderr.middleware.RouteMiddlewareProfile' in paths:
+        paths = list(paths) + list(settings.SESSION_MIDDLEWARE)
+    return [
+        checks.Error(
+            f"'{path}' must be in MIDDLEWARE or SESSION_MIDDLEWARE in order to use the admin application.",
+            id=f'coderr.{check_id}',
+        )
+        for check_id, path in ADMIN_MIDDLEWARE if path not in paths
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:10
+
+from django.db import migrations, models
+
+
+def backfill_min_values(apps, schema_editor):
+    Offers = apps.get_model('coderr', 'Offers')
+    OfferDetail = apps.get_model('coderr', 'OfferDetail')
+    details = OfferDetail.objects.filter(offer=models.OuterRef('pk')).order_by().values('offer')
+    Offers.objects.update(
+        min_price=models.Subquery(details.annotate(value=models.Min('price')).values('value')),
+        min_delivery_time=models.Subquery(details.annotate(value=models.Min('delivery_time_in_days')).values('value')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offers',
+            name='min_delivery_time',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='offers',
+            name='min_price',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.RunPython(backfill_min_values, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+from coderr.search import install_search_index, remove_search_index
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor)
+
+
+def remove(apps, schema_editor):
+    remove_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr', '0002_offers_min_values'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, remove),
+    ]
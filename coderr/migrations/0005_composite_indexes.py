@@ -0,0 +1,68 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('coderr', '0004_detail_profile_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='offerdetail',
+            name='offer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='details', to='coderr.offers'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='business_user',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='The business owner who created the offer.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='business_orders', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='customer_user',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='The customer who placed the order.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='customer_orders', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='business_user',
+            field=models.ForeignKey(db_index=False, help_text='The business user being reviewed.', on_delete=django.db.models.deletion.CASCADE, related_name='received_reviews', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='offerdetail',
+            index=models.Index(fields=['offer', 'price'], name='offerdetail_offer_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offerdetail',
+            index=models.Index(fields=['offer', 'delivery_time_in_days'], name='offerdetail_offer_dtime_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offers',
+            index=models.Index(fields=['user', 'updated_at'], name='offers_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offers',
+            index=models.Index(fields=['updated_at', 'id'], name='offers_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['business_user', 'status'], name='order_business_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['customer_user', 'created_at'], name='order_customer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['type'], name='profile_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['business_user', 'updated_at'], name='review_business_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+# Eindeutige E-Mail-Adressen ohne Beachtung der Groß-/Kleinschreibung. Leere E-Mails
+# (z. B. Superuser ohne Adresse) sind ausgenommen. SQLite und PostgreSQL unterstützen
+# beide partielle Ausdrucksindizes.
+USER_EMAIL_INDEX = 'coderr_user_email_ci_uniq'
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """
+    Bricht mit einer Liste der betroffenen Konten ab, wenn Adressen sich nur in der Groß-/Kleinschreibung
+    unterscheiden; zuvor wurden nur exakt gleiche Adressen abgelehnt. Welches Konto die Adresse behält,
+    lässt sich nicht automatisch entscheiden.
+    """
+    User = apps.get_model('auth', 'User')
+    users = User.objects.using(schema_editor.connection.alias).exclude(email='').annotate(email_lower=Lower('email'))
+    duplicates = users.values('email_lower').annotate(count=Count('pk')).filter(count__gt=1).values_list(
+        'email_lower', flat=True
+    )
+    accounts = {}
+    for email, username in users.filter(email_lower__in=list(duplicates)).order_by('email_lower', 'pk').values_list(
+        'email_lower', 'username'
+    ):
+        accounts.setdefault(email, []).append(username)
+    if accounts:
+        listing = '\n'.join(f"  {email}: {', '.join(usernames)}" for email, usernames in accounts.items())
+        raise RuntimeError(
+            'E-Mail-Adressen sind ohne Beachtung der Groß-/Kleinschreibung mehrfach vergeben; der eindeutige '
+            f'Index {USER_EMAIL_INDEX} kann erst angelegt werden, wenn sie bereinigt sind:\n{listing}'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('coderr', '0007_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.RunSQL(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {USER_EMAIL_INDEX} ON auth_user (LOWER(email)) WHERE email <> ''",
+            f"DROP INDEX IF EXISTS {USER_EMAIL_INDEX}",
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 3.2.25 on 2026-10-18 15:24
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr', '0009_cache_generation'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='CacheGeneration',
+        ),
+    ]
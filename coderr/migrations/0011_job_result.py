@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 15:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr', '0010_delete_cache_generation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='result',
+            field=models.JSONField(blank=True, help_text='Return value of the handler.', null=True),
+        ),
+    ]
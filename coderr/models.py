@@ -11,12 +11,20 @@ class Profile(models.Model):
 
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile',primary_key=True )
     file = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)
+    file_variants = models.JSONField(default=dict, blank=True)
     location = models.CharField(max_length=255, blank=True, null=True)
     tel = models.CharField(max_length=20, blank=True, null=True)
     description = models.TextField(blank=True, null=True)
     working_hours = models.CharField(max_length=50, blank=True, null=True)
     type = models.CharField(max_length=10, choices=TYPE_CHOICES)
     created_at = models.DateTimeField(auto_now_add=True)  
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Business- und Kundenlisten, BaseInfoView, OrderCountView
+            models.Index(fields=['type'], name='profile_type_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} ({self.type})"
@@ -32,7 +40,8 @@ class OfferDetail(models.Model):
     offer = models.ForeignKey( 
         'Offers',
         on_delete=models.CASCADE,
-        related_name='details'
+        related_name='details',
+        db_index=False  # abgedeckt durch die zusammengesetzten Indizes in Meta
     )
     title = models.CharField(max_length=50)
     revisions = models.IntegerField()
@@ -40,6 +49,14 @@ class OfferDetail(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     features = models.JSONField(default=list)  
     offer_type = models.CharField(max_length=10, choices=OFFER_TYPE_CHOICES)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Prefetch der Details und MIN(price) / MIN(delivery_time_in_days) pro Angebot
+            models.Index(fields=['offer', 'price'], name='offerdetail_offer_price_idx'),
+            models.Index(fields=['offer', 'delivery_time_in_days'], name='offerdetail_offer_dtime_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.offer_type})"
@@ -48,12 +65,52 @@ class Offers(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='offers')
     title = models.CharField(max_length=50)
     image = models.ImageField(upload_to='offers_pictures/', blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True)
     description = models.TextField(max_length=500, blank=True, null=True)
-    created_at = models.DateTimeField(auto_now_add=True) 
+    created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True, db_index=True)
+    min_delivery_time = models.IntegerField(blank=True, null=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Eigene Angebote (creator_id bzw. Geschäftsnutzer) sortiert nach updated_at
+            models.Index(fields=['user', 'updated_at'], name='offers_user_updated_idx'),
+            # Öffentlicher Katalog und Cursor-Paginierung über (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='offers_updated_id_idx'),
+        ]
+
     def __str__(self):
-        return f"{self.title}" 
+        return f"{self.title}"
+
+    def refresh_min_values(self):
+        """
+        Berechnet den niedrigsten Preis und die kürzeste Lieferzeit aus den OfferDetails neu
+        und speichert beide Werte direkt in der Datenbank.
+        """
+        values = self.details.aggregate(
+            min_price=models.Min('price'),
+            min_delivery_time=models.Min('delivery_time_in_days'),
+        )
+        Offers.objects.filter(pk=self.pk).update(**values)
+        self.min_price = values['min_price']
+        self.min_delivery_time = values['min_delivery_time']
+
+    @classmethod
+    def update_min_values(cls, offer_ids):
+        """
+        Aktualisiert min_price und min_delivery_time für die angegebenen Angebote
+        mit einem einzigen UPDATE, ohne die Angebote zu laden.
+        """
+        details = OfferDetail.objects.filter(offer=models.OuterRef('pk')).order_by()
+        cls.objects.filter(pk__in=offer_ids).update(
+            min_price=models.Subquery(
+                details.values('offer').annotate(value=models.Min('price')).values('value')
+            ),
+            min_delivery_time=models.Subquery(
+                details.values('offer').annotate(value=models.Min('delivery_time_in_days')).values('value')
+            ),
+        )
     
 class Order(models.Model):
     ORDER_STATUS_CHOICES = [
@@ -68,6 +125,7 @@ class Order(models.Model):
         related_name='customer_orders',
         null=True, 
         blank=True, 
+        db_index=False,
         help_text="The customer who placed the order."
     )
     business_user = models.ForeignKey(
@@ -76,6 +134,7 @@ class Order(models.Model):
         related_name='business_orders',
         null=True, 
         blank=True, 
+        db_index=False,
         help_text="The business owner who created the offer."
     )
     offer_detail = models.ForeignKey(
@@ -92,6 +151,14 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # OrderCountView / OrderCountCompletedView
+            models.Index(fields=['business_user', 'status'], name='order_business_status_idx'),
+            # Bestellungen eines Kunden in OrderListView
+            models.Index(fields=['customer_user', 'created_at'], name='order_customer_created_idx'),
+        ]
+
     def __str__(self):
         return f"Order {self.pk} - {self.offer_detail.title} by {self.customer_user.username}"
   
@@ -108,6 +175,7 @@ class Review(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name='received_reviews',
+        db_index=False,
         help_text="The business user being reviewed."
     )
     reviewer = models.ForeignKey(
@@ -135,6 +203,43 @@ class Review(models.Model):
         help_text="The date and time when the review was last updated."
     )
 
+    class Meta:
+        indexes = [
+            # ReviewFilter business_user_id sortiert nach updated_at
+            models.Index(fields=['business_user', 'updated_at'], name='review_business_updated_idx'),
+        ]
+
     def __str__(self):
         return f"Review by {self.reviewer.username} for {self.business_user.username} (Rating: {self.rating})"
-  
\ No newline at end of file
+  
+
+class Job(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50, help_text="Name of the registered job handler.")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+    result = models.JSONField(blank=True, null=True, help_text="Return value of the handler.")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Worker holen fällige Jobs in der Reihenfolge ihrer Fälligkeit
+            models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
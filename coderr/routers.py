@@ -0,0 +1,89 @@
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_use_replica = ContextVar('coderr_use_replica', default=False)
+
+
+def same_database(alias, other=DEFAULT_DB_ALIAS):
+    """
+    Prüft, ob zwei Aliase auf dieselbe Datenbank zeigen. Unter dem Test-Runner ist das für die
+    Replik der Fall: Sie spiegelt die Testdatenbank von 'default' (TEST MIRROR, siehe coderr_app.database).
+    """
+    first, second = connections[alias].settings_dict, connections[other].settings_dict
+    return all(first.get(key) == second.get(key) for key in ('ENGINE', 'NAME', 'HOST', 'PORT'))
+
+
+def replica_alias():
+    """
+    Gibt den Alias der Lese-Replik zurück, bzw. None, wenn keine konfiguriert ist oder sie dieselbe
+    Datenbank wie 'default' ist. Im zweiten Fall (Test-Mirror) sähe eine zweite Verbindung die
+    noch offene Transaktion eines TestCase nicht, daher bleiben die Lesezugriffe auf 'default'.
+    """
+    alias = getattr(settings, 'READ_REPLICA_ALIAS', None)
+    if not alias or alias not in settings.DATABASES:
+        return None
+    if alias != DEFAULT_DB_ALIAS and same_database(alias):
+        return None
+    return alias
+
+
+def use_replica(enabled=True):
+    """
+    Schaltet Lesezugriffe im aktuellen Kontext (Thread bzw. Task) auf die Replik um.
+    Gibt ein Token für reset_replica zurück.
+    """
+    return _use_replica.set(enabled)
+
+
+def reset_replica(token):
+    _use_replica.reset(token)
+
+
+PIN_COOKIE = 'coderr_primary_pin'
+
+
+def pin_primary(response, user_id):
+    """
+    Merkt sich, dass der Benutzer gerade geschrieben hat: für READ_REPLICA_PIN_SECONDS liest er
+    wieder vom Primary, damit er seine eigenen Änderungen trotz Replikationsverzögerung sieht.
+    Die Markierung ist ein signiertes Cookie mit Zeitstempel und gilt damit in jedem Prozess.
+    """
+    response.set_signed_cookie(
+        PIN_COOKIE, str(user_id), salt=PIN_COOKIE, max_age=settings.READ_REPLICA_PIN_SECONDS,
+        secure=settings.SESSION_COOKIE_SECURE, httponly=True, samesite='Lax',
+    )
+
+
+def is_pinned(request, user_id):
+    """
+    Prüft, ob der Request ein gültiges, höchstens READ_REPLICA_PIN_SECONDS altes Cookie
+    von pin_primary für diesen Benutzer mitbringt.
+    """
+    value = request.get_signed_cookie(
+        PIN_COOKIE, default=None, salt=PIN_COOKIE, max_age=settings.READ_REPLICA_PIN_SECONDS,
+    )
+    return value == str(user_id)
+
+
+class PrimaryReplicaRouter:
+    """
+    Schreibt immer auf 'default'. Lesezugriffe gehen nur dann an die Replik, wenn eine
+    View sie mit use_replica freigegeben hat (siehe coderr.api.replica.ReplicaReadMixin).
+    """
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get():
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primary und Replik enthalten dieselben Daten.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Die Replik wird nie migriert, auch nicht als Test-Mirror.
+        return db != getattr(settings, 'READ_REPLICA_ALIAS', None)
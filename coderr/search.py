@@ -0,0 +1,133 @@
+import re
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from django.db.models import BooleanField, FloatField
+
+FTS_TABLE = 'coderr_offers_fts'
+POSTGRES_INDEX = 'coderr_offers_search_idx'
+POSTGRES_DOCUMENT = (
+    "to_tsvector('simple', coalesce(\"coderr_offers\".\"title\", '') || ' ' || "
+    "coalesce(\"coderr_offers\".\"description\", ''))"
+)
+
+SQLITE_TRIGGERS = {
+    'coderr_offers_fts_insert': f"""
+        CREATE TRIGGER IF NOT EXISTS coderr_offers_fts_insert AFTER INSERT ON coderr_offers BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    """,
+    'coderr_offers_fts_delete': f"""
+        CREATE TRIGGER IF NOT EXISTS coderr_offers_fts_delete AFTER DELETE ON coderr_offers BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+    """,
+    'coderr_offers_fts_update': f"""
+        CREATE TRIGGER IF NOT EXISTS coderr_offers_fts_update AFTER UPDATE OF title, description ON coderr_offers BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    """,
+}
+
+
+def install_search_index(schema_editor):
+    """
+    Legt den Volltextindex für Angebote an: eine FTS5-Tabelle mit Triggern unter SQLite,
+    einen GIN-Index über einen tsvector-Ausdruck unter PostgreSQL.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"title, description, content='coderr_offers', content_rowid='id')"
+        )
+        for sql in SQLITE_TRIGGERS.values():
+            schema_editor.execute(sql)
+        schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {POSTGRES_INDEX} ON coderr_offers USING GIN ({POSTGRES_DOCUMENT})"
+        )
+
+
+def remove_search_index(schema_editor):
+    """
+    Entfernt den Volltextindex wieder.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for name in SQLITE_TRIGGERS:
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif vendor == 'postgresql':
+        schema_editor.execute(f"DROP INDEX IF EXISTS {POSTGRES_INDEX}")
+
+
+def ensure_sqlite_triggers(using):
+    """
+    Stellt die FTS5-Trigger wieder her, falls SQLite sie beim Neuaufbau der Tabelle
+    coderr_offers in einer späteren Migration verworfen hat, und baut den Index dann neu auf.
+    """
+    conn = connections[using]
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name IN (%s, %s, %s, %s)",
+            [FTS_TABLE, *SQLITE_TRIGGERS],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if FTS_TABLE not in existing or existing.issuperset(SQLITE_TRIGGERS):
+            return
+        for sql in SQLITE_TRIGGERS.values():
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def search_tokens(terms):
+    """
+    Zerlegt die Suchbegriffe in Wörter ohne Sonderzeichen der Abfragesprachen.
+    """
+    tokens = []
+    for term in terms:
+        tokens.extend(re.findall(r'\w+', term))
+    return tokens
+
+
+def full_text_search_supported(queryset):
+    """
+    Gibt an, ob die Datenbank des Querysets einen Volltextindex für Angebote besitzt.
+    """
+    return connections[queryset.db].vendor in ('sqlite', 'postgresql')
+
+
+def search_offers(queryset, terms):
+    """
+    Filtert Angebote über den Volltextindex und annotiert die Relevanz als search_rank
+    (höher ist relevanter). Alle Wörter müssen vorkommen, jedes Wort wird als Präfix gesucht.
+    """
+    tokens = search_tokens(terms)
+    if not tokens:
+        return queryset.none()
+
+    if connections[queryset.db].vendor == 'sqlite':
+        # Die FTS-Tabelle wird über rowid verbunden, sodass MATCH einmal pro Abfrage läuft
+        # und bm25() die Relevanz der gefundenen Zeile liefert.
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        table = queryset.model._meta.db_table
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'"{FTS_TABLE}"."rowid" = "{table}"."id"', f'"{FTS_TABLE}" MATCH %s'],
+            params=[match],
+        ).annotate(search_rank=RawSQL(f'-bm25("{FTS_TABLE}")', [], output_field=FloatField()))
+
+    query = ' & '.join(f'{token}:*' for token in tokens)
+    matches = RawSQL(
+        f"{POSTGRES_DOCUMENT} @@ to_tsquery('simple', %s)", [query], output_field=BooleanField()
+    )
+    rank = RawSQL(
+        f"ts_rank({POSTGRES_DOCUMENT}, to_tsquery('simple', %s))", [query], output_field=FloatField()
+    )
+    return queryset.filter(matches).annotate(search_rank=rank)
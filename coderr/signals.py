@@ -1,13 +1,90 @@
-# from django.db.models.signals import post_save
-# from django.dispatch import receiver
-# from django.contrib.auth.models import User
-# from .models import Profile
-
-# @receiver(post_save, sender=User)
-# def create_user_profile(sender, instance, created, **kwargs):
-#     if created:
-#         Profile.objects.create(user=instance)
-
-# @receiver(post_save, sender=User)
-# def save_user_profile(sender, instance, **kwargs):
-#     instance.profile.save()
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from .api.authentication import revoke_user_on_commit, token_cache
+from .cache import offer_list_cache
+from .images import schedule_variants, variants_outdated
+from .models import OfferDetail, Offers, Profile
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def update_offer_min_values(sender, instance, **kwargs):
+    """
+    Hält min_price und min_delivery_time des zugehörigen Angebots aktuell,
+    sobald ein OfferDetail erstellt, geändert oder gelöscht wird.
+    """
+    Offers.update_min_values([instance.offer_id])
+
+
+@receiver(post_save, sender=Offers)
+@receiver(post_delete, sender=Offers)
+def invalidate_offer_cache(sender, instance, **kwargs):
+    """
+    Verwirft gecachte Angebotslisten, wenn ein Angebot gespeichert oder gelöscht wird.
+    """
+    offer_list_cache.invalidate_on_commit([instance.user_id])
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def invalidate_offer_cache_for_detail(sender, instance, **kwargs):
+    """
+    Verwirft gecachte Angebotslisten, wenn sich ein OfferDetail ändert.
+    """
+    offer = instance._state.fields_cache.get('offer')
+    if offer is not None:
+        user_ids = [offer.user_id]
+    else:
+        user_ids = Offers.objects.filter(pk=instance.offer_id).values_list('user_id', flat=True)
+    offer_list_cache.invalidate_on_commit(user_ids)
+
+
+@receiver(post_save, sender=Offers)
+def update_offer_image_variants(sender, instance, raw=False, **kwargs):
+    """
+    Plant neue Bildvarianten ein, wenn sich das Angebotsbild geändert hat.
+    """
+    if raw or not variants_outdated(instance.image, instance.image_variants):
+        return
+    schedule_variants(instance, 'offers')
+
+
+@receiver(post_save, sender=Profile)
+def update_profile_file_variants(sender, instance, raw=False, **kwargs):
+    """
+    Plant neue Bildvarianten ein, wenn sich das Profilbild geändert hat.
+    """
+    if raw or not variants_outdated(instance.file, instance.file_variants):
+        return
+    schedule_variants(instance, 'profiles')
+
+
+@receiver(post_delete, sender=Token)
+def discard_cached_token(sender, instance, **kwargs):
+    """
+    Entfernt ein gelöschtes Token (Logout, Rotation, Benutzer gelöscht) aus dem Token-Cache aller Prozesse.
+    """
+    token_cache.discard(instance.key)
+    revoke_user_on_commit(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def discard_cached_user(sender, instance, **kwargs):
+    """
+    Verwirft die gecachten Benutzerdaten in allen Prozessen, wenn sich Benutzer oder Profil ändern.
+    """
+    revoke_user_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens_on_password_change(sender, instance, created, **kwargs):
+    """
+    Widerruft die Tokens eines Benutzers, sobald sein Passwort geändert wurde.
+    """
+    if not created and getattr(instance, '_password', None) is not None:
+        Token.objects.filter(user=instance).delete()
@@ -0,0 +1,173 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_request_context = ContextVar('coderr_slow_query_context', default=None)
+
+# Die execute_wrapper selbst sind nie die Aufrufstelle.
+_WRAPPER_FILES = {
+    os.path.normcase(os.path.abspath(__file__)),
+    os.path.normcase(os.path.abspath(os.path.join(os.path.dirname(__file__), 'metrics.py'))),
+}
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w".])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b', re.IGNORECASE)
+_PLACEHOLDER_LIST = re.compile(r'\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)')
+_VALUES_LIST = re.compile(r'(\(\?\+\))(?:\s*,\s*\(\?\+\))+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class RequestContext:
+    """
+    Zustand eines Requests: der Request (für Route und View, sobald die URL aufgelöst ist) und
+    wie oft jeder Fingerprint bisher ausgeführt wurde.
+    """
+    __slots__ = ('request', 'counts', 'durations', 'repeated')
+
+    def __init__(self, request):
+        self.request = request
+        self.counts = {}
+        self.durations = {}
+        self.repeated = {}
+
+
+def start_request(request):
+    context = RequestContext(request)
+    return context, _request_context.set(context)
+
+
+def end_request(token):
+    _request_context.reset(token)
+
+
+@functools.lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """
+    Normalisiert eine SQL-Anweisung: Literale werden zu '?', Platzhalterlisten (IN (...),
+    mehrzeilige VALUES) zu einem Eintrag und Leerraum zu einem Zeichen. Gibt den normalisierten
+    Text und einen kurzen Hash zurück, sodass dieselbe Abfrage mit anderen Werten gleich aussieht.
+    """
+    text = _STRING.sub('?', sql)
+    text = _NUMBER.sub('?', text)
+    text = _PLACEHOLDER_LIST.sub('(?+)', text)
+    text = _VALUES_LIST.sub(r'\1', text)
+    text = _WHITESPACE.sub(' ', text).strip()
+    return text, hashlib.sha1(text.encode()).hexdigest()[:12]
+
+
+def call_site():
+    """
+    Gibt die innerste Stelle im Projektcode (unter BASE_DIR, ohne installierte Pakete) zurück,
+    die die Abfrage ausgelöst hat, als 'pfad:zeile in funktion'.
+    """
+    base = os.path.normcase(os.path.abspath(settings.BASE_DIR)) + os.sep
+    frame = sys._getframe(1)
+    while frame is not None:
+        path = os.path.normcase(os.path.abspath(frame.f_code.co_filename))
+        if path.startswith(base) and path not in _WRAPPER_FILES and 'site-packages' not in path:
+            return f'{os.path.relpath(path, base)}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    return None
+
+
+def request_labels(context):
+    """
+    Route (URL-Muster), URL-Name und View-Klasse des Requests, soweit bereits bekannt.
+    """
+    if context is None:
+        return {'route': None, 'url_name': None, 'view': None, 'method': None}
+    request = context.request
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return {'route': None, 'url_name': None, 'view': None, 'method': request.method}
+    view = getattr(match.func, 'view_class', match.func)
+    return {
+        'route': match.route,
+        'url_name': match.view_name,
+        'view': f'{view.__module__}.{view.__qualname__}',
+        'method': request.method,
+    }
+
+
+def record_slow_query(execute, sql, params, many, context):
+    """
+    execute_wrapper, der auf jeder Datenbankverbindung installiert wird (siehe install_slow_query_logger).
+    Protokolliert Anweisungen über SLOW_QUERY_THRESHOLD_MS und zählt Fingerprints pro Request.
+    """
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        request_context = _request_context.get()
+        text, digest = fingerprint(sql)
+        if duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            logger.warning('slow query', extra={'slow_query': dict(
+                request_labels(request_context),
+                event='slow_query',
+                fingerprint=digest,
+                sql=text,
+                duration_ms=round(duration * 1000, 3),
+                call_site=call_site(),
+                database=context['connection'].alias,
+            )})
+        if request_context is not None:
+            count = request_context.counts.get(digest, 0) + 1
+            request_context.counts[digest] = count
+            request_context.durations[digest] = request_context.durations.get(digest, 0.0) + duration
+            if count == settings.SLOW_QUERY_REPEAT_THRESHOLD:
+                # Aufrufstelle nur einmal bestimmen; die Anzahl steht erst am Ende des Requests fest.
+                request_context.repeated[digest] = (text, call_site(), context['connection'].alias)
+
+
+def log_repeated_queries(request_context):
+    """
+    Protokolliert am Ende eines Requests jede Abfrage, die mindestens SLOW_QUERY_REPEAT_THRESHOLD
+    mal ausgeführt wurde (typisch für N+1-Zugriffe aus Serializern oder Schleifen).
+    """
+    if not request_context.repeated:
+        return
+    labels = request_labels(request_context)
+    for digest, (text, site, alias) in request_context.repeated.items():
+        logger.warning('repeated query', extra={'slow_query': dict(
+            labels,
+            event='repeated_query',
+            fingerprint=digest,
+            sql=text,
+            count=request_context.counts[digest],
+            duration_ms=round(request_context.durations[digest] * 1000, 3),
+            call_site=site,
+            database=alias,
+        )})
+
+
+def install_slow_query_logger(sender, connection, **kwargs):
+    """
+    Empfänger für connection_created: hängt record_slow_query dauerhaft an die Verbindung.
+    """
+    if record_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_slow_query)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Schreibt einen Log-Eintrag als eine Zeile JSON (für analyze_slow_queries).
+    """
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'pid': record.process,
+        }
+        entry.update(getattr(record, 'slow_query', None) or {'message': record.getMessage()})
+        return json.dumps(entry, default=str)
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from asgiref.sync import sync_to_async
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import AsyncClient, TransactionTestCase, override_settings
+from django.urls import path
+from rest_framework.authtoken.models import Token
+from coderr.api.async_views import read_view
+from coderr.api.views.base_info import BaseInfoView
+from coderr.api.views.offers import DetailOfferView, OffersListView
+from django.conf import settings
+from django.core.cache import caches
+from coderr.models import Offers, OfferDetail, Profile
+
+urlpatterns = [
+    path('api/offers/', read_view(OffersListView, asynchronous=True)),
+    path('api/offers/<int:pk>/', read_view(DetailOfferView, asynchronous=True)),
+    path('api/base-info/', read_view(BaseInfoView, asynchronous=True)),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncReadViewTestCase(TransactionTestCase):
+    # Die Views laufen in Pool-Threads mit eigenen Verbindungen und sehen nur committete Daten.
+
+    def setUp(self):
+        caches[settings.OFFER_LIST_CACHE_ALIAS].clear()
+        self.business_user = User.objects.create_user(username="business_user", password="password123")
+        Profile.objects.create(user=self.business_user, type='business')
+        self.customer_user = User.objects.create_user(username="customer_user", password="password123")
+        Profile.objects.create(user=self.customer_user, type='customer')
+        self.offer = Offers.objects.create(user=self.business_user, title="Async Offer", description="Text")
+        OfferDetail.objects.create(
+            offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=3,
+            price=50, features=["A"], offer_type="basic",
+        )
+        self.token = Token.objects.create(user=self.customer_user)
+        self.client = AsyncClient()
+
+    def get(self, url, token=None):
+        # Der AsyncClient von Django 3.2 erwartet Header unter ihrem HTTP-Namen.
+        return self.client.get(url, authorization=f'Token {(token or self.token).key}')
+
+    def test_read_views_are_coroutines(self):
+        """Testet, dass read_view mit asynchronous=True async-Views liefert und sonst die DRF-View."""
+        self.assertTrue(asyncio.iscoroutinefunction(urlpatterns[0].callback))
+        self.assertFalse(asyncio.iscoroutinefunction(read_view(OffersListView, asynchronous=False)))
+
+    async def test_offer_list_and_detail(self):
+        """Testet, dass Angebotsliste und Detail über ASGI dieselben Daten liefern."""
+        response = await self.get('/api/offers/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['title'], "Async Offer")
+
+        response = await self.get(f'/api/offers/{self.offer.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['min_price'], 50)
+
+    async def test_reads_run_outside_the_event_loop_thread(self):
+        """Testet, dass lesende Requests in einem Pool-Thread statt im Event-Loop-Thread laufen."""
+        loop_thread = threading.get_ident()
+        threads = []
+        original_get = BaseInfoView.get
+
+        def recording_get(view, request, *args, **kwargs):
+            threads.append(threading.get_ident())
+            return original_get(view, request, *args, **kwargs)
+
+        with mock.patch.object(BaseInfoView, 'get', recording_get):
+            responses = await asyncio.gather(*(self.get('/api/base-info/') for _ in range(4)))
+        self.assertEqual([response.status_code for response in responses], [200] * 4)
+        self.assertEqual(responses[0].json()['offer_count'], 1)
+        self.assertNotIn(loop_thread, threads)
+
+    async def test_writes_still_work(self):
+        """Testet, dass schreibende Methoden auf async-Views weiterhin funktionieren."""
+        token = await sync_to_async(Token.objects.create)(user=self.business_user)
+        response = await self.client.delete(f'/api/offers/{self.offer.pk}/', authorization=f'Token {token.key}')
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(await sync_to_async(Offers.objects.filter(pk=self.offer.pk).exists)())
@@ -1,9 +1,22 @@
+import importlib
+from django.apps import apps as django_apps
 from rest_framework.test import APITestCase
 from rest_framework import status
+from django.conf import settings
+from django.core.cache import caches
 from django.contrib.auth.models import User
 from coderr.models import Profile
 from rest_framework.authtoken.models import Token
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework.test import APIClient
+from coderr.api.authentication import CachedTokenAuthentication, token_cache
+from coderr.cache import offer_list_cache
+from coderr.api.serializers.autentication import RegistrationSerializer
+from rest_framework.exceptions import ValidationError
 
 class LoginAPITestCase(APITestCase):
 
@@ -120,4 +133,182 @@ class RegistrationAPITestCase(APITestCase):
         user = User.objects.get(username="newuser")
         token = Token.objects.get(user=user)
         self.assertEqual(response.data['token'], token.key)
-        
\ No newline at end of file
+
+    def test_registration_duplicate_email_ignores_case(self):
+        User.objects.create_user(
+            username="anotheruser",
+            email="NewUser@Example.com",
+            password="password123"
+        )
+        response = self.client.post(self.registration_url, self.valid_data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data)
+        self.assertFalse(User.objects.filter(username="newuser").exists())
+
+    def test_registration_writes_in_one_transaction(self):
+        """Testet, dass die Registrierung ohne Vorab-Abfragen nur Benutzer, Profil und Token einfügt."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.registration_url, self.valid_data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        statements = [query['sql'].split()[0] for query in queries.captured_queries]
+        self.assertEqual([sql for sql in statements if sql not in ('SAVEPOINT', 'RELEASE')], ['INSERT'] * 3)
+
+    def test_concurrent_duplicate_is_rolled_back(self):
+        """Testet, dass ein gleichzeitig angelegter Benutzer keine halbe Registrierung hinterlässt."""
+        serializer = RegistrationSerializer(data=self.valid_data)
+        self.assertTrue(serializer.is_valid())
+        # Ein anderer Request legt den Benutzer zwischen Validierung und Speichern an.
+        User.objects.create_user(username="racer", email="NEWUSER@example.com", password="x")
+        with self.assertRaises(ValidationError) as context:
+            serializer.save()
+        self.assertIn('email', context.exception.detail)
+        self.assertEqual(Profile.objects.count(), 0)
+        self.assertFalse(Token.objects.exists())
+
+    def test_email_migration_lists_duplicates_instead_of_failing_on_the_index(self):
+        """Testet, dass Migration 0008 bei E-Mails, die sich nur in der Schreibweise unterscheiden, die Konten nennt."""
+        migration = importlib.import_module('coderr.migrations.0008_user_email_unique')
+        schema_editor = connection.schema_editor()
+        migration.check_duplicate_emails(django_apps, schema_editor)
+
+        # Bestand vor der Migration: Nur exakt gleiche Adressen wurden abgelehnt.
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP INDEX {migration.USER_EMAIL_INDEX}')
+        User.objects.create_user(username="alice", email="Shared@Example.com", password="x")
+        User.objects.create_user(username="alice2", email="shared@example.com", password="x")
+        User.objects.create_user(username="bob", email="bob@example.com", password="x")
+        with self.assertRaises(RuntimeError) as context:
+            migration.check_duplicate_emails(django_apps, schema_editor)
+        self.assertIn('shared@example.com: alice, alice2', str(context.exception))
+        self.assertNotIn('bob', str(context.exception))
+
+
+class CachedTokenAuthenticationTestCase(APITestCase):
+
+    def setUp(self):
+        caches[settings.OFFER_LIST_CACHE_ALIAS].clear()
+        token_cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser', password='testpassword', first_name='Test'
+        )
+        Profile.objects.create(user=self.user, type='business')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_cached_token_needs_no_queries(self):
+        """Testet, dass ein bekanntes Token ohne Datenbankabfrage authentifiziert wird."""
+        self.client.get('/api/offers/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/offers/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_profile_is_loaded_with_the_token(self):
+        """Testet, dass Benutzer und Profil aus dem Cache für Berechtigungen bereitstehen."""
+        self.client.get('/api/offers/')
+        with self.captureOnCommitCallbacks(execute=True):
+            offer_list_cache.invalidate_on_commit([self.user.pk])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        for query in queries.captured_queries:
+            self.assertNotIn('authtoken_token', query['sql'])
+            self.assertNotIn('coderr_profile', query['sql'])
+
+    def test_revocation_in_another_process_is_seen(self):
+        """Testet, dass ein in einem anderen Prozess gelöschtes Token sofort abgelehnt wird."""
+        self.client.get('/api/offers/')
+        # Ein anderer Worker löscht das Token; der Eintrag dieses Prozesses bleibt bestehen.
+        key = self.token.key
+        entry = token_cache.get(key)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.token.delete()
+        token_cache.set(key, entry)
+        self.assertEqual(self.client.get('/api/offers/').status_code, status.HTTP_403_FORBIDDEN)
+        self.assertIsNone(token_cache.get(key))
+
+    def test_changes_in_another_process_reload_the_entry(self):
+        """Testet, dass Änderungen an Benutzer und Profil in einem anderen Prozess den Eintrag neu laden."""
+        self.client.get('/api/offers/')
+        entry = token_cache.get(self.token.key)
+        self.user.first_name = 'Changed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        token_cache.set(self.token.key, entry)
+        user, _ = CachedTokenAuthentication().authenticate_credentials(self.token.key)
+        self.assertEqual(user.first_name, 'Changed')
+
+        entry = token_cache.get(self.token.key)
+        profile = Profile.objects.get(user=self.user)
+        profile.type = 'customer'
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+        token_cache.set(self.token.key, entry)
+        response = self.client.post('/api/offers/', {'title': 'Offer', 'details': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_discard_user_only_touches_own_entries(self):
+        """Testet, dass discard_user nur die Einträge des Benutzers entfernt."""
+        other = Token.objects.create(user=User.objects.create_user(username='other', password='x'))
+        for token in (self.token, other):
+            self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+            self.client.get('/api/offers/')
+        token_cache.discard_user(self.user.pk)
+        self.assertIsNone(token_cache.get(self.token.key))
+        self.assertIsNotNone(token_cache.get(other.key))
+        self.assertEqual(len(token_cache), 1)
+
+    def test_logout_revokes_token(self):
+        """Testet, dass nach dem Logout das gecachte Token nicht mehr akzeptiert wird."""
+        self.client.get('/api/offers/')
+        response = self.client.post('/api/logout/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Token.objects.filter(key=self.token.key).exists())
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_password_change_and_deletion_revoke_token(self):
+        """Testet, dass Passwortänderung und Löschen des Benutzers das Token ungültig machen."""
+        self.client.get('/api/offers/')
+        self.user.set_password('newpassword')
+        self.user.save()
+        self.assertEqual(self.client.get('/api/offers/').status_code, status.HTTP_403_FORBIDDEN)
+
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.client.get('/api/offers/')
+        self.user.delete()
+        self.assertEqual(self.client.get('/api/offers/').status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_user_changes_are_visible(self):
+        """Testet, dass Änderungen an Benutzer und Profil den Cache-Eintrag verwerfen."""
+        self.client.get('/api/offers/')
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/offers/').status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_active = True
+        self.user.save()
+        profile = Profile.objects.get(user=self.user)
+        profile.type = 'customer'
+        profile.save()
+        response = self.client.post('/api/offers/', {'title': 'Offer', 'details': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_expired_token_is_rejected_and_rotated_on_login(self):
+        """Testet, dass abgelaufene Tokens abgelehnt und beim Login ersetzt werden."""
+        Token.objects.filter(key=self.token.key).update(created=timezone.now() - timedelta(days=30))
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.credentials()
+        response = self.client.post('/api/login/', {'username': 'testuser', 'password': 'testpassword'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data['token'], self.token.key)
+        self.assertEqual(list(Token.objects.filter(user=self.user).values_list('key', flat=True)), [response.data['token']])
+
+    def test_fresh_token_is_reused_on_login(self):
+        """Testet, dass ein junges Token beim Login weiterverwendet wird."""
+        response = self.client.post('/api/login/', {'username': 'testuser', 'password': 'testpassword'})
+        self.assertEqual(response.data['token'], self.token.key)
@@ -0,0 +1,39 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from benchmarks.dataset import seed
+from benchmarks.endpoints import ENDPOINTS, check_coverage, compare
+from coderr.models import OfferDetail, Offers, Order, Profile, Review
+
+
+class BenchmarkSuiteTestCase(TestCase):
+
+    def test_seed_is_reproducible(self):
+        """Testet, dass seed() den Bestand vollständig und bei gleichem random_seed identisch anlegt."""
+        kwargs = {'businesses': 3, 'offers_per_business': 2, 'customers': 4,
+                  'reviews_per_customer': 2, 'orders_per_customer': 3}
+        tokens = seed(**kwargs)
+        self.assertEqual(Profile.objects.count(), 7)
+        self.assertEqual(Offers.objects.filter(min_price__isnull=False).count(), 6)
+        self.assertEqual(OfferDetail.objects.count(), 18)
+        self.assertEqual(Review.objects.count(), 8)
+        self.assertEqual(Order.objects.exclude(business_user=None).count(), 12)
+        first = list(Order.objects.order_by('pk').values_list('offer_detail__offer__title', 'status'))
+
+        User.objects.all().delete()
+        self.assertEqual(seed(**kwargs), tokens)
+        self.assertEqual(list(Order.objects.order_by('pk').values_list('offer_detail__offer__title', 'status')), first)
+
+    def test_every_api_route_is_benchmarked(self):
+        """Testet, dass benchmarks.endpoints jeden Eintrag aus coderr/api/urls.py misst."""
+        check_coverage(ENDPOINTS)
+
+    def test_compare_flags_regressions(self):
+        """Testet, dass mehr Abfragen sofort und Latenz/Speicher erst über der Toleranz als Regression gelten."""
+        baseline = {'GET offers-list': {'p95_ms': 10.0, 'queries': 3, 'peak_kib': 100.0}}
+        within = {'GET offers-list': {'p95_ms': 13.0, 'queries': 3, 'peak_kib': 150.0}}
+        worse = {'GET offers-list': {'p95_ms': 20.0, 'queries': 4, 'peak_kib': 100.0},
+                 'GET base-info': {'p95_ms': 1.0, 'queries': 9, 'peak_kib': 1.0}}
+        self.assertEqual(compare(within, baseline, 0.25), {})
+        self.assertEqual(compare(worse, baseline, 0.25), {
+            'GET offers-list': ['queries 3 -> 4', 'p95_ms 10.0 -> 20.0'],
+        })
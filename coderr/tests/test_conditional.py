@@ -0,0 +1,98 @@
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.views import APIView
+from coderr.api.conditional import ConditionalGetMixin
+from coderr.models import Offers, OfferDetail, Profile, Order, Review
+
+
+class ConditionalGetTestCase(APITestCase):
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(
+            username="business_user", password="password123"
+        )
+        self.customer_user = User.objects.create_user(
+            username="customer_user", password="password123"
+        )
+        Profile.objects.create(user=self.business_user, type='business')
+        Profile.objects.create(user=self.customer_user, type='customer')
+
+        self.offer = Offers.objects.create(user=self.business_user, title="Offer")
+        self.detail = OfferDetail.objects.create(
+            offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=5,
+            price=100, features=[], offer_type='basic'
+        )
+        self.order = Order.objects.create(
+            customer_user=self.customer_user, business_user=self.business_user, offer_detail=self.detail
+        )
+        self.review = Review.objects.create(
+            business_user=self.business_user, reviewer=self.customer_user, rating=4
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.customer_user)
+
+    def assertNotModified(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached.content, b'')
+        return response['ETag']
+
+    def assertModified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_all_detail_endpoints_support_if_none_match(self):
+        """Testet, dass alle Detail-Endpunkte mit passendem ETag 304 liefern."""
+        for url in (
+            f'/api/offers/{self.offer.id}/',
+            f'/api/offerdetails/{self.detail.id}/',
+            f'/api/profile/{self.business_user.id}/',
+            f'/api/orders/{self.order.id}/',
+            f'/api/reviews/{self.review.id}/',
+        ):
+            with self.subTest(url=url):
+                self.assertNotModified(url)
+
+    def test_offer_etag_changes_with_details_and_owner(self):
+        """Testet, dass sich das ETag eines Angebots bei Änderungen an Details oder Anbieter ändert."""
+        url = f'/api/offers/{self.offer.id}/'
+        etag = self.assertNotModified(url)
+        self.detail.price = 80
+        self.detail.save()
+        self.assertModified(url, etag)
+
+        etag = self.assertNotModified(url)
+        self.business_user.first_name = "Neu"
+        self.business_user.save()
+        self.assertModified(url, etag)
+
+    def test_order_etag_changes_with_status(self):
+        """Testet, dass eine Statusänderung die Bestellung als geändert markiert."""
+        url = f'/api/orders/{self.order.id}/'
+        etag = self.assertNotModified(url)
+        self.order.status = 'completed'
+        self.order.save()
+        self.assertModified(url, etag)
+
+    def test_missing_object_returns_404(self):
+        """Testet, dass nicht vorhandene Objekte weiterhin 404 liefern."""
+        response = self.client.get('/api/reviews/999/', HTTP_IF_NONE_MATCH='W/"abc"')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_views_without_version_are_rejected_at_class_creation(self):
+        """Testet, dass eine View ohne queryset und ohne get_version nicht angelegt werden kann."""
+        with self.assertRaises(ImproperlyConfigured):
+            type('BrokenView', (ConditionalGetMixin, APIView), {})
+        view = type('OfferDetailVersionView', (ConditionalGetMixin, APIView), {'queryset': OfferDetail.objects.all()})
+        detail = OfferDetail.objects.first()
+        self.assertEqual(view().get_version(detail.pk), (detail.updated_at,))
@@ -0,0 +1,84 @@
+from unittest import mock, skipUnless
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from coderr_app.database import TUNED_SQLITE_ENGINE, check_connection_health, parse_database_url
+
+
+class DatabaseUrlTestCase(SimpleTestCase):
+
+    def test_postgres_url(self):
+        """Testet, dass eine Postgres-URL samt Optionen und Verbindungsdauer übernommen wird."""
+        config = parse_database_url(
+            'postgres://coderr:p%40ss@db:5433/coderrdb?sslmode=require&connect_timeout=5', conn_max_age=60
+        )
+        self.assertEqual(config['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(config['NAME'], 'coderrdb')
+        self.assertEqual(config['USER'], 'coderr')
+        self.assertEqual(config['PASSWORD'], 'p@ss')
+        self.assertEqual(config['HOST'], 'db')
+        self.assertEqual(config['PORT'], '5433')
+        self.assertEqual(config['CONN_MAX_AGE'], 60)
+        self.assertEqual(config['OPTIONS'], {'sslmode': 'require', 'connect_timeout': 5})
+        self.assertNotIn('DISABLE_SERVER_SIDE_CURSORS', config)
+
+    def test_pgbouncer_pool_disables_server_side_cursors(self):
+        """Testet, dass DB_POOL=pgbouncer serverseitige Cursor abschaltet."""
+        config = parse_database_url('postgres://u:p@pgbouncer:6432/coderrdb', pool='pgbouncer')
+        self.assertTrue(config['DISABLE_SERVER_SIDE_CURSORS'])
+        with self.assertRaises(ValueError):
+            parse_database_url('postgres://u:p@db/coderrdb', pool='unknown')
+
+    def test_sqlite_urls(self):
+        """Testet relative, absolute und In-Memory-SQLite-URLs sowie unbekannte Schemata."""
+        self.assertEqual(parse_database_url('sqlite:///db.sqlite3')['NAME'], 'db.sqlite3')
+        self.assertEqual(parse_database_url('sqlite:////srv/app/db.sqlite3')['NAME'], '/srv/app/db.sqlite3')
+        self.assertEqual(parse_database_url('sqlite://:memory:')['NAME'], ':memory:')
+        with self.assertRaises(ValueError):
+            parse_database_url('mysql://u:p@db/coderr')
+
+    def test_tuned_sqlite_uses_custom_backend_with_pragmas(self):
+        """Testet, dass der SQLite-Produktionsmodus Backend, Pragmas und BEGIN IMMEDIATE setzt."""
+        config = parse_database_url('sqlite:///db.sqlite3', sqlite_tuned=True)
+        self.assertEqual(config['ENGINE'], TUNED_SQLITE_ENGINE)
+        self.assertEqual(config['PRAGMAS']['journal_mode'], 'WAL')
+        self.assertEqual(config['PRAGMAS']['synchronous'], 'NORMAL')
+        self.assertEqual(config['TRANSACTION_MODE'], 'IMMEDIATE')
+        self.assertNotIn('PRAGMAS', parse_database_url('sqlite:///db.sqlite3'))
+
+
+@skipUnless(connection.settings_dict['ENGINE'] == TUNED_SQLITE_ENGINE, 'Nur mit DB_SQLITE_TUNED')
+class TunedSqliteTestCase(TransactionTestCase):
+
+    def test_pragmas_are_applied_on_connect(self):
+        """Testet, dass jede neue Verbindung die konfigurierten Pragmas erhält."""
+        connection.close()
+        with connection.cursor() as cursor:
+            for name, value in connection.settings_dict['PRAGMAS'].items():
+                if name in ('busy_timeout', 'cache_size'):
+                    cursor.execute(f'PRAGMA {name}')
+                    self.assertEqual(cursor.fetchone()[0], value)
+
+    def test_transactions_begin_immediate(self):
+        """Testet, dass Transaktionen die Schreibsperre sofort mit BEGIN IMMEDIATE anfordern."""
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                pass
+        self.assertEqual(queries[0]['sql'], 'BEGIN IMMEDIATE')
+
+
+class ConnectionHealthTestCase(TransactionTestCase):
+
+    def test_unusable_connection_is_closed(self):
+        """Testet, dass eine nicht mehr benutzbare persistente Verbindung vor dem Request geschlossen wird."""
+        connection.ensure_connection()
+        with mock.patch.object(connection, 'is_usable', return_value=False):
+            with mock.patch.object(connection, 'close') as close:
+                check_connection_health()
+        close.assert_called_once()
+
+    def test_usable_connection_is_kept(self):
+        """Testet, dass eine benutzbare Verbindung offen bleibt."""
+        connection.ensure_connection()
+        check_connection_health()
+        self.assertIsNotNone(connection.connection)
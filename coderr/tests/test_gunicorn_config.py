@@ -0,0 +1,40 @@
+import os
+import runpy
+from pathlib import Path
+from unittest import mock
+from django.test import SimpleTestCase
+
+CONFIG = Path(__file__).resolve().parents[2] / 'gunicorn.conf.py'
+
+
+class GunicornConfigTestCase(SimpleTestCase):
+
+    def load(self, **env):
+        with mock.patch.dict('os.environ'), mock.patch('multiprocessing.cpu_count', return_value=4):
+            for name in [name for name in os.environ if name.startswith('GUNICORN_') or name == 'WEB_CONCURRENCY']:
+                del os.environ[name]
+            os.environ.update(env)
+            return runpy.run_path(str(CONFIG))
+
+    def test_sync_workers_from_cpu_count(self):
+        """Testet, dass der Sync-Modus 2 x CPU + 1 Worker ohne Threads startet und die App vorlädt."""
+        config = self.load(GUNICORN_WORKER_CLASS='sync')
+        self.assertEqual(config['worker_class'], 'sync')
+        self.assertEqual(config['workers'], 9)
+        self.assertEqual(config['threads'], 1)
+        self.assertTrue(config['preload_app'])
+        self.assertEqual(config['max_requests'], 1000)
+        self.assertEqual(config['max_requests_jitter'], 100)
+
+    def test_gthread_mode_and_overrides(self):
+        """Testet den gthread-Modus und das Überschreiben über Umgebungsvariablen."""
+        config = self.load(GUNICORN_WORKER_CLASS='gthread', GUNICORN_THREADS='8', WEB_CONCURRENCY='3')
+        self.assertEqual(config['worker_class'], 'gthread')
+        self.assertEqual(config['workers'], 3)
+        self.assertEqual(config['threads'], 8)
+        self.assertEqual(self.load(GUNICORN_WORKER_CLASS='gthread')['workers'], 5)
+
+    def test_unknown_worker_class_is_rejected(self):
+        """Testet, dass ein unbekannter Worker-Typ beim Start abgelehnt wird."""
+        with self.assertRaises(ValueError):
+            self.load(GUNICORN_WORKER_CLASS='eventlet')
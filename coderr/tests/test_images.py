@@ -0,0 +1,193 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
+from PIL import Image
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth.models import User
+from coderr.jobs import run_pending
+from coderr.models import Offers, Profile, Job
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_upload(name='photo.jpg', size=(2000, 1000), orientation=None):
+    image = Image.new('RGB', size, (200, 30, 30))
+    exif = Image.Exif()
+    exif[0x010F] = 'Camera Maker'
+    if orientation:
+        exif[0x0112] = orientation
+    buffer = BytesIO()
+    image.save(buffer, 'JPEG', exif=exif.tobytes())
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    IMAGE_VARIANT_SIZES={'thumbnail': (160, 160), 'medium': (800, 800)},
+)
+class ImageVariantsTestCase(APITestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        caches[settings.OFFER_LIST_CACHE_ALIAS].clear()
+        self.business_user = User.objects.create_user(
+            username="business_user", password="password123"
+        )
+        self.profile = Profile.objects.create(user=self.business_user, type='business')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.business_user)
+
+    def open_variant(self, path):
+        return Image.open(f'{MEDIA_ROOT}/{path}')
+
+    def test_variants_are_generated_on_upload(self):
+        """Testet, dass beim Speichern verkleinerte WebP- und JPEG-Varianten ohne Metadaten entstehen."""
+        offer = Offers.objects.create(user=self.business_user, title="Offer", image=make_upload())
+        run_pending()
+        variants = Offers.objects.get(pk=offer.pk).image_variants
+        self.assertEqual(variants['status'], 'ready')
+
+        self.assertEqual(variants['source'], offer.image.name)
+        self.assertEqual((variants['thumbnail']['width'], variants['thumbnail']['height']), (160, 80))
+        self.assertEqual((variants['medium']['width'], variants['medium']['height']), (800, 400))
+        for fmt, pil_format in (('webp', 'WEBP'), ('jpeg', 'JPEG')):
+            path = variants['thumbnail'][fmt]
+            self.assertRegex(path, rf'^offers_pictures/variants/[0-9a-f]{{20}}\.{fmt}$')
+            with self.open_variant(path) as image:
+                self.assertEqual(image.format, pil_format)
+                self.assertEqual(image.size, (160, 80))
+                self.assertFalse(image.getexif())
+                self.assertNotIn('icc_profile', image.info)
+
+    def test_exif_orientation_is_applied(self):
+        """Testet, dass die EXIF-Ausrichtung vor dem Verkleinern angewendet wird."""
+        offer = Offers.objects.create(
+            user=self.business_user, title="Rotated", image=make_upload(orientation=6)
+        )
+        run_pending()
+        thumbnail = Offers.objects.get(pk=offer.pk).image_variants['thumbnail']
+        self.assertEqual((thumbnail['width'], thumbnail['height']), (80, 160))
+
+    def test_identical_content_shares_the_file(self):
+        """Testet, dass gleiche Varianten über den Inhalts-Hash denselben Dateinamen erhalten."""
+        first = Offers.objects.create(user=self.business_user, title="A", image=make_upload('a.jpg'))
+        second = Offers.objects.create(user=self.business_user, title="B", image=make_upload('b.jpg'))
+        run_pending()
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertNotEqual(first.image.name, second.image.name)
+        self.assertEqual(first.image_variants['medium'], second.image_variants['medium'])
+
+    def test_serializers_expose_variant_urls(self):
+        """Testet, dass Angebots- und Profil-Endpunkte die URLs der Varianten liefern."""
+        offer = Offers.objects.create(user=self.business_user, title="Offer", image=make_upload())
+        self.profile.file = make_upload('avatar.jpg', size=(600, 600))
+        self.profile.save()
+        run_pending()
+
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        variants = response.data['results'][0]['image_variants']
+        self.assertTrue(variants['thumbnail']['webp'].startswith('http://testserver/media/offers_pictures/variants/'))
+        self.assertEqual(variants['thumbnail']['width'], 160)
+
+        response = self.client.get('/api/profiles/business/')
+        profile_data = response.data[0] if isinstance(response.data, list) else response.data['results'][0]
+        self.assertEqual(profile_data['file_variants']['thumbnail']['width'], 160)
+        self.assertTrue(profile_data['file_variants']['thumbnail']['jpeg'].endswith('.jpeg'))
+        self.assertEqual(Offers.objects.get(pk=offer.pk).image_variants['source'], offer.image.name)
+
+    @override_settings(JOB_MAX_ATTEMPTS=2)
+    def test_missing_file_is_retried_and_backfilled(self):
+        """Testet, dass fehlende Dateien den Job wiederholen, danach 'failed' speichern und der Befehl nachträglich Varianten erzeugt."""
+        offer = Offers.objects.create(user=self.business_user, title="Offer", image='offers_pictures/missing.jpg')
+        with self.assertLogs('coderr.jobs', 'WARNING'):
+            run_pending()
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), ('pending', 1))
+        self.assertIn('FileNotFoundError', job.last_error)
+        offer.refresh_from_db()
+        self.assertEqual(offer.image_variants['status'], 'pending')
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        with self.assertLogs('coderr.jobs', 'ERROR'):
+            run_pending()
+        self.assertEqual(Job.objects.get().status, 'failed')
+        offer.refresh_from_db()
+        self.assertEqual(offer.image_variants, {'source': 'offers_pictures/missing.jpg', 'status': 'failed'})
+
+        Offers.objects.filter(pk=offer.pk).update(image_variants={})
+        upload = make_upload()
+        offer.image.storage.save('offers_pictures/backfill.jpg', upload)
+        Offers.objects.filter(pk=offer.pk).update(image='offers_pictures/backfill.jpg')
+
+        out = StringIO()
+        call_command('generate_image_variants', model=['offers'], stdout=out)
+        self.assertIn('offers: 1 Bilder verarbeitet', out.getvalue())
+        offer.refresh_from_db()
+        self.assertEqual(offer.image_variants['thumbnail']['width'], 160)
+
+        out = StringIO()
+        call_command('generate_image_variants', stdout=out)
+        self.assertIn('offers: 0 Bilder verarbeitet', out.getvalue())
+
+    def test_original_is_served_until_variants_are_ready(self):
+        """Testet, dass bis zur Bearbeitung durch den Worker das Original ausgeliefert wird."""
+        offer = Offers.objects.create(user=self.business_user, title="Offer", image=make_upload())
+        job = Job.objects.get()
+        self.assertEqual((job.kind, job.status), ('image_variants', 'pending'))
+
+        response = self.client.get(f'/api/offers/{offer.id}/')
+        variants = response.data['image_variants']
+        self.assertEqual(variants['status'], 'pending')
+        self.assertEqual(variants['thumbnail']['webp'], response.data['image'])
+        self.assertIsNone(variants['thumbnail']['width'])
+
+        out = StringIO()
+        call_command('run_worker', processes=0, once=True, stdout=out)
+        self.assertIn('1 Jobs bearbeitet', out.getvalue())
+        response = self.client.get('/api/offers/')
+        variants = response.data['results'][0]['image_variants']
+        self.assertEqual(variants['status'], 'ready')
+        self.assertTrue(variants['thumbnail']['webp'].endswith('.webp'))
+
+    @override_settings(IMAGE_VARIANTS_ASYNC=False)
+    def test_synchronous_mode_without_worker(self):
+        """Testet, dass IMAGE_VARIANTS_ASYNC=False die Varianten direkt erzeugt."""
+        offer = Offers.objects.create(user=self.business_user, title="Offer", image=make_upload())
+        offer.refresh_from_db()
+        self.assertEqual(offer.image_variants['status'], 'ready')
+        self.assertFalse(Job.objects.exists())
+
+    def test_etag_changes_when_variants_are_ready(self):
+        """Testet, dass ein Client mit dem ETag des Zwischenstands nach dem Worker-Lauf die neue Version erhält."""
+        offer = Offers.objects.create(user=self.business_user, title="Offer", image=make_upload())
+        response = self.client.get(f'/api/offers/{offer.id}/')
+        self.assertEqual(response.data['image_variants']['status'], 'pending')
+        etag = response['ETag']
+
+        run_pending()
+        response = self.client.get(f'/api/offers/{offer.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['image_variants']['status'], 'ready')
+        self.assertNotEqual(response['ETag'], etag)
+
+    @override_settings(IMAGE_VARIANTS_ASYNC=False)
+    def test_decompression_bomb_is_marked_failed(self):
+        """Testet, dass Bilder über dem Pixel-Limit von Pillow als 'failed' gespeichert werden."""
+        with mock.patch.object(Image, 'MAX_IMAGE_PIXELS', 1000), self.assertLogs('coderr.images', 'WARNING'):
+            offer = Offers.objects.create(user=self.business_user, title="Bomb", image=make_upload())
+        offer.refresh_from_db()
+        self.assertEqual(offer.image_variants, {'source': offer.image.name, 'status': 'failed'})
@@ -0,0 +1,110 @@
+import json
+from io import StringIO
+from tempfile import NamedTemporaryFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth.models import User
+from coderr.models import Offers, OfferDetail, Profile
+
+
+def offer_row(index, price=100):
+    return {
+        "title": f"Offer {index}",
+        "description": "Imported",
+        "details": [
+            {"title": "Basic", "revisions": 1, "delivery_time_in_days": 7,
+             "price": price, "features": ["A"], "offer_type": "basic"},
+            {"title": "Premium", "revisions": 3, "delivery_time_in_days": 2,
+             "price": price * 3, "features": ["A", "B"], "offer_type": "premium"},
+        ],
+    }
+
+
+def jsonl(rows):
+    return "\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows) + "\n"
+
+
+class OfferImportTestCase(APITestCase):
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(
+            username="business_user", password="password123"
+        )
+        self.customer_user = User.objects.create_user(
+            username="customer_user", password="password123"
+        )
+        Profile.objects.create(user=self.business_user, type='business')
+        Profile.objects.create(user=self.customer_user, type='customer')
+        self.client = APIClient()
+
+    def post_lines(self, body):
+        return self.client.post('/api/offers/import/', data=body, content_type='application/x-ndjson')
+
+    def test_endpoint_imports_offers_with_details_and_min_values(self):
+        """Testet, dass der Endpunkt Angebote samt Details und Mindestwerten anlegt."""
+        self.client.force_authenticate(user=self.business_user)
+        response = self.post_lines(jsonl([offer_row(i, price=10 + i) for i in range(5)]))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 5)
+        self.assertEqual(response.data['error_count'], 0)
+
+        offers = Offers.objects.filter(user=self.business_user).order_by('pk')
+        self.assertEqual(offers.count(), 5)
+        self.assertEqual(OfferDetail.objects.filter(offer__in=offers).count(), 10)
+        first = offers.first()
+        self.assertEqual(first.title, "Offer 0")
+        self.assertEqual(first.min_price, 10)
+        self.assertEqual(first.min_delivery_time, 2)
+        self.assertEqual(
+            sorted(first.details.values_list('offer_type', flat=True)), ['basic', 'premium']
+        )
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        """Testet, dass fehlerhafte Zeilen mit Zeilennummer gemeldet und übersprungen werden."""
+        self.client.force_authenticate(user=self.business_user)
+        bad_detail = offer_row(2)
+        bad_detail['details'][0]['offer_type'] = 'gold'
+        bad_detail['details'][1]['price'] = 'abc'
+        rows = [offer_row(1), '{"title": broken', '', bad_detail, {"title": "No details"}, offer_row(3)]
+        response = self.post_lines(jsonl(rows))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['error_count'], 3)
+        errors = {error['line']: error['errors'] for error in response.data['errors']}
+        self.assertEqual(sorted(errors), [2, 4, 5])
+        self.assertIn('offer_type', errors[4]['details'][0])
+        self.assertIn('price', errors[4]['details'][1])
+        self.assertIn('details', errors[5])
+        self.assertEqual(
+            list(Offers.objects.order_by('pk').values_list('title', flat=True)), ["Offer 1", "Offer 3"]
+        )
+
+    def test_only_business_users_can_import(self):
+        """Testet, dass nur Geschäftsnutzer importieren dürfen."""
+        self.client.force_authenticate(user=self.customer_user)
+        response = self.post_lines(jsonl([offer_row(1)]))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Offers.objects.exists())
+
+    def test_command_writes_in_batches(self):
+        """Testet, dass der Befehl in Batches schreibt und die IDs korrekt zuordnet."""
+        Offers.objects.create(user=self.customer_user, title="Existing")
+        with NamedTemporaryFile('w', suffix='.jsonl') as handle:
+            handle.write(jsonl([offer_row(i, price=i + 1) for i in range(7)]))
+            handle.flush()
+            out = StringIO()
+            call_command('import_offers', handle.name, user='business_user', batch_size=3, stdout=out)
+
+        self.assertIn('7 Angebote importiert', out.getvalue())
+        for offer in Offers.objects.filter(user=self.business_user):
+            index = int(offer.title.split()[-1])
+            self.assertEqual(offer.details.count(), 2)
+            self.assertEqual(offer.min_price, index + 1)
+
+    def test_command_rejects_non_business_user(self):
+        """Testet, dass der Befehl nur für Geschäftsnutzer läuft."""
+        with self.assertRaises(CommandError):
+            call_command('import_offers', '-', user='customer_user', stdout=StringIO())
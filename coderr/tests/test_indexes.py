@@ -0,0 +1,58 @@
+from unittest import skipUnless
+from django.db import connection
+from django.db.models import Q, Min
+from django.test import TestCase
+from coderr.models import Offers, OfferDetail, Order, Review, Profile
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN-Ausgabe von SQLite erwartet.')
+class QueryPlanIndexTestCase(TestCase):
+    """
+    Prüft mit EXPLAIN, dass die Abfragen der Filter- und Zählpfade die passenden Indizes verwenden.
+    """
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(f'INDEX {index_name}', plan, plan)
+
+    def test_offers_by_creator_ordered_by_update(self):
+        """OffersFilter creator_id bzw. eigene Angebote mit Sortierung nach updated_at."""
+        self.assertUsesIndex(Offers.objects.filter(user__id=1).order_by('updated_at'), 'offers_user_updated_idx')
+
+    def test_offers_catalogue_cursor_order(self):
+        """Öffentlicher Katalog mit Cursor-Sortierung (updated_at, id)."""
+        self.assertUsesIndex(Offers.objects.order_by('updated_at', 'id')[:7], 'offers_updated_id_idx')
+
+    def test_offer_detail_min_price_per_offer(self):
+        """Neuberechnung von min_price pro Angebot."""
+        queryset = OfferDetail.objects.filter(offer_id=1).values('offer').annotate(value=Min('price'))
+        self.assertUsesIndex(queryset, 'offerdetail_offer_price_idx')
+
+    def test_offer_detail_min_delivery_time_per_offer(self):
+        """Neuberechnung von min_delivery_time pro Angebot."""
+        queryset = OfferDetail.objects.filter(offer_id=1).values('offer').annotate(
+            value=Min('delivery_time_in_days')
+        )
+        self.assertUsesIndex(queryset, 'offerdetail_offer_dtime_idx')
+
+    def test_order_counts_for_business_user(self):
+        """OrderCountView und OrderCountCompletedView."""
+        self.assertUsesIndex(Order.objects.filter(business_user=1), 'order_business_status_idx')
+        self.assertUsesIndex(
+            Order.objects.filter(business_user=1, status='completed'), 'order_business_status_idx'
+        )
+
+    def test_order_list_for_user(self):
+        """OrderListView filtert Kunde ODER Geschäftsnutzer."""
+        queryset = Order.objects.filter(Q(customer_user=1) | Q(business_user=1))
+        self.assertUsesIndex(queryset, 'order_customer_created_idx')
+        self.assertUsesIndex(queryset, 'order_business_status_idx')
+
+    def test_reviews_for_business_user(self):
+        """ReviewFilter business_user_id mit Sortierung nach updated_at."""
+        queryset = Review.objects.filter(business_user_id=1).order_by('updated_at')
+        self.assertUsesIndex(queryset, 'review_business_updated_idx')
+
+    def test_profiles_by_type(self):
+        """Business- und Kundenprofillisten."""
+        self.assertUsesIndex(Profile.objects.filter(type='business'), 'profile_type_idx')
@@ -0,0 +1,130 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from coderr import jobs
+from coderr.management.commands.run_worker import work
+from coderr.models import Job
+
+calls = []
+failures = []
+
+
+@jobs.register('test-record')
+def record(value):
+    calls.append(value)
+
+
+@jobs.register('test-fail', on_failure=lambda **payload: failures.append(payload))
+def fail(**payload):
+    raise RuntimeError('boom')
+
+
+@override_settings(JOB_MAX_ATTEMPTS=3, JOB_RETRY_BACKOFF=10)
+class JobQueueTestCase(TestCase):
+
+    def setUp(self):
+        calls.clear()
+        failures.clear()
+
+    def make_due(self, job):
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+
+    def test_jobs_run_in_order_and_are_marked_done(self):
+        """Testet, dass fällige Jobs der Reihe nach ausgeführt und als erledigt markiert werden."""
+        first = jobs.enqueue('test-record', value=1)
+        second = jobs.enqueue('test-record', value=2)
+        later = jobs.enqueue('test-record', value=3)
+        Job.objects.filter(pk=later.pk).update(run_after=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(jobs.run_pending(), 2)
+        self.assertEqual(calls, [1, 2])
+        for job in (first, second):
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts, job.locked_by), ('done', 1, ''))
+        later.refresh_from_db()
+        self.assertEqual(later.status, 'pending')
+
+    def test_claim_is_exclusive(self):
+        """Testet, dass ein Job nur von einem Worker reserviert werden kann."""
+        job = jobs.enqueue('test-record', value=1)
+        claimed = jobs.claim('worker-a')
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.locked_by, 'worker-a')
+        self.assertIsNone(jobs.claim('worker-b'))
+
+    def test_failed_job_is_retried_with_backoff(self):
+        """Testet, dass fehlgeschlagene Jobs mit wachsender Wartezeit wiederholt und dann aufgegeben werden."""
+        job = jobs.enqueue('test-fail')
+        delays = []
+        for attempt in (1, 2):
+            before = timezone.now()
+            with self.assertLogs('coderr.jobs', 'WARNING'):
+                jobs.run_pending()
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts), ('pending', attempt))
+            self.assertIn('RuntimeError: boom', job.last_error)
+            delays.append(round((job.run_after - before).total_seconds()))
+            self.assertEqual(jobs.run_pending(), 0)
+            self.make_due(job)
+        self.assertEqual(delays, [10, 20])
+
+        with self.assertLogs('coderr.jobs', 'ERROR'):
+            jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 3))
+        self.assertEqual(failures, [{}])
+
+    def test_unknown_kind_fails_immediately(self):
+        """Testet, dass Jobs ohne Handler sofort als fehlgeschlagen markiert werden."""
+        job = jobs.enqueue('does-not-exist')
+        with self.assertLogs('coderr.jobs', 'ERROR'):
+            jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+
+    def test_stale_jobs_are_requeued(self):
+        """Testet, dass Jobs abgestürzter Worker mit Wartezeit wieder freigegeben werden."""
+        job = jobs.enqueue('test-record', value=1)
+        jobs.claim('crashed')
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+        before = timezone.now()
+        with self.assertLogs('coderr.jobs', 'WARNING'):
+            self.assertEqual(jobs.requeue_stale(timeout=60), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), ('pending', ''))
+        self.assertIn('crashed', job.last_error)
+        self.assertEqual(round((job.run_after - before).total_seconds()), 10)
+        self.assertEqual(jobs.run_pending(), 0)
+        self.make_due(job)
+        self.assertEqual(jobs.run_pending(), 1)
+        self.assertEqual(calls, [1])
+
+    def test_job_that_keeps_crashing_its_worker_fails(self):
+        """Testet, dass ein hängender Job nach max_attempts als fehlgeschlagen markiert und nicht erneut eingeplant wird."""
+        job = jobs.enqueue('test-fail', max_attempts=2)
+        for attempt in (1, 2):
+            self.make_due(job)
+            self.assertEqual(jobs.claim('crashed').pk, job.pk)
+            Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+            with self.assertLogs('coderr.jobs', 'WARNING'):
+                jobs.requeue_stale(timeout=60)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_by), ('failed', 2, ''))
+        self.assertIn('crashed', job.last_error)
+        self.assertEqual(failures, [{}])
+        self.make_due(job)
+        self.assertEqual(jobs.run_pending(), 0)
+
+    @override_settings(JOB_STALE_TIMEOUT=60)
+    def test_worker_loop_requeues_stale_jobs(self):
+        """Testet, dass die Arbeitsschleife des Workers hängende Jobs selbst wieder freigibt."""
+        job = jobs.enqueue('test-record', value=1)
+        jobs.claim('crashed')
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+        with self.assertLogs('coderr.jobs', 'WARNING'):
+            self.assertEqual(work(poll_interval=0, once=True), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'pending')
+        self.make_due(job)
+        self.assertEqual(work(poll_interval=0, once=True), 1)
+        self.assertEqual(calls, [1])
@@ -0,0 +1,92 @@
+import os
+import re
+import tempfile
+from django.conf import settings
+from django.core.cache import caches
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APIClient
+from coderr.metrics import MetricsRegistry, RequestStats, registry
+from coderr.models import Offers, OfferDetail, Profile
+
+
+class MetricsTestCase(APITestCase):
+
+    def setUp(self):
+        caches[settings.OFFER_LIST_CACHE_ALIAS].clear()
+        handle, self.store = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(handle)
+        self.addCleanup(os.remove, self.store)
+        self.override = override_settings(METRICS_STORE=self.store, METRICS_FLUSH_INTERVAL=0)
+        self.override.enable()
+        self.addCleanup(self.override.disable)
+        registry.reset()
+
+        self.customer = User.objects.create_user(username="customer", password="password123")
+        Profile.objects.create(user=self.customer, type='customer')
+        self.staff = User.objects.create_user(username="staff", password="password123", is_staff=True)
+        business = User.objects.create_user(username="business", password="password123")
+        Profile.objects.create(user=business, type='business')
+        offer = Offers.objects.create(user=business, title="Offer", description="Text")
+        OfferDetail.objects.create(
+            offer=offer, title="Basic", revisions=1, delivery_time_in_days=3,
+            price=50, features=["A"], offer_type="basic",
+        )
+        self.client = APIClient()
+
+    def token_client(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        return client
+
+    def sample(self, text, name, le=None, **labels):
+        pairs = sorted(labels.items()) + ([('le', le)] if le else [])
+        label_text = ','.join(f'{key}="{value}"' for key, value in pairs)
+        match = re.search(rf'^{re.escape(name)}{{{re.escape(label_text)}}} (\S+)$', text, re.MULTILINE)
+        return float(match.group(1)) if match else None
+
+    def test_metrics_endpoint_reports_per_route_values(self):
+        """Testet, dass /metrics Requests, Latenz, Abfragen und Serializer-Zeit je Route ausgibt."""
+        self.token_client(self.customer).get('/api/offers/')
+        response = self.token_client(self.staff).get('/metrics')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = response.content.decode()
+
+        route = {'route': 'api/offers/', 'method': 'GET'}
+        self.assertEqual(self.sample(text, 'coderr_http_requests_total', status='200', **route), 1)
+        self.assertEqual(self.sample(text, 'coderr_http_request_duration_seconds_count', **route), 1)
+        self.assertEqual(self.sample(text, 'coderr_http_request_duration_seconds_bucket', le='+Inf', **route), 1)
+        self.assertGreater(self.sample(text, 'coderr_db_queries_total', **route), 0)
+        self.assertGreater(self.sample(text, 'coderr_db_duration_seconds_total', **route), 0)
+        self.assertGreater(self.sample(text, 'coderr_serializer_duration_seconds_total', **route), 0)
+        self.assertGreater(self.sample(text, 'coderr_http_response_size_bytes_sum', **route), 0)
+        self.assertIn('# TYPE coderr_http_request_duration_seconds histogram', text)
+
+    def test_metrics_endpoint_is_staff_only(self):
+        """Testet, dass nur Staff-Benutzer /metrics abrufen dürfen."""
+        response = self.token_client(self.customer).get('/metrics')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(METRICS_SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        """Testet, dass METRICS_SERVER_TIMING DB-, Serializer- und Gesamtzeit als Header ausgibt."""
+        response = self.token_client(self.customer).get('/api/offers/')
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", serializer;dur=[\d.]+, total;dur=[\d.]+$')
+
+    def test_workers_are_aggregated_through_the_store(self):
+        """Testet, dass die Werte mehrerer Prozesse (Registries) im gemeinsamen Speicher addiert werden."""
+        first, second = MetricsRegistry(), MetricsRegistry()
+        stats = RequestStats()
+        stats.queries = 3
+        first.record_request('api/reviews/', 'GET', 200, 0.02, 100, stats)
+        second.record_request('api/reviews/', 'GET', 200, 0.2, 100, stats)
+        first.flush()
+        text = second.render()
+        route = {'route': 'api/reviews/', 'method': 'GET'}
+        self.assertEqual(self.sample(text, 'coderr_http_requests_total', status='200', **route), 2)
+        self.assertEqual(self.sample(text, 'coderr_db_queries_total', **route), 6)
+        self.assertEqual(self.sample(text, 'coderr_http_request_duration_seconds_bucket', le='0.025', **route), 1)
+        self.assertEqual(self.sample(text, 'coderr_http_request_duration_seconds_bucket', le='0.25', **route), 2)
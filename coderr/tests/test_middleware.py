@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APIClient
+from coderr.models import Profile
+
+
+class MiddlewareProfileTestCase(APITestCase):
+
+    def setUp(self):
+        caches[settings.OFFER_LIST_CACHE_ALIAS].clear()
+        self.user = User.objects.create_user(username="business", password="password123")
+        Profile.objects.create(user=self.user, type='business')
+        self.token = Token.objects.create(user=self.user)
+        self.staff = User.objects.create_user(username="staff", password="password123", is_staff=True, is_superuser=True)
+
+    def test_token_api_request_skips_session_middleware(self):
+        """Testet, dass Token-Requests unter /api/ ohne Session, Messages und Clickjacking-Header laufen."""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        response = client.get('/api/offers/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(hasattr(response.wsgi_request, 'session'))
+        self.assertFalse(hasattr(response.wsgi_request, '_messages'))
+        self.assertNotIn('X-Frame-Options', response)
+        self.assertEqual(response.wsgi_request.user, self.user)
+
+    def test_session_api_request_keeps_csrf_and_session(self):
+        """Testet, dass Session-Requests an die API weiterhin Session und CSRF-Prüfung durchlaufen."""
+        client = APIClient(enforce_csrf_checks=True)
+        client.login(username="business", password="password123")
+        response = client.get('/api/offers/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(hasattr(response.wsgi_request, 'session'))
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+
+        response = client.post('/api/offers/', {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertIn('CSRF', str(response.data['detail']))
+
+    def test_admin_uses_session_profile(self):
+        """Testet, dass der Admin mit Session-Login unverändert funktioniert."""
+        self.client.login(username="staff", password="password123")
+        response = self.client.get('/admin/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
@@ -0,0 +1,124 @@
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.conf import settings
+from django.core.cache import caches
+from django.contrib.auth.models import User
+from coderr.cache import offer_list_cache
+from coderr.models import Offers, OfferDetail, Profile
+
+
+class OfferListCacheTestCase(APITestCase):
+
+    def setUp(self):
+        caches[settings.OFFER_LIST_CACHE_ALIAS].clear()
+        self.business_user = User.objects.create_user(
+            username="business_user", password="password123"
+        )
+        self.other_business_user = User.objects.create_user(
+            username="other_business_user", password="password123"
+        )
+        self.customer_user = User.objects.create_user(
+            username="customer_user", password="password123"
+        )
+        Profile.objects.create(user=self.business_user, type='business')
+        Profile.objects.create(user=self.other_business_user, type='business')
+        Profile.objects.create(user=self.customer_user, type='customer')
+
+        self.offer = Offers.objects.create(user=self.business_user, title="Own Offer")
+        self.detail = OfferDetail.objects.create(
+            offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=5,
+            price=100, features=[], offer_type='basic'
+        )
+        self.foreign_offer = Offers.objects.create(user=self.other_business_user, title="Foreign Offer")
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.customer_user)
+        offer_list_cache.reset_stats()
+
+    def test_repeated_request_is_served_from_cache(self):
+        """Testet, dass eine identische Anfrage ohne Datenbankzugriff beantwortet wird."""
+        first = self.client.get('/api/offers/?ordering=min_price&page_size=5')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/offers/?page_size=5&ordering=min_price')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(offer_list_cache.stats()['hits'], 1)
+        self.assertEqual(offer_list_cache.stats()['misses'], 1)
+
+    def test_orm_writes_invalidate(self):
+        """Testet, dass Änderungen an Angeboten und Details über das ORM den Cache verwerfen."""
+        self.client.get('/api/offers/')
+        self.offer.title = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer.save()
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn("Renamed", [offer['title'] for offer in response.data['results']])
+
+        self.detail.price = 10
+        with self.captureOnCommitCallbacks(execute=True):
+            self.detail.save()
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        prices = {offer['id']: offer['min_price'] for offer in response.data['results']}
+        self.assertEqual(prices[self.offer.id], 10)
+
+    def test_view_delete_invalidates(self):
+        """Testet, dass das Löschen über die API die Liste des Katalogs verwirft."""
+        self.client.get('/api/offers/')
+        self.client.force_authenticate(user=self.business_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/api/offers/{self.offer.id}/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.client.force_authenticate(user=self.customer_user)
+        response = self.client.get('/api/offers/')
+        self.assertEqual([offer['id'] for offer in response.data['results']], [self.foreign_offer.id])
+
+    def test_business_scope_is_separate(self):
+        """Testet, dass Geschäftsnutzer nur ihre eigenen, separat gecachten Angebote sehen."""
+        customer_response = self.client.get('/api/offers/')
+        self.assertEqual(customer_response.data['count'], 2)
+
+        self.client.force_authenticate(user=self.business_user)
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([offer['id'] for offer in response.data['results']], [self.offer.id])
+
+        self.client.force_authenticate(user=self.other_business_user)
+        response = self.client.get('/api/offers/')
+        self.assertEqual([offer['id'] for offer in response.data['results']], [self.foreign_offer.id])
+
+        # Eine Änderung eines anderen Anbieters verwirft den eigenen Bereich nicht.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer.save()
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_invalidation_reaches_other_processes(self):
+        """Testet, dass eine Invalidierung über die Generation im gemeinsamen Cache auch andere Prozesse erreicht."""
+        self.client.get('/api/offers/')
+        self.assertEqual(self.client.get('/api/offers/')['X-Cache'], 'HIT')
+        # So sieht es ein Worker, nachdem ein anderer Prozess invalidiert hat.
+        offer_list_cache.cache.set('offers:generation:public', 1, timeout=None)
+        self.assertEqual(self.client.get('/api/offers/')['X-Cache'], 'MISS')
+
+    def test_transaction_invalidates_after_commit(self):
+        """Testet, dass Schreibzugriffe in einer Transaktion erst nach dem Commit invalidieren."""
+        self.client.get('/api/offers/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer.save()
+            self.detail.save()
+            self.assertEqual(offer_list_cache.stats()['invalidations'], 0)
+            self.assertEqual(self.client.get('/api/offers/')['X-Cache'], 'HIT')
+        self.assertEqual(offer_list_cache.stats()['invalidations'], 2)
+        self.assertEqual(self.client.get('/api/offers/')['X-Cache'], 'MISS')
+
+    def test_scheme_is_part_of_the_key(self):
+        """Testet, dass HTTP- und HTTPS-Anfragen getrennt gecacht werden, da die Antworten absolute URLs enthalten."""
+        self.client.get('/api/offers/')
+        response = self.client.get('/api/offers/', secure=True)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        response = self.client.get('/api/offers/', secure=True)
+        self.assertEqual(response['X-Cache'], 'HIT')
@@ -1,11 +1,17 @@
+from unittest import skipUnless
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from django.conf import settings
+from django.core.cache import caches
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from coderr.models import Offers, OfferDetail, Profile
 
 class OffersAPITestCase(APITestCase):
 
     def setUp(self):
+        caches[settings.OFFER_LIST_CACHE_ALIAS].clear()
         # Set up users and profiles
         self.business_user = User.objects.create_user(
             username="business_user", password="password123"
@@ -124,4 +130,318 @@ class OffersAPITestCase(APITestCase):
             self.assertIn('Test', result['title'] + result['description'])
 
 
+class OfferMinValuesTestCase(APITestCase):
 
+    def setUp(self):
+        caches[settings.OFFER_LIST_CACHE_ALIAS].clear()
+        self.business_user = User.objects.create_user(
+            username="business_user", password="password123"
+        )
+        Profile.objects.create(user=self.business_user, type='business')
+        self.offer = Offers.objects.create(user=self.business_user, title="Offer")
+        self.client = APIClient()
+
+    def create_detail(self, price, delivery_time_in_days, offer_type):
+        return OfferDetail.objects.create(
+            offer=self.offer,
+            title=offer_type,
+            revisions=1,
+            delivery_time_in_days=delivery_time_in_days,
+            price=price,
+            features=[],
+            offer_type=offer_type
+        )
+
+    def test_min_values_follow_detail_changes(self):
+        """Testet, dass min_price und min_delivery_time bei Änderungen der Details aktualisiert werden."""
+        basic = self.create_detail(100, 7, 'basic')
+        premium = self.create_detail(300, 2, 'premium')
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 100)
+        self.assertEqual(self.offer.min_delivery_time, 2)
+
+        basic.price = 50
+        basic.save()
+        premium.delete()
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 50)
+        self.assertEqual(self.offer.min_delivery_time, 7)
+
+        basic.delete()
+        self.offer.refresh_from_db()
+        self.assertIsNone(self.offer.min_price)
+        self.assertIsNone(self.offer.min_delivery_time)
+
+    def test_min_values_after_bulk_create(self):
+        """Testet, dass die über POST per bulk_create angelegten Details die Mindestwerte setzen."""
+        self.client.force_authenticate(user=self.business_user)
+        payload = {
+            "title": "Bulk Offer",
+            "details": [
+                {"title": "Basic", "revisions": 1, "delivery_time_in_days": 9, "price": 80, "features": [], "offer_type": "basic"},
+                {"title": "Premium", "revisions": 3, "delivery_time_in_days": 3, "price": 200, "features": [], "offer_type": "premium"}
+            ]
+        }
+        response = self.client.post('/api/offers/', payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        offer = Offers.objects.get(pk=response.data['id'])
+        self.assertEqual(offer.min_price, 80)
+        self.assertEqual(offer.min_delivery_time, 3)
+
+    def test_min_values_after_patch(self):
+        """Testet, dass PATCH mit Details die Mindestwerte in der Antwort und der Datenbank aktualisiert."""
+        self.create_detail(100, 7, 'basic')
+        self.client.force_authenticate(user=self.business_user)
+        payload = {"details": [{"price": 40, "delivery_time_in_days": 4}]}
+        response = self.client.patch(f'/api/offers/{self.offer.id}/', payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['min_price'], 40)
+        self.assertEqual(response.data['min_delivery_time'], 4)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 40)
+
+    def test_filter_and_order_by_delivery_time(self):
+        """Testet Filter und Sortierung über die gespeicherte Lieferzeit inklusive Alias max_delivery_time."""
+        self.create_detail(100, 7, 'basic')
+        fast_offer = Offers.objects.create(user=self.business_user, title="Fast")
+        OfferDetail.objects.create(
+            offer=fast_offer, title="Fast", revisions=1, delivery_time_in_days=1,
+            price=500, features=[], offer_type='basic'
+        )
+        self.client.force_authenticate(user=self.business_user)
+
+        response = self.client.get('/api/offers/?max_delivery_time=3')
+        self.assertEqual([offer['id'] for offer in response.data['results']], [fast_offer.id])
+
+        response = self.client.get('/api/offers/?ordering=max_delivery_time')
+        self.assertEqual(
+            [offer['id'] for offer in response.data['results']],
+            [fast_offer.id, self.offer.id]
+        )
+
+
+class OfferSearchTestCase(APITestCase):
+
+    def setUp(self):
+        caches[settings.OFFER_LIST_CACHE_ALIAS].clear()
+        self.business_user = User.objects.create_user(
+            username="business_user", password="password123"
+        )
+        Profile.objects.create(user=self.business_user, type='business')
+        self.logo = Offers.objects.create(
+            user=self.business_user, title="Logo Design", description="Modernes Logo für Startups"
+        )
+        self.website = Offers.objects.create(
+            user=self.business_user, title="Website", description="Website mit Logo und Logo-Varianten"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.business_user)
+
+    def search(self, query):
+        response = self.client.get('/api/offers/', {'search': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [offer['id'] for offer in response.data['results']]
+
+    def test_search_matches_all_terms_with_prefix(self):
+        """Testet, dass alle Suchwörter als Präfix gefunden werden müssen."""
+        self.assertEqual(sorted(self.search('log')), sorted([self.logo.id, self.website.id]))
+        self.assertEqual(self.search('logo startup'), [self.logo.id])
+        self.assertEqual(self.search('nichtvorhanden'), [])
+
+    def test_search_ranks_by_relevance(self):
+        """Testet, dass Treffer ohne ordering-Parameter nach Relevanz sortiert werden."""
+        Offers.objects.create(user=self.business_user, title="Logo Logo Logo", description="Logo")
+        results = self.search('logo')
+        self.assertEqual(len(results), 3)
+        self.assertEqual(Offers.objects.get(pk=results[0]).title, "Logo Logo Logo")
+
+    @skipUnless(connection.vendor == 'sqlite', 'FTS5 nur unter SQLite')
+    def test_search_matches_once_per_query(self):
+        """Testet, dass die Relevanz ohne korrelierte Unterabfrage aus einem einzigen MATCH stammt."""
+        with CaptureQueriesContext(connection) as queries:
+            self.search('logo')
+        search_queries = [query['sql'] for query in queries.captured_queries if 'MATCH' in query['sql']]
+        self.assertTrue(search_queries)
+        for sql in search_queries:
+            self.assertEqual(sql.count('MATCH'), 1)
+
+    def test_search_index_follows_changes(self):
+        """Testet, dass Änderungen und Löschungen über das ORM im Index ankommen."""
+        Offers.objects.filter(pk=self.logo.pk).update(title="Branding")
+        self.assertEqual(self.search('branding'), [self.logo.id])
+        self.website.delete()
+        self.assertEqual(self.search('website'), [])
+
+    def test_basic_search_backend(self):
+        """Testet, dass OFFERS_SEARCH_BACKEND='basic' auf die icontains-Suche zurückfällt."""
+        with self.settings(OFFERS_SEARCH_BACKEND='basic'):
+            self.assertEqual(self.search('ogo Des'), [self.logo.id])
+
+
+class OfferPatchDetailsTestCase(APITestCase):
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(
+            username="business_user", password="password123"
+        )
+        Profile.objects.create(user=self.business_user, type='business')
+        self.offer = Offers.objects.create(user=self.business_user, title="Offer")
+        self.details = {
+            offer_type: OfferDetail.objects.create(
+                offer=self.offer, title=offer_type.title(), revisions=index + 1,
+                delivery_time_in_days=10 - index * 3, price=100 * (index + 1),
+                features=[], offer_type=offer_type
+            )
+            for index, offer_type in enumerate(['basic', 'standard', 'premium'])
+        }
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.business_user)
+
+    def patch(self, payload):
+        return self.client.patch(f'/api/offers/{self.offer.id}/', payload, format='json')
+
+    def test_details_are_matched_by_offer_type_and_id(self):
+        """Testet, dass Details unabhängig von der Reihenfolge über offer_type bzw. id zugeordnet werden."""
+        response = self.patch({"details": [
+            {"offer_type": "premium", "price": 250},
+            {"id": self.details['basic'].id, "price": 50, "title": "Starter"},
+        ]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        prices = {detail['offer_type']: detail['price'] for detail in response.data['details']}
+        self.assertEqual(prices, {'basic': '50.00', 'standard': '200.00', 'premium': '250.00'})
+        self.assertEqual(response.data['min_price'], 50)
+        for offer_type, price in (('basic', 50), ('standard', 200), ('premium', 250)):
+            self.details[offer_type].refresh_from_db()
+            self.assertEqual(self.details[offer_type].price, price)
+        self.assertEqual(self.details['basic'].title, "Starter")
+
+    def test_detail_id_as_string_is_matched(self):
+        """Testet, dass eine als String übermittelte id ("5") wie eine Zahl zugeordnet wird."""
+        response = self.patch({"details": [{"id": str(self.details['standard'].id), "price": 150}]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.details['standard'].refresh_from_db()
+        self.assertEqual(self.details['standard'].price, 150)
+
+    def test_invalid_detail_id_is_rejected(self):
+        """Testet, dass eine nicht ganzzahlige id zu 400 mit Fehler am Feld id führt."""
+        response = self.patch({"details": [{"id": "abc", "price": 150}]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('id', response.data['details'][0])
+
+    def test_changed_details_are_written_with_one_update(self):
+        """Testet, dass alle geänderten Details mit einem UPDATE geschrieben und die Antwort nicht neu geladen wird."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.patch({"title": "Renamed", "details": [
+                {"offer_type": "basic", "price": 90},
+                {"offer_type": "standard", "price": 180},
+                {"offer_type": "premium", "price": 300},
+            ]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], "Renamed")
+
+        statements = [query['sql'] for query in queries.captured_queries]
+        detail_updates = [sql for sql in statements if sql.startswith('UPDATE "coderr_offerdetail"')]
+        self.assertEqual(len(detail_updates), 1)
+        self.assertIn('"price"', detail_updates[0])
+        self.assertNotIn('"title"', detail_updates[0])
+        self.assertEqual(len([sql for sql in statements if sql.startswith('SELECT')]), 2)
+        self.assertEqual(
+            list(OfferDetail.objects.filter(offer=self.offer).order_by('price').values_list('price', flat=True)),
+            [90, 180, 300]
+        )
+
+    def test_unknown_detail_is_rejected_without_changes(self):
+        """Testet, dass ein unbekanntes Detail zu 400 führt und nichts gespeichert wird."""
+        response = self.patch({"title": "Changed", "details": [
+            {"offer_type": "basic", "price": 1},
+            {"id": 999, "price": 2},
+        ]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('details', response.data)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.title, "Offer")
+        self.details['basic'].refresh_from_db()
+        self.assertEqual(self.details['basic'].price, 100)
+
+
+class OfferFacetsTestCase(APITestCase):
+
+    def setUp(self):
+        caches[settings.OFFER_LIST_CACHE_ALIAS].clear()
+        self.business_user = User.objects.create_user(
+            username="business_user", password="password123"
+        )
+        self.other_business_user = User.objects.create_user(
+            username="other_business_user", password="password123"
+        )
+        self.customer_user = User.objects.create_user(
+            username="customer_user", password="password123"
+        )
+        Profile.objects.create(user=self.business_user, type='business')
+        Profile.objects.create(user=self.other_business_user, type='business')
+        Profile.objects.create(user=self.customer_user, type='customer')
+
+        for user, title, price, days in (
+            (self.business_user, "Logo Basic", 30, 1),
+            (self.business_user, "Logo Pro", 120, 5),
+            (self.other_business_user, "Website", 1500, 20),
+            (self.other_business_user, "Website Small", 60, 3),
+        ):
+            offer = Offers.objects.create(user=user, title=title)
+            OfferDetail.objects.create(
+                offer=offer, title=title, revisions=1, delivery_time_in_days=days,
+                price=price, features=[], offer_type='basic'
+            )
+        Offers.objects.create(user=self.business_user, title="Without details")
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.customer_user)
+
+    def counts(self, facet):
+        return [bucket['count'] for bucket in facet['buckets']]
+
+    def test_facets_count_buckets_in_one_query(self):
+        """Testet, dass alle Bereichszählungen mit einer Abfrage ermittelt werden."""
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/offers/facets/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual(self.counts(response.data['price']), [1, 1, 1, 0, 0, 1])
+        self.assertEqual(response.data['price']['buckets'][-1], {'min': 1000, 'max': None, 'count': 1})
+        self.assertEqual(self.counts(response.data['delivery_time']), [1, 1, 1, 0, 1, 0])
+        self.assertEqual(response.data['delivery_time']['min'], 1)
+        self.assertEqual(response.data['delivery_time']['max'], 20)
+
+    def test_facets_apply_list_filters_and_search(self):
+        """Testet, dass Such- und Filterparameter der Angebotsliste berücksichtigt werden."""
+        response = self.client.get('/api/offers/facets/', {'search': 'logo'})
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(self.counts(response.data['price']), [1, 0, 1, 0, 0, 0])
+
+        response = self.client.get('/api/offers/facets/', {
+            'creator_id': self.other_business_user.id, 'max_delivery_time': 5
+        })
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(self.counts(response.data['price']), [0, 1, 0, 0, 0, 0])
+
+    def test_facets_endpoint_is_read_only(self):
+        """Testet, dass POST auf die Facetten kein Angebot anlegt."""
+        self.client.force_authenticate(user=self.business_user)
+        count = Offers.objects.count()
+        response = self.client.post('/api/offers/facets/', {'title': 'New', 'details': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertEqual(Offers.objects.count(), count)
+
+    def test_facets_use_offer_list_cache(self):
+        """Testet, dass Facetten gecacht und bei Änderungen an Details verworfen werden."""
+        self.client.get('/api/offers/facets/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/offers/facets/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            OfferDetail.objects.filter(offer__title="Website").get().delete()
+        response = self.client.get('/api/offers/facets/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(self.counts(response.data['price']), [1, 1, 1, 0, 0, 0])
@@ -0,0 +1,137 @@
+import base64
+import json
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.conf import settings
+from django.core.cache import caches
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from coderr.models import Offers, OfferDetail, Profile, Order, Review
+
+
+class KeysetPaginationTestCase(APITestCase):
+
+    def setUp(self):
+        caches[settings.OFFER_LIST_CACHE_ALIAS].clear()
+        self.business_user = User.objects.create_user(
+            username="business_user", password="password123"
+        )
+        self.customer_user = User.objects.create_user(
+            username="customer_user", password="password123"
+        )
+        Profile.objects.create(user=self.business_user, type='business')
+        Profile.objects.create(user=self.customer_user, type='customer')
+
+        self.offers = []
+        for index in range(9):
+            offer = Offers.objects.create(user=self.business_user, title=f"Offer {index}")
+            if index % 3:
+                OfferDetail.objects.create(
+                    offer=offer, title="Basic", revisions=1, delivery_time_in_days=index,
+                    price=10 * (index % 4), features=[], offer_type='basic'
+                )
+            self.offers.append(offer)
+        # Gleiche Zeitstempel erzwingen, damit die ID als Tiebreaker greift.
+        Offers.objects.filter(pk__in=[offer.pk for offer in self.offers[:5]]).update(updated_at=timezone.now())
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.customer_user)
+
+    def walk(self, url):
+        ids = []
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            ids.extend(item['id'] for item in response.data['results'])
+            pages.append(response.data)
+            url = response.data['next']
+        return ids, pages
+
+    def expected_ids(self, *ordering):
+        return list(Offers.objects.order_by(*ordering).values_list('id', flat=True))
+
+    def test_cursor_walks_all_offers_forward_and_back(self):
+        """Testet, dass der Cursor alle Angebote genau einmal liefert und zurückblättern kann."""
+        ids, pages = self.walk('/api/offers/?cursor=&page_size=2')
+        self.assertEqual(ids, self.expected_ids('updated_at', 'id'))
+        self.assertIsNone(pages[0]['previous'])
+
+        previous = self.client.get(pages[-1]['previous']).data
+        self.assertEqual(previous['results'], pages[-2]['results'])
+        self.assertIsNotNone(previous['next'])
+
+    def test_cursor_with_price_ordering_and_nulls(self):
+        """Testet die Cursor-Paginierung über min_price inklusive Angeboten ohne Preis."""
+        ids, _ = self.walk('/api/offers/?cursor=&page_size=2&ordering=min_price')
+        self.assertEqual(len(ids), len(self.offers))
+        self.assertEqual(len(set(ids)), len(self.offers))
+        prices = [Offers.objects.get(pk=pk).min_price for pk in ids]
+        self.assertEqual(prices[:3], [None, None, None])
+        self.assertEqual(prices[3:], sorted(prices[3:]))
+
+        ids, _ = self.walk('/api/offers/?cursor=&page_size=4&ordering=-max_delivery_time')
+        times = [Offers.objects.get(pk=pk).min_delivery_time for pk in ids]
+        self.assertEqual(len(set(ids)), len(self.offers))
+        self.assertEqual(times[-3:], [None, None, None])
+        self.assertEqual(times[:-3], sorted(times[:-3], reverse=True))
+
+    def test_cursor_with_search_ranking(self):
+        """Testet die Cursor-Paginierung über die Relevanz der Volltextsuche."""
+        ids, _ = self.walk('/api/offers/?cursor=&page_size=2&search=offer')
+        self.assertEqual(sorted(ids), sorted(offer.id for offer in self.offers))
+
+    def test_cursor_skips_count_query(self):
+        """Testet, dass im Cursor-Modus kein COUNT(*) ausgeführt wird."""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/offers/?cursor=')
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+
+    def test_page_number_still_works(self):
+        """Testet, dass ?page= weiterhin die klassische Seitenpaginierung liefert."""
+        response = self.client.get('/api/offers/?page=2&page_size=4')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 9)
+        self.assertEqual(len(response.data['results']), 4)
+
+    def test_invalid_cursor(self):
+        """Testet, dass ein ungültiger Cursor mit 404 beantwortet wird."""
+        response = self.client.get('/api/offers/?cursor=kaputt')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tampered_cursor_values(self):
+        """Testet, dass Cursor mit Werten vom falschen Typ mit 404 statt 500 beantwortet werden."""
+        for url, values in (
+            ('/api/offers/?cursor={}', ['abc', 1]),
+            ('/api/offers/?cursor={}', ['2024-01-01T00:00:00+00:00', 'abc']),
+            ('/api/offers/?ordering=min_price&cursor={}', [{'x': 1}, 1]),
+            ('/api/offers/?search=offer&cursor={}', ['abc', 1]),
+        ):
+            cursor = base64.urlsafe_b64encode(json.dumps({'v': values}).encode()).decode()
+            response = self.client.get(url.format(cursor))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, (url, values))
+
+    def test_reviews_and_orders_cursor_mode(self):
+        """Testet den Cursor-Modus für Reviews und Bestellungen."""
+        detail = OfferDetail.objects.first()
+        for index in range(5):
+            Review.objects.create(
+                business_user=self.business_user, reviewer=self.customer_user, rating=3,
+                description=f"Review {index}"
+            )
+            Order.objects.create(
+                customer_user=self.customer_user, business_user=self.business_user, offer_detail=detail
+            )
+
+        ids, pages = self.walk('/api/reviews/?cursor=&page_size=2')
+        self.assertEqual(ids, list(Review.objects.order_by('updated_at', 'id').values_list('id', flat=True)))
+        self.assertEqual(len(pages), 3)
+
+        ids, _ = self.walk('/api/orders/?cursor=&page_size=2')
+        self.assertEqual(ids, list(Order.objects.order_by('updated_at', 'id').values_list('id', flat=True)))
+
+        response = self.client.get('/api/orders/')
+        self.assertIsInstance(response.data, list)
@@ -0,0 +1,170 @@
+import json
+from unittest import mock
+from io import StringIO
+from tempfile import NamedTemporaryFile
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APIClient
+from coderr.bulk import UserProvisioner
+from coderr.jobs import run_pending
+from coderr.models import Job, Profile
+
+
+def user_row(index, **overrides):
+    row = {
+        "username": f"user{index}",
+        "email": f"user{index}@example.com",
+        "password": "secret123",
+        "type": "business",
+    }
+    row.update(overrides)
+    return row
+
+
+@override_settings(USER_PROVISION_HASH_WORKERS=0)
+class UserProvisioningTestCase(APITestCase):
+
+    def setUp(self):
+        self.staff = User.objects.create_user(username="staff", password="password123", is_staff=True)
+        self.customer = User.objects.create_user(username="customer", password="password123")
+        Profile.objects.create(user=self.customer, type='customer')
+        self.client = APIClient()
+
+    def post_jsonl(self, rows):
+        body = "\n".join(json.dumps(row) for row in rows) + "\n"
+        return self.client.post('/api/users/provision/', data=body, content_type='application/x-ndjson')
+
+    def run_upload(self, response):
+        # Arbeitet den Job wie run_worker ab und gibt die Zusammenfassung des Status-Endpunkts zurück.
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        run_pending()
+        job = self.client.get(f"/api/users/provision/{response.data['job_id']}/")
+        self.assertEqual(job.data['status'], 'done')
+        return job.data['result']
+
+    def test_staff_provisions_users_with_profile_and_token(self):
+        """Testet, dass Staff per JSON Lines Benutzer samt Profil, Token und gehashtem Passwort anlegt."""
+        self.client.force_authenticate(user=self.staff)
+        response = self.post_jsonl([user_row(i) for i in range(3)])
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(User.objects.filter(username="user1").exists())
+        self.assertEqual(self.run_upload(response)['created'], 3)
+
+        user = User.objects.get(username="user1")
+        self.assertTrue(user.check_password("secret123"))
+        self.assertEqual(user.profile.type, 'business')
+        self.assertTrue(Token.objects.filter(user=user).exists())
+
+        login = self.client.post('/api/login/', {"username": "user1", "password": "secret123"}, format='json')
+        self.assertEqual(login.status_code, status.HTTP_200_OK)
+
+    def test_csv_body_is_accepted(self):
+        """Testet, dass der Endpunkt CSV mit Kopfzeile verarbeitet."""
+        self.client.force_authenticate(user=self.staff)
+        body = "username,email,password,type,first_name\nanna,anna@example.com,pw12345,customer,Anna\n"
+        response = self.client.post('/api/users/provision/', data=body, content_type='text/csv')
+        self.assertEqual(self.run_upload(response)['created'], 1)
+        user = User.objects.get(username="anna")
+        self.assertEqual(user.first_name, "Anna")
+        self.assertEqual(user.profile.type, 'customer')
+
+    def test_invalid_and_conflicting_rows_are_reported_per_line(self):
+        """Testet, dass ungültige Zeilen, Dubletten und vergebene Konten übersprungen und gemeldet werden."""
+        User.objects.create_user(username="taken", email="taken@example.com", password="pw")
+        self.client.force_authenticate(user=self.staff)
+        response = self.post_jsonl([
+            user_row(1),
+            user_row(2, type="admin"),
+            user_row(3, email="not-an-email"),
+            user_row(1, email="other@example.com"),
+            user_row(4, email="USER1@example.com"),
+            user_row(5, username="taken"),
+            user_row(6, email="Taken@example.com"),
+            user_row(7),
+        ])
+        summary = self.run_upload(response)
+        self.assertEqual(summary['created'], 2)
+        self.assertEqual(summary['error_count'], 6)
+        self.assertEqual([error['line'] for error in summary['errors']], [2, 3, 4, 5, 6, 7])
+        self.assertIn('type', summary['errors'][0]['errors'])
+        self.assertIn('email', summary['errors'][1]['errors'])
+        self.assertIn('username', summary['errors'][4]['errors'])
+        self.assertIn('email', summary['errors'][5]['errors'])
+        self.assertTrue(User.objects.filter(username="user7").exists())
+
+    def test_duplicates_across_batches_are_caught_by_the_database(self):
+        """Testet, dass Dubletten nur pro Batch gesucht und über Batches hinweg als vergeben gemeldet werden."""
+        provisioner = UserProvisioner(batch_size=2, workers=0)
+        rows = [user_row(1), user_row(2), user_row(1, email="other@example.com"), user_row(3, email="USER2@example.com")]
+        summary = provisioner.provision_lines([json.dumps(row) for row in rows])
+        self.assertEqual(summary['created'], 2)
+        self.assertEqual([(error['line'], list(error['errors'])) for error in summary['errors']],
+                         [(3, ['username']), (4, ['email'])])
+
+    def test_conflict_during_write_names_the_colliding_field(self):
+        """Testet, dass bei einer Kollision erst beim Schreiben das betroffene Feld gemeldet wird."""
+        User.objects.create_user(username="existing", email="user1@example.com", password="pw")
+        provisioner = UserProvisioner(workers=0)
+        # Ein gleichzeitig angelegtes Konto ist bei exclude_existing noch nicht sichtbar.
+        with mock.patch.object(UserProvisioner, 'exclude_existing', lambda self, batch: batch):
+            summary = provisioner.provision_lines([json.dumps(user_row(1)), json.dumps(user_row(2))])
+        self.assertEqual(summary['created'], 1)
+        self.assertEqual(summary['errors'], [
+            {'line': 1, 'errors': {'email': ['A user with this email already exists.']}},
+        ])
+
+    @override_settings(USER_PROVISION_HASH_WORKERS=2)
+    def test_upload_is_hashed_by_the_worker_with_process_pool(self):
+        """Testet, dass der Request nur einen Job anlegt und erst der Worker mit Prozesspool hasht."""
+        self.client.force_authenticate(user=self.staff)
+        with mock.patch('coderr.bulk.ProcessPoolExecutor') as pool:
+            response = self.post_jsonl([user_row(1)])
+            pool.assert_not_called()
+            pool.return_value.map.side_effect = lambda func, items, chunksize: map(func, items)
+            summary = self.run_upload(response)
+        pool.assert_called_once_with(2)
+        self.assertEqual(summary['created'], 1)
+        self.assertTrue(User.objects.get(username="user1").check_password("secret123"))
+
+    def test_finished_job_drops_the_upload(self):
+        """Testet, dass die Klartext-Passwörter nach dem Lauf nicht im Job verbleiben."""
+        self.client.force_authenticate(user=self.staff)
+        response = self.post_jsonl([user_row(1, password="")])
+        self.assertIn('"password": ""', Job.objects.get(pk=response.data['job_id']).payload['data'])
+        summary = self.run_upload(response)
+        self.assertEqual(summary['created'], 0)
+        self.assertEqual(summary['errors'][0]['line'], 1)
+        self.assertEqual(Job.objects.get(pk=response.data['job_id']).payload, {})
+
+    def test_status_of_other_jobs_is_not_exposed(self):
+        """Testet, dass der Status-Endpunkt nur Upload-Jobs und nur für Staff liefert."""
+        job = Job.objects.create(kind='image_variants', payload={})
+        self.client.force_authenticate(user=self.staff)
+        self.assertEqual(self.client.get(f'/api/users/provision/{job.pk}/').status_code, status.HTTP_404_NOT_FOUND)
+        response = self.post_jsonl([user_row(1)])
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.get(f"/api/users/provision/{response.data['job_id']}/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_non_staff_is_rejected(self):
+        """Testet, dass nur Staff-Benutzer Konten anlegen dürfen."""
+        self.client.force_authenticate(user=self.customer)
+        response = self.post_jsonl([user_row(1)])
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Job.objects.exists())
+
+    def test_command_provisions_across_batches_with_process_pool(self):
+        """Testet, dass der Befehl über mehrere Batches hinweg mit Prozesspool Benutzer anlegt."""
+        with NamedTemporaryFile('w', suffix='.csv', delete=False) as handle:
+            handle.write("username,email,password,type\n")
+            for i in range(5):
+                handle.write(f"bulk{i},bulk{i}@example.com,pw{i}xyz,business\n")
+        out, err = StringIO(), StringIO()
+        call_command('provision_users', handle.name, batch_size=2, workers=2, stdout=out, stderr=err)
+        self.assertIn('5 Benutzer angelegt', out.getvalue())
+        self.assertEqual(Profile.objects.filter(user__username__startswith="bulk").count(), 5)
+        self.assertEqual(Token.objects.filter(user__username__startswith="bulk").count(), 5)
+        self.assertTrue(User.objects.get(username="bulk3").check_password("pw3xyz"))
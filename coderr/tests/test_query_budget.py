@@ -0,0 +1,114 @@
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.conf import settings
+from django.core.cache import caches
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from coderr.models import Offers, OfferDetail, Profile
+
+# Maximale Anzahl SQL-Abfragen pro Endpunkt, unabhängig von der Seitengröße.
+QUERY_BUDGETS = {
+    'offers-list': 4,
+    # Versionsabfrage für ETag/Last-Modified, Angebot mit Anbieter, Details.
+    'detail-offer': 3,
+}
+
+
+class OfferQueryBudgetTestCase(APITestCase):
+
+    def setUp(self):
+        caches[settings.OFFER_LIST_CACHE_ALIAS].clear()
+        self.business_user = User.objects.create_user(
+            username="business_user", password="password123"
+        )
+        self.customer_user = User.objects.create_user(
+            username="customer_user", password="password123"
+        )
+        Profile.objects.create(user=self.business_user, type='business')
+        Profile.objects.create(user=self.customer_user, type='customer')
+
+        for index in range(30):
+            offer = Offers.objects.create(user=self.business_user, title=f"Offer {index}")
+            OfferDetail.objects.bulk_create([
+                OfferDetail(
+                    offer=offer,
+                    title=offer_type,
+                    revisions=1,
+                    delivery_time_in_days=index + 1,
+                    price=10 * (index + 1),
+                    features=[],
+                    offer_type=offer_type
+                )
+                for offer_type in ('basic', 'standard', 'premium')
+            ])
+        self.offer = offer
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.customer_user)
+
+    def assertWithinBudget(self, name, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLessEqual(
+            len(queries), QUERY_BUDGETS[name],
+            '\n'.join(query['sql'] for query in queries.captured_queries)
+        )
+        return response, len(queries)
+
+    def test_offers_list_budget_independent_of_page_size(self):
+        """Testet, dass die Angebotsliste für jede Seitengröße dieselbe Anzahl Abfragen benötigt."""
+        url = reverse('offers-list')
+        query_counts = set()
+        for page_size in (1, 6, 100):
+            response, query_count = self.assertWithinBudget('offers-list', f'{url}?page_size={page_size}')
+            self.assertEqual(len(response.data['results']), min(page_size, 30))
+            self.assertEqual(len(response.data['results'][0]['details']), 3)
+            query_counts.add(query_count)
+        self.assertEqual(len(query_counts), 1)
+
+    def test_offer_detail_budget(self):
+        """Testet, dass die Detailansicht eines Angebots im Abfragebudget bleibt."""
+        response, _ = self.assertWithinBudget('detail-offer', reverse('detail-offer', args=[self.offer.id]))
+        self.assertEqual(len(response.data['details']), 3)
+
+
+class ProfileTypeResolutionTestCase(APITestCase):
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(username="business_user", password="password123")
+        self.customer_user = User.objects.create_user(username="customer_user", password="password123")
+        Profile.objects.create(user=self.business_user, type='business')
+        Profile.objects.create(user=self.customer_user, type='customer')
+        self.client = APIClient()
+
+    def profile_queries(self, method, url, user, data=None):
+        # Frisch geladener Benutzer ohne gecachtes Profil, wie bei Session-Authentifizierung.
+        self.client.force_authenticate(user=User.objects.get(pk=user.pk))
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data, format='json')
+        return response, [query['sql'] for query in queries.captured_queries if 'coderr_profile' in query['sql']]
+
+    def test_profile_type_is_resolved_once_per_request(self):
+        """Testet, dass Berechtigung und View den Profiltyp nur einmal pro Request abfragen."""
+        response, queries = self.profile_queries('get', '/api/offers/', self.business_user)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+
+        response, queries = self.profile_queries('post', '/api/offers/', self.customer_user, {'title': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(len(queries), 1)
+
+        response, queries = self.profile_queries('post', '/api/orders/', self.business_user, {})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(len(queries), 1)
+
+    def test_loaded_profile_costs_no_query(self):
+        """Testet, dass ein bereits mit dem Benutzer geladenes Profil keine Abfrage auslöst."""
+        user = User.objects.select_related('profile').get(pk=self.customer_user.pk)
+        self.client.force_authenticate(user=user)
+        with self.assertNumQueries(0):
+            response = self.client.post('/api/offers/', {'title': 'x'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
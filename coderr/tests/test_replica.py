@@ -0,0 +1,136 @@
+import unittest
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APITransactionTestCase, APIClient
+from coderr.models import Profile
+from coderr.routers import PIN_COOKIE, PrimaryReplicaRouter, is_pinned, reset_replica, use_replica
+
+REPLICA_CONFIGURED = settings.READ_REPLICA_ALIAS in settings.DATABASES
+
+
+# Als Replik-Alias dient hier 'default', damit kein zweiter Alias konfiguriert sein muss.
+@override_settings(READ_REPLICA_ALIAS='default')
+class PrimaryReplicaRouterTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_use_replica_only_when_enabled(self):
+        """Testet, dass Lesezugriffe nur nach use_replica an die Replik gehen."""
+        self.assertIsNone(self.router.db_for_read(User))
+        token = use_replica()
+        try:
+            self.assertEqual(self.router.db_for_read(User), 'default')
+            self.assertEqual(self.router.db_for_write(User), 'default')
+        finally:
+            reset_replica(token)
+        self.assertIsNone(self.router.db_for_read(User))
+
+    @override_settings(READ_REPLICA_ALIAS='missing')
+    def test_unknown_alias_falls_back_to_default(self):
+        """Testet, dass ohne konfigurierte Replik alles auf dem Primary bleibt."""
+        token = use_replica()
+        try:
+            self.assertIsNone(self.router.db_for_read(User))
+        finally:
+            reset_replica(token)
+
+
+class PrimaryPinTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="customer", password="password123")
+        Profile.objects.create(user=self.user, type='customer')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+
+    @override_settings(READ_REPLICA_ALIAS='default')
+    def test_successful_write_pins_user_to_primary(self):
+        """Testet, dass ein erfolgreicher schreibender Request den Benutzer an den Primary bindet."""
+        response = self.client.post('/api/logout/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        cookie = response.cookies[PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.READ_REPLICA_PIN_SECONDS)
+        self.assertTrue(is_pinned(self.make_request(cookie.value), self.user.pk))
+        self.assertFalse(is_pinned(self.make_request(cookie.value), self.user.pk + 1))
+
+    @override_settings(READ_REPLICA_ALIAS='default')
+    def test_pin_cookie_is_signed_and_expires(self):
+        """Testet, dass gefälschte und abgelaufene Cookies den Benutzer nicht an den Primary binden."""
+        self.assertFalse(is_pinned(self.make_request(str(self.user.pk)), self.user.pk))
+        response = self.client.post('/api/logout/')
+        value = response.cookies[PIN_COOKIE].value
+        with override_settings(READ_REPLICA_PIN_SECONDS=-1):
+            self.assertFalse(is_pinned(self.make_request(value), self.user.pk))
+
+    @override_settings(READ_REPLICA_ALIAS=None)
+    def test_no_pin_without_replica(self):
+        """Testet, dass ohne Replik kein Cookie gesetzt wird."""
+        response = self.client.post('/api/logout/')
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def make_request(self, value):
+        request = RequestFactory().get('/api/reviews/')
+        request.COOKIES[PIN_COOKIE] = value
+        return request
+
+
+@unittest.skipUnless(
+    REPLICA_CONFIGURED,
+    'Nur mit DATABASE_REPLICA_URL=sqlite:///replica.sqlite3 python manage.py test',
+)
+class ReplicaReadTestCase(APITransactionTestCase):
+    # Ohne Transaktion pro Test, damit die Replik (Test-Mirror von 'default') die Daten sieht.
+    # Nur hier wird der Mirror wie eine eigene Datenbank behandelt; alle anderen Tests lesen von 'default'.
+    databases = {'default', 'replica'} if REPLICA_CONFIGURED else {'default'}
+
+    def setUp(self):
+        patcher = mock.patch('coderr.routers.same_database', return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = User.objects.create_user(username="customer", password="password123")
+        Profile.objects.create(user=self.user, type='customer')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+
+    def get_queries(self, url):
+        replica, primary = connections['replica'], connections['default']
+        with CaptureQueriesContext(replica) as on_replica, CaptureQueriesContext(primary) as on_primary:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(on_replica), len(on_primary)
+
+    def test_list_views_read_from_replica(self):
+        """Testet, dass Listen- und Statistik-Views von der Replik lesen."""
+        on_replica, _ = self.get_queries('/api/base-info/')
+        self.assertGreater(on_replica, 0)
+        on_replica, _ = self.get_queries('/api/reviews/')
+        self.assertGreater(on_replica, 0)
+
+    def test_replica_is_never_migrated(self):
+        """Testet, dass Migrationen nur auf dem Primary laufen."""
+        router = PrimaryReplicaRouter()
+        self.assertTrue(router.allow_migrate('default', 'coderr'))
+        self.assertFalse(router.allow_migrate('replica', 'coderr'))
+
+    def test_reads_stick_to_primary_after_write(self):
+        """Testet, dass ein Benutzer nach einem Schreibzugriff vom Primary liest."""
+        self.client.patch(f'/api/profile/{self.user.pk}/', {'location': 'Bern'}, format='json')
+        on_replica, on_primary = self.get_queries('/api/reviews/')
+        self.assertEqual(on_replica, 0)
+        self.assertGreater(on_primary, 0)
+
+    def test_mirror_of_default_is_not_used(self):
+        """Testet, dass Lesezugriffe auf 'default' bleiben, wenn die Replik dieselbe Datenbank ist."""
+        with mock.patch('coderr.routers.same_database', return_value=True):
+            token = use_replica()
+            try:
+                self.assertIsNone(PrimaryReplicaRouter().db_for_read(User))
+            finally:
+                reset_replica(token)
@@ -0,0 +1,140 @@
+import gzip
+import json
+import logging
+from io import StringIO
+import os
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from django.core.cache import caches
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import RequestFactory, override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APIClient
+from coderr import slow_queries
+from coderr.models import Offers, OfferDetail, Profile
+
+
+class SlowQueryLogTestCase(APITestCase):
+
+    def setUp(self):
+        caches[settings.OFFER_LIST_CACHE_ALIAS].clear()
+        self.customer = User.objects.create_user(username="customer", password="password123")
+        Profile.objects.create(user=self.customer, type='customer')
+        self.business = User.objects.create_user(username="business", password="password123")
+        Profile.objects.create(user=self.business, type='business')
+        self.offer = Offers.objects.create(user=self.business, title="Offer", description="Text")
+        OfferDetail.objects.create(
+            offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=3,
+            price=50, features=["A"], offer_type="basic",
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.customer).key}')
+
+    def entries(self, logs):
+        return [record.slow_query for record in logs.records]
+
+    def test_fingerprint_ignores_literals_and_list_lengths(self):
+        """Testet, dass Abfragen mit anderen Werten und IN-Listen denselben Fingerprint bekommen."""
+        first = slow_queries.fingerprint("SELECT * FROM coderr_offers WHERE id IN (%s, %s) AND title = 'a' LIMIT 6")
+        second = slow_queries.fingerprint("SELECT  *  FROM coderr_offers WHERE id IN (%s) AND title = 'b''c' LIMIT 21")
+        self.assertEqual(first, second)
+        self.assertEqual(first[0], 'SELECT * FROM coderr_offers WHERE id IN (?+) AND title = ? LIMIT ?')
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_slow_queries_are_logged_with_route_view_and_call_site(self):
+        """Testet, dass Einträge Route, View-Klasse, Fingerprint, Dauer und Aufrufstelle enthalten."""
+        with self.assertLogs('coderr.slow_queries', level='WARNING') as logs:
+            response = self.client.get('/api/offers/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        entries = [entry for entry in self.entries(logs) if entry['route'] == 'api/offers/']
+        self.assertTrue(entries)
+        entry = entries[-1]
+        self.assertEqual(entry['event'], 'slow_query')
+        self.assertEqual(entry['view'], 'coderr.api.views.offers.OffersListView')
+        self.assertEqual(entry['url_name'], 'offers-list')
+        self.assertRegex(entry['fingerprint'], r'^[0-9a-f]{12}$')
+        self.assertGreaterEqual(entry['duration_ms'], 0)
+        self.assertTrue(entry['call_site'].startswith('coderr/'), entry['call_site'])
+
+    @override_settings(SLOW_QUERY_REPEAT_THRESHOLD=3)
+    def test_repeated_queries_are_flagged_once_per_request(self):
+        """Testet, dass eine mehrfach ausgeführte Abfrage am Ende des Requests einmal mit Anzahl gemeldet wird."""
+        request = RequestFactory().get('/api/offers/')
+        context, token = slow_queries.start_request(request)
+        try:
+            for _ in range(5):
+                Offers.objects.get(pk=self.offer.pk)
+        finally:
+            slow_queries.end_request(token)
+        with self.assertLogs('coderr.slow_queries', level='WARNING') as logs:
+            slow_queries.log_repeated_queries(context)
+        [entry] = self.entries(logs)
+        self.assertEqual(entry['event'], 'repeated_query')
+        self.assertEqual(entry['count'], 5)
+        self.assertIn('FROM "coderr_offers"', entry['sql'])
+        self.assertIn('test_slow_queries.py', entry['call_site'])
+
+    def test_fast_requests_are_not_logged(self):
+        """Testet, dass unter den Schwellwerten nichts protokolliert wird."""
+        with self.assertRaises(AssertionError):
+            with self.assertLogs('coderr.slow_queries', level='WARNING'):
+                self.client.get('/api/offers/')
+
+    def test_analyze_command_groups_by_fingerprint(self):
+        """Testet, dass analyze_slow_queries Einträge je Fingerprint zusammenfasst und nach Gesamtdauer sortiert."""
+        formatter = slow_queries.JsonFormatter()
+        rows = [
+            {'event': 'slow_query', 'fingerprint': 'aaa', 'sql': 'SELECT a', 'duration_ms': 120.0,
+             'route': 'api/offers/', 'view': 'OffersListView', 'call_site': 'coderr/a.py:1 in f'},
+            {'event': 'slow_query', 'fingerprint': 'aaa', 'sql': 'SELECT a', 'duration_ms': 80.0,
+             'route': 'api/offers/', 'view': 'OffersListView', 'call_site': 'coderr/a.py:1 in f'},
+            {'event': 'repeated_query', 'fingerprint': 'bbb', 'sql': 'SELECT b', 'duration_ms': 500.0, 'count': 40,
+             'route': 'api/orders/', 'view': 'OrderListView', 'call_site': 'coderr/b.py:2 in g'},
+        ]
+        with NamedTemporaryFile('w', suffix='.log') as handle:
+            for row in rows:
+                record = logging.LogRecord('coderr.slow_queries', logging.WARNING, __file__, 0, 'x', None, None)
+                record.slow_query = row
+                handle.write(formatter.format(record) + '\n')
+            handle.flush()
+            out = StringIO()
+            call_command('analyze_slow_queries', handle.name, json=True, stdout=out)
+            summary = json.loads(out.getvalue())
+            text = StringIO()
+            call_command('analyze_slow_queries', handle.name, route='api/offers/', stdout=text)
+
+        self.assertEqual([group['fingerprint'] for group in summary], ['bbb', 'aaa'])
+        self.assertEqual(summary[0]['executions'], 40)
+        self.assertEqual(summary[1]['entries'], 2)
+        self.assertEqual(summary[1]['total_ms'], 200.0)
+        self.assertIn('[SLOW] aaa', text.getvalue())
+        self.assertNotIn('bbb', text.getvalue())
+
+    def test_analyze_command_reads_rotated_logs(self):
+        """Testet, dass analyze_slow_queries auch von logrotate verschobene und komprimierte Dateien liest."""
+        formatter = slow_queries.JsonFormatter()
+        record = logging.LogRecord('coderr.slow_queries', logging.WARNING, __file__, 0, 'x', None, None)
+        record.slow_query = {'event': 'slow_query', 'fingerprint': 'aaa', 'sql': 'SELECT a', 'duration_ms': 50.0}
+        line = formatter.format(record) + '\n'
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'slow_queries.log')
+            with open(path, 'w', encoding='utf-8') as handle:
+                handle.write(line)
+            with open(f'{path}.1', 'w', encoding='utf-8') as handle:
+                handle.write(line)
+            with gzip.open(f'{path}.2.gz', 'wt', encoding='utf-8') as handle:
+                handle.write(line)
+            out = StringIO()
+            with override_settings(SLOW_QUERY_LOG_FILE=path):
+                call_command('analyze_slow_queries', json=True, stdout=out)
+
+        summary = json.loads(out.getvalue())
+        self.assertEqual(summary[0]['entries'], 3)
+        self.assertEqual(summary[0]['total_ms'], 150.0)
+
+    def test_log_handler_reopens_rotated_file(self):
+        """Testet, dass der Log-Handler für mehrere Worker die Datei nicht selbst rotiert (logrotate)."""
+        handler = settings.LOGGING['handlers'][settings.LOGGING['loggers']['coderr.slow_queries']['handlers'][0]]
+        self.assertEqual(handler['class'], 'logging.handlers.WatchedFileHandler')
@@ -1,3 +1,26 @@
-from django.shortcuts import render
+from django.http import HttpResponse
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.views import APIView
+from coderr.metrics import registry
 
-# Create your views here.
+
+class PrometheusRenderer(BaseRenderer):
+    media_type = 'text/plain'
+    format = 'txt'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data if isinstance(data, str) else str(data)
+
+
+class MetricsView(APIView):
+    """
+    Gibt die gesammelten Messwerte aller Worker im Prometheus-Textformat aus. Nur für Staff
+    (Prometheus z. B. mit Authorization: Token <Schlüssel eines Staff-Benutzers>).
+    """
+    permission_classes = [IsAdminUser]
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
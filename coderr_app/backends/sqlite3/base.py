@@ -0,0 +1,22 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite-Backend für den Betrieb mit mehreren Gunicorn-Workern.
+    Setzt auf jeder neuen Verbindung die PRAGMAS aus dem DATABASES-Eintrag (WAL, synchronous,
+    busy_timeout, mmap_size, cache_size) und beginnt Transaktionen mit BEGIN IMMEDIATE,
+    wenn TRANSACTION_MODE 'IMMEDIATE' ist: Eine Transaktion reserviert die Schreibsperre dann
+    sofort und wartet über busy_timeout auf sie, statt beim ersten Schreibzugriff mit
+    "database is locked" abzubrechen, weil ein anderer Prozess inzwischen geschrieben hat.
+    """
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict.get('PRAGMAS', {}).items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict.get('TRANSACTION_MODE')
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 
+from coderr_app.database import databases_from_env, env_bool
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -92,15 +96,43 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'coderr.middleware.PrimaryPinMiddleware',
+    'coderr.middleware.RouteMiddlewareProfile',
+]
+
+# Middleware hinter RouteMiddlewareProfile: Token-authentifizierte Requests unter API_URL_PREFIX
+# laufen durch API_MIDDLEWARE, alle anderen (Admin, Browsable API mit Session) durch SESSION_MIDDLEWARE.
+API_URL_PREFIX = '/api/'
+API_MIDDLEWARE = []
+SESSION_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'corsheaders.middleware.CorsMiddleware',  
-    'django.middleware.common.CommonMiddleware',
 ]
+# Messwerte pro Route für /metrics (Prometheus, nur Staff). Alle Worker eines Hosts addieren ihre
+# Werte alle METRICS_FLUSH_INTERVAL Sekunden in die SQLite-Datei METRICS_STORE.
+# METRICS_SERVER_TIMING gibt DB-, Serializer- und Gesamtzeit im Server-Timing-Header aus.
+METRICS_ENABLED = env_bool('METRICS_ENABLED', True)
+METRICS_STORE = os.environ.get('METRICS_STORE', os.path.join(tempfile.gettempdir(), 'coderr-metrics.sqlite3'))
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+METRICS_SERVER_TIMING = env_bool('METRICS_SERVER_TIMING', False)
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'coderr.middleware.MetricsMiddleware')
+# Slow-Query-Log: Abfragen ab SLOW_QUERY_THRESHOLD_MS und Abfragen, die in einem Request mindestens
+# SLOW_QUERY_REPEAT_THRESHOLD mal laufen (N+1), landen mit Route, View und Aufrufstelle als JSON-Zeilen
+# in SLOW_QUERY_LOG_FILE (siehe LOGGING). Auswertung: python manage.py analyze_slow_queries
+SLOW_QUERY_LOG_ENABLED = env_bool('SLOW_QUERY_LOG_ENABLED', True)
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 100))
+SLOW_QUERY_REPEAT_THRESHOLD = int(os.environ.get('SLOW_QUERY_REPEAT_THRESHOLD', 10))
+SLOW_QUERY_LOG_FILE = os.environ.get('SLOW_QUERY_LOG_FILE', os.path.join(tempfile.gettempdir(), 'coderr-slow-queries.log'))
+if SLOW_QUERY_LOG_ENABLED:
+    MIDDLEWARE.insert(0, 'coderr.middleware.SlowQueryMiddleware')
+# Die Admin-Checks suchen nur in MIDDLEWARE; coderr.middleware prüft stattdessen SESSION_MIDDLEWARE.
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
 
 
 ROOT_URLCONF = 'coderr_app.urls'
@@ -122,16 +154,53 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'coderr_app.wsgi.application'
+ASGI_APPLICATION = 'coderr_app.asgi.application'
+# Lesende Endpunkte (Angebote, Geschäftsprofile, Reviews, Basisinfos) als async-Views;
+# coderr_app/asgi.py schaltet das für den Betrieb unter uvicorn ein.
+ASYNC_READ_VIEWS = env_bool('ASYNC_READ_VIEWS', False)
 
 
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
+# Konfiguration über DATABASE_URL, DB_CONN_MAX_AGE, DB_HEALTH_CHECKS und DB_POOL (siehe coderr_app/database.py).
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+DATABASES = databases_from_env(f"sqlite:///{BASE_DIR / 'db.sqlite3'}")
+DB_HEALTH_CHECKS = env_bool('DB_HEALTH_CHECKS', True)
+
+# Lesende Listen- und Statistik-Views lesen von READ_REPLICA_ALIAS, sofern konfiguriert
+# (DATABASE_REPLICA_URL). Nach einem Schreibzugriff liest der Benutzer READ_REPLICA_PIN_SECONDS
+# lang wieder vom Primary (signiertes Cookie, siehe coderr.routers.pin_primary).
+DATABASE_ROUTERS = ['coderr.routers.PrimaryReplicaRouter']
+READ_REPLICA_ALIAS = 'replica'
+READ_REPLICA_PIN_SECONDS = int(os.environ.get('READ_REPLICA_PIN_SECONDS', 5))
+
+
+# Logging
+# Alle Gunicorn-Worker hängen an dieselbe Datei an (eine Zeile pro write). Rotiert wird extern,
+# z. B. mit logrotate; WatchedFileHandler öffnet die Datei neu, sobald sie verschoben wurde.
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'coderr.slow_queries.JsonFormatter'},
+    },
+    'handlers': {
+        'slow_queries': {
+            'class': 'logging.handlers.WatchedFileHandler',
+            'filename': SLOW_QUERY_LOG_FILE,
+            'formatter': 'json',
+            'encoding': 'utf-8',
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'coderr.slow_queries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
 }
 
 
@@ -171,8 +240,6 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/3.2/howto/static-files/
 
-import os
-
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
@@ -187,7 +254,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'coderr.api.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -198,3 +265,79 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',  
     'PAGE_SIZE': 6,  
 }
+
+# Token-Authentifizierung: Lebensdauer der Tokens und Rotation beim Login (Sekunden, 0 = aus),
+# sowie Größe und Lebensdauer des prozesslokalen Token-Caches. Widerrufe (Logout, Änderungen an
+# Benutzer oder Profil) erreichen alle Prozesse über den Cache 'default'; Änderungen per
+# QuerySet.update() lösen keinen Widerruf aus und gelten spätestens nach AUTH_TOKEN_CACHE_TTL.
+AUTH_TOKEN_TTL = int(os.environ.get('AUTH_TOKEN_TTL', 7 * 24 * 3600))
+AUTH_TOKEN_ROTATE_AFTER = int(os.environ.get('AUTH_TOKEN_ROTATE_AFTER', 24 * 3600))
+AUTH_TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get('AUTH_TOKEN_CACHE_MAX_ENTRIES', 10000))
+AUTH_TOKEN_CACHE_TTL = int(os.environ.get('AUTH_TOKEN_CACHE_TTL', 60))
+
+# Caches
+# 'default' und 'offers' werden von allen Prozessen eines Hosts geteilt (je ein Verzeichnis unter
+# CACHE_DIR), damit Invalidierungen der Angebotsliste und Token-Widerrufe jeden Gunicorn-Worker und
+# run_worker erreichen, ohne dass ein Cache-Treffer die Datenbank fragt. Laufen Worker auf mehreren
+# Hosts, CACHE_BACKEND auf einen gemeinsamen Server setzen, z. B.
+# django.core.cache.backends.memcached.PyMemcacheCache mit CACHE_LOCATION=127.0.0.1:11211.
+# 'offers' hält gerenderte Seiten von /api/offers/ (TTL über TIMEOUT, Größe über MAX_ENTRIES,
+# das nur das Dateisystem-Backend kennt).
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache')
+CACHE_DIR = os.environ.get('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'coderr-cache'))
+CACHE_LOCATION = os.environ.get('CACHE_LOCATION')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': CACHE_LOCATION or os.path.join(CACHE_DIR, 'default'),
+        'KEY_PREFIX': 'coderr',
+    },
+    'offers': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': CACHE_LOCATION or os.path.join(CACHE_DIR, 'offers'),
+        'KEY_PREFIX': 'coderr-offers',
+        'TIMEOUT': int(os.environ.get('OFFER_LIST_CACHE_TIMEOUT', 60)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('OFFER_LIST_CACHE_MAX_ENTRIES', 1000)),
+        } if CACHE_BACKEND.endswith('FileBasedCache') else {},
+    },
+}
+OFFER_LIST_CACHE_ALIAS = 'offers'
+
+# Suche in /api/offers/: 'fulltext' nutzt FTS5 (SQLite) bzw. einen GIN-Index (PostgreSQL),
+# 'basic' die icontains-Suche von DRF.
+OFFERS_SEARCH_BACKEND = os.environ.get('OFFERS_SEARCH_BACKEND', 'fulltext')
+
+# Massenimport von Angeboten (manage.py import_offers, POST /api/offers/import/)
+OFFER_IMPORT_BATCH_SIZE = int(os.environ.get('OFFER_IMPORT_BATCH_SIZE', 500))
+OFFER_IMPORT_MAX_ERRORS = int(os.environ.get('OFFER_IMPORT_MAX_ERRORS', 100))
+
+# Massenanlage von Benutzern (manage.py provision_users, POST /api/users/provision/)
+USER_PROVISION_BATCH_SIZE = int(os.environ.get('USER_PROVISION_BATCH_SIZE', 500))
+USER_PROVISION_MAX_ERRORS = int(os.environ.get('USER_PROVISION_MAX_ERRORS', 100))
+# Prozesse zum Hashen der Passwörter in manage.py provision_users und im Job des API-Endpunkts
+# (run_worker); 0 hasht im aktuellen Prozess. Der Request selbst plant nur den Job ein.
+USER_PROVISION_HASH_WORKERS = int(os.environ.get('USER_PROVISION_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+
+# Untergrenzen der Facettenbereiche von /api/offers/facets/ (der letzte Bereich ist nach oben offen)
+OFFER_FACET_PRICE_BUCKETS = [0, 50, 100, 250, 500, 1000]
+OFFER_FACET_DELIVERY_TIME_BUCKETS = [0, 2, 4, 7, 14, 30]
+
+# Verkleinerte Varianten von Angebots- und Profilbildern (maximale Breite x Höhe)
+IMAGE_VARIANT_SIZES = {
+    'thumbnail': (160, 160),
+    'small': (480, 480),
+    'medium': (960, 960),
+}
+IMAGE_VARIANT_FORMATS = ('webp', 'jpeg')
+# True: Varianten erzeugt ein Hintergrund-Worker (manage.py run_worker), bis dahin wird das Original ausgeliefert.
+IMAGE_VARIANTS_ASYNC = os.environ.get('IMAGE_VARIANTS_ASYNC', 'true').lower() in ('1', 'true', 'yes')
+
+# Datenbankbasierte Job-Queue (coderr.jobs, manage.py run_worker)
+JOB_WORKER_PROCESSES = int(os.environ.get('JOB_WORKER_PROCESSES', os.cpu_count() or 1))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 1.0))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+JOB_RETRY_BACKOFF = int(os.environ.get('JOB_RETRY_BACKOFF', 30))
+JOB_STALE_TIMEOUT = int(os.environ.get('JOB_STALE_TIMEOUT', 600))
+# Abstand in Sekunden, in dem jeder Worker hängende Jobs wieder freigibt
+JOB_REQUEUE_INTERVAL = int(os.environ.get('JOB_REQUEUE_INTERVAL', 60))
@@ -0,0 +1,74 @@
+"""
+Gunicorn-Konfiguration für den Produktionsbetrieb.
+
+    gunicorn -c gunicorn.conf.py coderr_app.wsgi:application
+
+Alle Werte lassen sich über Umgebungsvariablen überschreiben:
+
+GUNICORN_BIND               Adresse (Standard 0.0.0.0:8000)
+GUNICORN_WORKER_CLASS       'sync' (Standard), 'gthread' oder 'uvicorn' (dann coderr_app.asgi:application starten)
+WEB_CONCURRENCY             Anzahl der Worker-Prozesse (Standard: aus der CPU-Zahl, siehe unten)
+GUNICORN_THREADS            Threads pro Worker im gthread-Modus (Standard 4)
+GUNICORN_MAX_REQUESTS       Worker nach so vielen Requests neu starten (Standard 1000, 0 = nie)
+GUNICORN_TIMEOUT            Sekunden, bevor ein hängender Worker neu gestartet wird (Standard 30)
+GUNICORN_KEEPALIVE          Sekunden Keep-Alive (nur gthread/uvicorn, Standard 5)
+GUNICORN_ACCESSLOG          Ziel des Access-Logs (Standard '-' = stdout, leer = aus)
+"""
+import gc
+import multiprocessing
+import os
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+
+cpu_count = multiprocessing.cpu_count()
+mode = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+if mode not in WORKER_CLASSES:
+    raise ValueError(f"GUNICORN_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}, not '{mode}'.")
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+worker_class = WORKER_CLASSES[mode]
+
+# Sync-Worker bearbeiten einen Request zur Zeit und warten während Datenbankabfragen: 2 x CPU + 1.
+# gthread- und uvicorn-Worker überlappen das Warten selbst, dort reicht ein Prozess pro CPU + 1.
+if mode == 'sync':
+    workers = int(os.environ.get('WEB_CONCURRENCY', cpu_count * 2 + 1))
+    threads = 1
+else:
+    workers = int(os.environ.get('WEB_CONCURRENCY', cpu_count + 1))
+    threads = int(os.environ.get('GUNICORN_THREADS', 4)) if mode == 'gthread' else 1
+
+# Django wird einmal im Master geladen; die Worker teilen sich die Seiten per Copy-on-Write.
+preload_app = True
+
+# Worker regelmäßig ersetzen, damit Speicherwachstum (Caches, Fragmentierung) begrenzt bleibt.
+# Der Jitter verhindert, dass alle Worker gleichzeitig neu starten.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = max_requests // 10
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = timeout
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Heartbeat-Dateien im RAM statt auf dem (in Docker oft langsamen) Overlay-Dateisystem.
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = os.environ.get('GUNICORN_ACCESSLOG', '-') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOGLEVEL', 'info')
+
+
+def when_ready(server):
+    """
+    Läuft im Master nach dem Laden der App und vor dem Start der Worker.
+    """
+    # Verbindungen aus dem Laden der App dürfen nicht an die Worker vererbt werden.
+    from django.db import connections
+    connections.close_all()
+    # Alle bis hierhin erzeugten Objekte von der zyklischen Garbage Collection ausnehmen, damit
+    # sie in den Workern nicht angefasst und ihre Speicherseiten nicht kopiert werden.
+    gc.freeze()